@@ -65,10 +65,11 @@ except Exception as e:
     raise
 
 try:
-    from news_bot.discovery import search_client
-    from news_bot.processing import article_handler
+    from news_bot.discovery import search_client, scanner_registry
+    from news_bot.processing import article_handler, dedup
     from news_bot.generation import summarizer
-    from news_bot.utils import file_manager, prompt_logger
+    from news_bot.utils import file_manager, prompt_logger, http_client
+    from news_bot.utils.url_canonicalizer import SeenUrls
     from news_bot.localization import translator
     logger.info("✅ News bot modules imported successfully")
 except Exception as e:
@@ -145,7 +146,7 @@ def send_progress(message, progress=None):
     progress_queue.put(json.dumps(update))
     logger.debug(f"  -> Queue size after put: {progress_queue.qsize()}")
 
-def run_news_bot_async(school_id, start_date_str, end_date_str, max_reports):
+def run_news_bot_async(school_id, start_date_str, end_date_str, max_reports, refresh_discovery=False):
     """Run the news bot in a background thread."""
     global current_job_status
     
@@ -241,7 +242,7 @@ def run_news_bot_async(school_id, start_date_str, end_date_str, max_reports):
             
             logger.info("[DISCOVERY] Starting article discovery...")
             discovery_start_time = time.time()
-            discovered_articles = search_client.find_relevant_articles(chosen_school)
+            discovered_articles = search_client.find_relevant_articles(chosen_school, refresh=refresh_discovery)
             discovery_elapsed = time.time() - discovery_start_time
             logger.info(f"[DISCOVERY] Discovery completed in {discovery_elapsed:.2f}s")
         
@@ -262,7 +263,9 @@ def run_news_bot_async(school_id, start_date_str, end_date_str, max_reports):
             
             # Process articles
             final_news_reports = []
-            processed_urls = set()
+            processed_urls = SeenUrls()
+            duplicate_index = dedup.NearDuplicateIndex()
+            retry_queue = http_client.DeferredRetryQueue()
             articles_to_process = min(len(discovered_articles), max_reports)
             logger.info(f"[PROCESSING] Will process up to {articles_to_process} articles (max_reports={max_reports})")
             
@@ -300,17 +303,32 @@ def run_news_bot_async(school_id, start_date_str, end_date_str, max_reports):
                     continue
                 processed_urls.add(article_url)
                 
-                # Fetch and extract text
-                logger.info(f"[ARTICLE {i+1}] Fetching and extracting text...")
+                # Fetch and extract text (feeds that ship the full post already supplied it)
                 fetch_start = time.time()
-                article_text = article_handler.fetch_and_extract_text(article_url)
+                article_text = article_info.get("prefetched_text")
+                if article_text:
+                    logger.info(f"[ARTICLE {i+1}] Using full text from the feed, skipping the page fetch")
+                else:
+                    logger.info(f"[ARTICLE {i+1}] Fetching and extracting text...")
+                    article_text = article_handler.fetch_and_extract_text(article_url, retry_queue=retry_queue, seen_urls=processed_urls)
                 fetch_elapsed = time.time() - fetch_start
                 
                 if not article_text:
+                    if article_url in retry_queue and not article_info.get("deferred"):
+                        # Transient failure: retry once after every other candidate has been tried
+                        discovered_articles.append({**article_info, "deferred": True})
+                        processed_urls.discard(article_url)
+                        logger.warning(f"[ARTICLE {i+1}] DEFER: Fetch failed ({retry_queue.reason(article_url)}), will retry at the end of the run")
+                        continue
                     logger.warning(f"[ARTICLE {i+1}] SKIP: Failed to fetch/extract text (took {fetch_elapsed:.2f}s)")
                     continue
                 logger.info(f"[ARTICLE {i+1}] Text extracted: {len(article_text)} chars, {len(article_text.split())} words (took {fetch_elapsed:.2f}s)")
                 
+                duplicate = duplicate_index.check_and_add(article_url, article_text)
+                if duplicate:
+                    logger.warning(f"[ARTICLE {i+1}] SKIP: Near-duplicate of {duplicate.key} (similarity {duplicate.similarity:.2f})")
+                    continue
+                
                 # Verify article
                 logger.info(f"[ARTICLE {i+1}] Verifying article with AI...")
                 verify_start = time.time()
@@ -578,8 +596,9 @@ def start_job():
     start_date = data.get('start_date', None)
     end_date = data.get('end_date', None)
     max_reports = data.get('max_reports', config.MAX_FINAL_REPORTS)
+    refresh = bool(data.get('refresh', False))  # re-crawl instead of reusing recent discovery results
     
-    logger.info(f"[API /api/start] Parsed parameters: school_id={school_id}, start_date={start_date}, end_date={end_date}, max_reports={max_reports}")
+    logger.info(f"[API /api/start] Parsed parameters: school_id={school_id}, start_date={start_date}, end_date={end_date}, max_reports={max_reports}, refresh={refresh}")
     
     # Reset status
     current_job_status = {
@@ -608,7 +627,7 @@ def start_job():
     logger.info("[API /api/start] Starting background thread...")
     thread = threading.Thread(
         target=run_news_bot_async,
-        args=(school_id, start_date, end_date, max_reports)
+        args=(school_id, start_date, end_date, max_reports, refresh)
     )
     thread.daemon = True
     thread.start()
@@ -635,6 +654,8 @@ def get_debug_info():
             'DEFAULT_OUTPUT_DIR': config.DEFAULT_OUTPUT_DIR,
             'MAX_FINAL_REPORTS': config.MAX_FINAL_REPORTS,
             'MAX_SEARCH_RESULTS_TO_PROCESS': config.MAX_SEARCH_RESULTS_TO_PROCESS,
+            'MAX_FETCH_BYTES': config.MAX_FETCH_BYTES,
+            'DISCOVERY_CACHE_TTL': config.DISCOVERY_CACHE_TTL,
             'OPENROUTER_API_KEY_SET': bool(config.OPENROUTER_API_KEY),
             'GEMINI_PRO_MODEL': config.GEMINI_PRO_MODEL,
         },
@@ -651,7 +672,13 @@ def get_debug_info():
         'output_dir_exists': os.path.exists(config.DEFAULT_OUTPUT_DIR),
         'output_dir_files': len(os.listdir(config.DEFAULT_OUTPUT_DIR)) if os.path.exists(config.DEFAULT_OUTPUT_DIR) else 0,
         'active_threads': threading.active_count(),
+        'fetch_layer': http_client.get_fetch_stats(),
+    }
+    debug_info['circuit_breakers'] = {
+        host: state['breaker'] for host, state in debug_info['fetch_layer']['hosts'].items()
+        if state['breaker'] != 'closed'
     }
+    debug_info['scanners'] = scanner_registry.get_scanner_health()
     
     logger.debug(f"[API /api/debug] Debug info: {json.dumps(debug_info, default=str)}")
     return jsonify(debug_info)
@@ -918,6 +945,17 @@ def generate_wechat_images():
     if not report_filename:
         logger.warning("[API /api/generate-images] Missing report filename")
         return jsonify({'error': 'Report filename is required'}), 400
+
+    from scripts.json_to_wechat_images import DEFAULT_PARALLELISM, MAX_PARALLELISM
+    parallelism = data.get('parallelism')
+    if parallelism in (None, '', 0):
+        parallelism = DEFAULT_PARALLELISM
+    else:
+        try:
+            parallelism = int(parallelism)
+        except (TypeError, ValueError):
+            return jsonify({'error': f'parallelism must be an integer between 1 and {MAX_PARALLELISM}'}), 400
+        parallelism = min(max(1, parallelism), MAX_PARALLELISM)
     
     report_path = Path(config.DEFAULT_OUTPUT_DIR) / report_filename
     logger.debug(f"[API /api/generate-images] Report path: {report_path}")
@@ -962,6 +1000,7 @@ def generate_wechat_images():
             body_size=20.0,
             top_n_sources=10,
             school_override=school_name,  # Pass explicit school if available
+            parallelism=parallelism,
         )
         
         # Clean up temp file if used
@@ -978,6 +1017,8 @@ def generate_wechat_images():
                 'brand_color': result['brand_color'],
                 'total_images': result['total_images'],
                 'files': result['generated_files'],
+                'timings': result['timings'],
+                'total_seconds': result['total_seconds'],
             })
         else:
             return jsonify({
@@ -117,23 +117,58 @@ def get_news_date_range():
 
 # Article Processing Configuration
 URL_FETCH_TIMEOUT = int(os.getenv("URL_FETCH_TIMEOUT", "20")) # seconds
+# Responses are streamed and cut at this many bytes (0 disables the cap)
+MAX_FETCH_BYTES = int(os.getenv("MAX_FETCH_BYTES", str(4 * 1024 * 1024)))
+# Per-host politeness (see utils/host_scheduler.py)
+HOST_MAX_CONCURRENCY = int(os.getenv("HOST_MAX_CONCURRENCY", "4"))      # upper bound for the adaptive per-host limit
+HOST_MIN_INTERVAL = float(os.getenv("HOST_MIN_INTERVAL", "0.25"))      # seconds between request starts to one host
+ROBOTS_TXT_TTL = int(os.getenv("ROBOTS_TXT_TTL", str(6 * 3600)))       # seconds a host's robots.txt is cached
+RESPECT_ROBOTS_DISALLOW = os.getenv("RESPECT_ROBOTS_DISALLOW", "false").lower() == "true"  # skip disallowed URLs (otherwise only logged)
+BREAKER_FAILURE_THRESHOLD = int(os.getenv("BREAKER_FAILURE_THRESHOLD", "3"))  # consecutive failures that open a host's circuit
+BREAKER_COOLDOWN = int(os.getenv("BREAKER_COOLDOWN", "60"))                    # seconds before a half-open trial request
+MIN_ADAPTIVE_TIMEOUT = float(os.getenv("MIN_ADAPTIVE_TIMEOUT", "5"))           # floor for p95-derived per-host timeouts
+# BeautifulSoup backend: "auto" picks lxml when installed and falls back to html.parser
+HTML_PARSER = os.getenv("HTML_PARSER", "auto")
 
 # Output Configuration
 DEFAULT_OUTPUT_DIR = os.getenv("DEFAULT_OUTPUT_DIR", "news_reports")
 MAX_FINAL_REPORTS = int(os.getenv("MAX_FINAL_REPORTS", "20"))
 MAX_SEARCH_RESULTS_TO_PROCESS = int(os.getenv("MAX_SEARCH_RESULTS_TO_PROCESS", "120"))
 MAX_CATEGORY_PAGES_TO_SCAN = int(os.getenv("MAX_CATEGORY_PAGES_TO_SCAN", "20"))
+DISCOVERY_WORKERS = int(os.getenv("DISCOVERY_WORKERS", "8"))                     # threads shared by all discovery scanners
+DISCOVERY_SCANNER_TIMEOUT = int(os.getenv("DISCOVERY_SCANNER_TIMEOUT", "180"))   # seconds before a scanner's results are dropped
+PAGINATOR_WINDOW = int(os.getenv("PAGINATOR_WINDOW", "3"))                        # listing pages prefetched ahead of the one being read
+PAGINATOR_WORKERS = int(os.getenv("PAGINATOR_WORKERS", "8"))                      # threads shared by all paginated scanners
+# Discovery state (scanner health, crawl frontiers) persisted between runs
+DISCOVERY_STATE_DIR = os.getenv("DISCOVERY_STATE_DIR", os.path.join(PROJECT_ROOT, "discovery_state"))
+SCANNER_ZERO_YIELD_LIMIT = int(os.getenv("SCANNER_ZERO_YIELD_LIMIT", "5"))        # consecutive empty runs before a scanner is flagged
+SCANNER_FAILURE_LIMIT = int(os.getenv("SCANNER_FAILURE_LIMIT", "3"))              # consecutive failed/timed-out runs before a scanner is flagged
+SKIP_UNHEALTHY_SCANNERS = os.getenv("SKIP_UNHEALTHY_SCANNERS", "true").lower() == "true"  # skip flagged scanners (otherwise only logged)
+# Incremental discovery (see discovery/crawl_frontier.py): rolling runs only deliver articles not seen by earlier runs
+INCREMENTAL_DISCOVERY = os.getenv("INCREMENTAL_DISCOVERY", "false").lower() == "true"
+FRONTIER_MAX_URLS = int(os.getenv("FRONTIER_MAX_URLS", "2000"))          # delivered URLs remembered per scanner
+FRONTIER_OVERLAP_DAYS = int(os.getenv("FRONTIER_OVERLAP_DAYS", "1"))     # re-read this many days behind the newest delivered date
+DISCOVERY_CACHE_TTL = int(os.getenv("DISCOVERY_CACHE_TTL", "900"))        # seconds a school/date range's discovery results are reused (0 disables)
+# Google PSE (see discovery/pse_client.py): only queried when the scanners underfill MAX_SEARCH_RESULTS_TO_PROCESS
+PSE_DAILY_QUOTA = int(os.getenv("PSE_DAILY_QUOTA", "100"))                # queries per day for the API key (100 = free tier)
+PSE_MAX_QUERIES_PER_RUN = int(os.getenv("PSE_MAX_QUERIES_PER_RUN", "10")) # queries one discovery run may spend
+PSE_TIME_BUDGET = float(os.getenv("PSE_TIME_BUDGET", "20"))               # seconds discovery waits for PSE responses
+PSE_PAGES_PER_SITE = int(os.getenv("PSE_PAGES_PER_SITE", "2"))            # result pages (10 results each) per pse_sites entry
+PSE_WORKERS = int(os.getenv("PSE_WORKERS", "4"))                          # concurrent PSE queries
+PSE_CACHE_TTL_HOURS = float(os.getenv("PSE_CACHE_TTL_HOURS", "12"))       # PSE responses are reused this long per query and date window
+# Articles whose extracted text is at least this similar (estimated Jaccard) to an earlier one are skipped before verification
+DEDUP_SIMILARITY_THRESHOLD = float(os.getenv("DEDUP_SIMILARITY_THRESHOLD", "0.8"))
 
 def validate_config():
     """Validates that essential configurations are set."""
     errors = []
     if not OPENROUTER_API_KEY:
         errors.append("OPENROUTER_API_KEY is not set (required for article verification and summarization).")
-    # Google PSE is currently disabled in search_client.py, so these are optional
-    if not GOOGLE_API_KEY: # For PSE (optional - currently disabled)
-        print("Warning: GOOGLE_API_KEY is not set (for Custom Search). Google PSE search is currently disabled, so this is optional.")
-    if not CUSTOM_SEARCH_ENGINE_ID: # For PSE (optional - currently disabled)
-        print("Warning: CUSTOM_SEARCH_ENGINE_ID (CX ID) is not set (for Custom Search). Google PSE search is currently disabled, so this is optional.")
+    # Google PSE only tops up discovery when the scanners come up short, so these are optional
+    if not GOOGLE_API_KEY: # For PSE (optional)
+        print("Warning: GOOGLE_API_KEY is not set (for Custom Search). Discovery will not be topped up with Google PSE results.")
+    if not CUSTOM_SEARCH_ENGINE_ID: # For PSE (optional)
+        print("Warning: CUSTOM_SEARCH_ENGINE_ID (CX ID) is not set (for Custom Search). Discovery will not be topped up with Google PSE results.")
     
     # Note: Google Docs export has been removed - we only use JSON now
 
@@ -159,6 +194,6 @@ def validate_config():
     
     # Google Docs export removed - using JSON only
 
-# Only OPENROUTER_API_KEY is required; Google PSE keys are optional since PSE is disabled
+# Only OPENROUTER_API_KEY is required; Google PSE keys are optional (PSE only tops up discovery)
 # Note: Validation warnings moved to validate_config() to avoid blocking during import
 # This allows Railway health checks to respond quickly
\ No newline at end of file
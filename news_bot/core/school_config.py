@@ -5,13 +5,15 @@ SCHOOL_PROFILES = {
     "school_location": "New York",
     "domains": ["nyunews.com", "www.nyu.edu/news"],                    #  limit discoveries to allowed hostnames.
     "category_pages": ["https://nyunews.com/category/news/"],          #  Seed URLs for listing pages to crawl for article links.
+    "feeds": [],                                                        #  RSS/Atom feeds (see discovery/sources/feed_scanner.py)
+    "wp_api": [{"base": "https://nyunews.com", "category": "news"}],  #  WordPress REST API sites (see discovery/sources/wp_api_scanner.py)
     "archive_patterns": [
       "https://nyunews.com/{year}/{month:02d}/",
       "https://www.nyu.edu/about/news-publications/news/{year}/{month:02d}.html",
       "https://nyunews.com/news/{year}/{month:02d}/",
     ],
-    "validators": [r"/news/\d{4}/\d{2}/\d{2}/"],
-    "selectors": {},  # site-specific main content selectors if needed
+    "validators": [r"/news/\d{4}/\d{2}/\d{2}/", r"/\d{4}/\d{2}/\d{2}/\w+/", r"nyu\.edu/news/"],  #  article URL patterns (see discovery/link_classifier.py)
+    "selectors": {},  # host suffix -> extraction rule (see processing/extraction_rules.py)
     "pse_sites": ["nyunews.com", "nyu.edu"],
     "prompt_context": {
       "audience_en": "Chinese international students at New York University (NYU)",
@@ -29,6 +31,7 @@ SCHOOL_PROFILES = {
       "https://news.emory.edu/stories/index.html",
       "https://www.emorywheel.com/section/news"
     ],
+    "sitemaps": [{"site": "https://news.emory.edu", "include": r"/stories/\d{4}/\d{2}/"}],  #  see discovery/sources/sitemap_scanner.py
     "archive_patterns": [
       # Emory monthly index pages
       "https://news.emory.edu/stories/{year}/{month:02d}/",
@@ -37,7 +40,9 @@ SCHOOL_PROFILES = {
       # Emory story detail URLs under a monthly path
       r"^https?://news\.emory\.edu/stories/\d{4}/\d{2}/[^/]+/story\.html$",
       # Optional: slug-embedded date like _DD-MM-YYYY
-      r"_(\d{2})-(\d{2})-(\d{4})/story\.html$"
+      r"_(\d{2})-(\d{2})-(\d{4})/story\.html$",
+      # Emory Wheel articles
+      r"emorywheel\.com/article/",
     ],
     "selectors": {},
     "pse_sites": ["news.emory.edu", "emorywheel.com"],
@@ -53,11 +58,10 @@ SCHOOL_PROFILES = {
     "school_location": "Davis",
     "domains": ["www.ucdavis.edu", "theaggie.org"],
     "category_pages": ["https://www.ucdavis.edu/news/latest"],
-    "archive_patterns": [
-      # USC monthly index pages
-      "https://news.emory.edu/stories/{year}/{month:02d}/",
-    ],
-    "validators": [r"/\d{4}/\d{2}/\d{2}/", r"/news/"],
+    "feeds": [{"url": "https://theaggie.org/feed/", "paged": True}],
+    "sitemaps": [{"site": "https://www.ucdavis.edu", "include": r"ucdavis\.edu/news/"}],
+    "archive_patterns": [],
+    "validators": [r"/\d{4}/\d{2}/", r"/news/"],
     "selectors": {},
     "pse_sites": ["ucdavis.edu", "theaggie.org"],
     "prompt_context": {
@@ -73,13 +77,21 @@ SCHOOL_PROFILES = {
     "domains": ["news.ubc.ca", "ubctoday.ubc.ca", "ubyssey.ca"],
     "category_pages": [
       "https://ubctoday.ubc.ca/updates-news-and-stories",
-      "https://news.ubc.ca/category/university-news/",
     ],
+    # news.ubc.ca is covered by its feed
+    "feeds": [{"url": "https://news.ubc.ca/feed/", "paged": True}],
     "archive_patterns": [
       
       ],
-    "validators": [r"/\d{4}/\d{2}/\d{2}/", r"/news/"],
-    "selectors": {},
+    "validators": [
+      r"/\d{4}/\d{2}/\d{2}/", r"/news/",
+      # news.ubc.ca posts are /YYYY/MM/slug/; ubctoday cards have no dated path
+      r"news\.ubc\.ca/\d{4}/\d{2}/[^/]+", r"ubctoday\.ubc\.ca/[^?#]+",
+    ],
+    "selectors": {
+      # ubctoday update pages link out to the full message
+      "ubc.ca": {"follow_link_text": "Read the full message"},
+    },
     "pse_sites": ["news.ubc.ca", "ubctoday.ubc.ca", "ubyssey.ca"],
     "prompt_context": {
       "audience_en": "Chinese international students at UBC",
@@ -92,13 +104,28 @@ SCHOOL_PROFILES = {
     "id": 5,
     "school_name": "University of Southern California",
     "school_location": "Los Angeles",
-    "domains": ["news.usc.edu", "usc.edu"],
+    "domains": ["news.usc.edu", "usc.edu", "uscannenbergmedia.com", "latimes.com", "cbsnews.com"],
     "category_pages": ["https://www.uscannenbergmedia.com/pf/api/v3/content/fetch/story-feed-query"],
+    # Stories are /<numeric id>/<slug>/; the sitemaps also list tag, category and landing pages
+    "sitemaps": [{"site": "https://news.usc.edu", "include": r"news\.usc\.edu/\d+/[^/]+"}],
     "archive_patterns": [
       "https://www.uscannenbergmedia.com/allnews/",
     ],
-    "validators": [r"/\d{4}/\d{2}/\d{2}/", r"/news/"],
-    "selectors": {},
+    "skip_patterns": ["/video/"],  #  on top of link_classifier.DEFAULT_SKIP_PATTERNS
+    "validators": [
+      r"/\d{4}/\d{2}/\d{2}/", r"/news/",
+      r"news\.usc\.edu/\d+/[^/]+",
+      # USC Today stories are /slug/; LA Times stories are /<section>/story/YYYY-MM-DD/slug
+      r"today\.usc\.edu/[^/?#]+/?$", r"latimes\.com/.+/story/\d{4}-\d{2}-\d{2}/",
+    ],
+    "selectors": {
+      # LA Times ships the full text as JSON-LD; the AMP page is static HTML otherwise
+      "latimes.com": {
+        "prefer_jsonld": True,
+        "prefer_amp": True,
+        "amp_content": ['[data-qa="article-body"]', 'div.article-body', 'article .article-body', 'article', 'main'],
+      },
+    },
     "pse_sites": ["uscannenbergmedia.com"],
     "prompt_context": {
       "audience_en": "Chinese international students at USC",
@@ -110,13 +137,26 @@ SCHOOL_PROFILES = {
     "id": 6,
     "school_name": "University of Edinburgh",
     "school_location": "Edinburgh",
-    "domains": ["www.ed.ac.uk", "www.ed.ac.uk/news"],
+    "domains": ["www.ed.ac.uk", "www.ed.ac.uk/news", "thestudentnews.co.uk"],
     "category_pages": ["https://www.ed.ac.uk/news/latest?search_api_news_fulltext=&field_news_publication_date%5Bmin%5D={start_year}-{start_month:02d}-{start_day:02d}&field_news_publication_date%5Bmax%5D={end_year}-{end_month:02d}-{end_day:02d}",
                        "https://thestudentnews.co.uk/category/news/"],
+    "wp_api": [{"base": "https://thestudentnews.co.uk", "category": "news"}],
+    "sitemaps": [{"site": "https://www.ed.ac.uk", "include": r"ed\.ac\.uk/news/\d{4}/"}],
     "archive_patterns": [
       ],
     "validators": [r"/\d{4}/\d{2}/\d{2}/", r"/news/"],
-    "selectors": {},
+    "selectors": {
+      # Skip the hidden trending-preview article and read the real post body
+      "thestudentnews.co.uk": {
+        "content": [
+          '#content #primary article .entry-content',
+          '#primary .entry-content',
+          'main.site-main article .entry-content',
+          '.single-post .entry-content',
+          '.entry-content',
+        ],
+      },
+    },
     "pse_sites": ["ed.ac.uk"],
     "prompt_context": {
       "audience_en": "Chinese international students at Edinburgh",
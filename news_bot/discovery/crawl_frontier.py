@@ -0,0 +1,194 @@
+# news_bot/discovery/crawl_frontier.py
+
+import os
+import json
+import logging
+import threading
+from contextlib import contextmanager
+from datetime import date, datetime, timedelta
+import requests
+from ..core import config
+from ..utils import http_client
+from ..utils.url_canonicalizer import SeenUrls
+
+# Setup logging
+logger = logging.getLogger('crawl_frontier')
+
+# Incremental discovery. With INCREMENTAL_DISCOVERY=true (rolling runs only; a
+# NEWS_START_DATE backfill always crawls its whole range) every scanner keeps a
+# frontier in DISCOVERY_STATE_DIR/frontier.json:
+#   newest_date  newest url_date it has delivered
+#   seen_urls    the last FRONTIER_MAX_URLS URLs it has delivered
+#   validators   ETag / Last-Modified of its listing pages
+# Scanners fetch listing pages through Frontier.fetch() (conditional GET; an
+# unchanged page comes back as None), the paginator stops at the first page that
+# holds nothing new, and run_scanners drops already-seen URLs before they reach
+# the pipeline. A frontier is only committed after its scanner's results were
+# used, so a failed or timed-out run rediscovers the same items next time; the new
+# page validators are only kept when every new article of the scanner reached the
+# pipeline (otherwise a 304 next run would hide the articles that were cut).
+
+FRONTIER_FILENAME = "frontier.json"
+_MAX_VALIDATORS = 200       # listing-page validators kept per scanner
+
+_state: dict[str, dict] | None = None
+_state_lock = threading.Lock()
+_local = threading.local()
+
+
+def is_enabled() -> bool:
+    return config.INCREMENTAL_DISCOVERY and not config.NEWS_START_DATE
+
+
+class Frontier:
+    """One scanner's view of what earlier runs already delivered."""
+
+    def __init__(self, name: str, record: dict | None = None, enabled: bool = False):
+        record = record or {}
+        self.name = name
+        self.enabled = enabled
+        self.newest_date = date.fromisoformat(record["newest_date"]) if record.get("newest_date") else None
+        self.seen_urls = list(record.get("seen_urls", []))
+        self._seen = SeenUrls(self.seen_urls)   # compared by canonical URL
+        self.validators = dict(record.get("validators", {}))
+        self.caught_up = False          # set when the scanner stopped on already-seen content
+        self.completed = False          # set by run_scanners when the scanner's results were used
+        self._lock = threading.Lock()
+        self._new_validators: dict[str, dict] = {}
+
+    def is_seen(self, url: str) -> bool:
+        return self.enabled and url in self._seen
+
+    def page_is_seen(self, urls, dates) -> bool:
+        """True when a listing page holds only items an earlier run delivered."""
+        if not self.enabled:
+            return False
+        if urls and all(url in self._seen for url in urls):
+            return True
+        if dates and self.newest_date:
+            return max(dates) < self.newest_date - timedelta(days=config.FRONTIER_OVERLAP_DAYS)
+        return False
+
+    def mark_caught_up(self, reason: str) -> None:
+        self.caught_up = True
+        logger.info(f"[FRONTIER] '{self.name}' caught up: {reason}")
+
+    def fetch(self, url: str, headers: dict | None = None, **kwargs) -> requests.Response | None:
+        """
+        http_client.get with the page's stored validators. Returns None when the
+        server answers 304 Not Modified (nothing new since the last run).
+        """
+        headers = dict(headers or http_client.DEFAULT_HEADERS)
+        if self.enabled:
+            with self._lock:
+                stored = self.validators.get(url) or {}
+            if stored.get("etag"):
+                headers["If-None-Match"] = stored["etag"]
+            if stored.get("last_modified"):
+                headers["If-Modified-Since"] = stored["last_modified"]
+        response = http_client.get(url, headers=headers, **kwargs)
+        if response.status_code == 304:
+            self.mark_caught_up(f"{url} not modified")
+            return None
+        if self.enabled and response.ok:
+            validator = {"etag": response.headers.get("ETag"), "last_modified": response.headers.get("Last-Modified")}
+            if validator["etag"] or validator["last_modified"]:
+                with self._lock:
+                    self._new_validators[url] = validator
+        return response
+
+    def filter_new(self, articles: list[dict]) -> list[dict]:
+        if not self.enabled:
+            return articles
+        return [a for a in articles if a.get("url") not in self._seen]
+
+    def to_record(self, delivered: list[dict], keep_new_validators: bool = True) -> dict:
+        seen = list(self.seen_urls)
+        known = SeenUrls(self.seen_urls)
+        newest = self.newest_date
+        today = date.today()
+        for article in delivered:
+            url = article.get("url")
+            if url and url not in known:
+                known.add(url)
+                seen.append(url)
+            try:
+                article_date = datetime.strptime(article.get("url_date") or "", "%Y-%m-%d").date()
+            except ValueError:
+                continue
+            article_date = min(article_date, today)
+            if newest is None or article_date > newest:
+                newest = article_date
+        validators = {**self.validators, **self._new_validators} if keep_new_validators else self.validators
+        return {
+            "newest_date": newest.isoformat() if newest else None,
+            "seen_urls": seen[-config.FRONTIER_MAX_URLS:],
+            "validators": dict(list(validators.items())[-_MAX_VALIDATORS:]),
+            "updated": datetime.now().isoformat(timespec='seconds'),
+        }
+
+
+def _frontier_path() -> str:
+    return os.path.join(config.DISCOVERY_STATE_DIR, FRONTIER_FILENAME)
+
+
+def _load_state() -> dict[str, dict]:
+    # Caller holds _state_lock
+    global _state
+    if _state is None:
+        try:
+            with open(_frontier_path(), 'r', encoding='utf-8') as f:
+                _state = json.load(f)
+        except FileNotFoundError:
+            _state = {}
+        except (OSError, ValueError) as e:
+            logger.warning(f"[FRONTIER] Could not read crawl frontiers, starting fresh: {e}")
+            _state = {}
+    return _state
+
+
+def load(name: str) -> Frontier:
+    """The scanner's frontier; a disabled (pass-through) one when incremental discovery is off."""
+    if not is_enabled():
+        return Frontier(name)
+    with _state_lock:
+        return Frontier(name, _load_state().get(name), enabled=True)
+
+
+def commit(frontier: Frontier, delivered: list[dict], all_delivered: bool = True) -> None:
+    """
+    Persists the frontier after its scanner's new articles were handed to the
+    pipeline. Frontiers of scanners that failed or timed out are not committed.
+    all_delivered=False (some new articles were cut) keeps the previous listing-page
+    validators, so those pages are fetched in full again next run.
+    """
+    if not frontier.enabled or not frontier.completed:
+        return
+    with _state_lock:
+        state = _load_state()
+        state[frontier.name] = frontier.to_record(delivered, keep_new_validators=all_delivered)
+        path = _frontier_path()
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp_path = path + ".tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(state, f, ensure_ascii=False, indent=2)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.warning(f"[FRONTIER] Could not save crawl frontiers: {e}")
+
+
+@contextmanager
+def bound(frontier: Frontier):
+    """Makes frontier the current() one for the calling thread (the scanner's thread)."""
+    previous = getattr(_local, "frontier", None)
+    _local.frontier = frontier
+    try:
+        yield frontier
+    finally:
+        _local.frontier = previous
+
+
+def current() -> Frontier:
+    """The frontier of the scanner running on this thread (pass-through outside a scanner run)."""
+    return getattr(_local, "frontier", None) or Frontier("unbound")
@@ -1,5 +1,99 @@
 import re
-from datetime import datetime
+from datetime import date
+from functools import lru_cache
+
+# Dates from article URLs and listing-page date strings. Scanners call these once
+# per link, so every pattern is compiled once, month names are looked up in a
+# memoized table instead of going through strptime, and results are cached per
+# input (the same URLs and date labels recur across pages, scanners and runs).
+# date_from_url / date_from_text return datetime.date; the extract_* functions keep
+# their "YYYY-MM-DD" string results for existing callers. dates_from_urls /
+# dates_from_texts take a whole page of links or labels at once.
+
+_PARSE_CACHE_SIZE = 8192
+
+# URL patterns, in priority order
+_NEWS_YMD_RE = re.compile(r'/news/(\d{4})/(\d{1,2})/(\d{1,2})/')           # /news/YYYY/MM/DD/ (NYU)
+_EMORY_DMY_RE = re.compile(r'_(\d{2})-(\d{2})-(\d{4})/story\.html$')      # ..._DD-MM-YYYY/story.html (Emory)
+_YMD_RE = re.compile(r'/(\d{4})/(\d{1,2})/(\d{1,2})/')                    # /YYYY/MM/DD/ (generic)
+_HAS_YEAR_RE = re.compile(r'\d{4}')
+
+# Text patterns: "[Weekday, ]March 4[th], 2025", "4[th] September, 2025", "2025-03-04"
+_WS_RE = re.compile(r'\s+')
+_MONTH_DAY_YEAR_RE = re.compile(r'^(?:[^,]+,\s*)?([A-Za-z]+)\.?\s+(\d{1,2})(?:st|nd|rd|th)?,\s*(\d{4})$', re.I)
+_DAY_MONTH_YEAR_RE = re.compile(r'^(?:[^,]+,\s*)?(\d{1,2})(?:st|nd|rd|th)?\s+([A-Za-z]+)\.?,\s*(\d{4})$', re.I)
+_ISO_RE = re.compile(r'^(\d{4})-(\d{1,2})-(\d{1,2})$')
+
+_MONTH_NAMES = ["january", "february", "march", "april", "may", "june", "july",
+                "august", "september", "october", "november", "december"]
+_MONTHS = {name: i for i, name in enumerate(_MONTH_NAMES, start=1)}
+_MONTHS.update({name[:3]: i for i, name in enumerate(_MONTH_NAMES, start=1)})
+_MONTHS["sept"] = 9
+
+
+@lru_cache(maxsize=64)
+def month_number(name: str) -> int | None:
+    """1-12 for a full or abbreviated English month name (any case, trailing dot allowed)."""
+    return _MONTHS.get(name.strip().rstrip('.').lower())
+
+
+def _make_date(year: str, month: str | int, day: str) -> date | None:
+    try:
+        return date(int(year), int(month), int(day))
+    except ValueError:
+        return None
+
+
+@lru_cache(maxsize=_PARSE_CACHE_SIZE)
+def date_from_url(url_string: str) -> date | None:
+    """The date encoded in a news URL path, or None."""
+    if not url_string or not _HAS_YEAR_RE.search(url_string):
+        return None
+    m = _NEWS_YMD_RE.search(url_string)
+    if m:
+        found = _make_date(*m.groups())
+        if found:
+            return found
+    m = _EMORY_DMY_RE.search(url_string)
+    if m:
+        day, month, year = m.groups()
+        return _make_date(year, month, day)
+    m = _YMD_RE.search(url_string)
+    if m:
+        return _make_date(*m.groups())
+    return None
+
+
+@lru_cache(maxsize=_PARSE_CACHE_SIZE)
+def date_from_text(date_string: str) -> date | None:
+    """The date in a listing label such as "Tuesday, March 4, 2025", or None."""
+    if not date_string:
+        return None
+    s = _WS_RE.sub(' ', str(date_string).strip())
+    m = _MONTH_DAY_YEAR_RE.match(s)
+    if m:
+        month, day, year = m.groups()
+        month = month_number(month)
+        return _make_date(year, month, day) if month else None
+    m = _DAY_MONTH_YEAR_RE.match(s)
+    if m:
+        day, month, year = m.groups()
+        month = month_number(month)
+        return _make_date(year, month, day) if month else None
+    m = _ISO_RE.match(s)
+    if m:
+        return _make_date(*m.groups())
+    return None
+
+
+def dates_from_urls(urls) -> list[date | None]:
+    """date_from_url for every URL, in order."""
+    return [date_from_url(url) for url in urls]
+
+
+def dates_from_texts(strings) -> list[date | None]:
+    """date_from_text for every string, in order."""
+    return [date_from_text(s) for s in strings]
 
 
 def extract_date_from_url(url_string: str) -> str | None:
@@ -7,36 +101,8 @@ def extract_date_from_url(url_string: str) -> str | None:
     Attempts to extract a date from a URL string.
     Looks for various date patterns commonly used in news URLs.
     """
-    # Pattern for /news/YYYY/MM/DD/ (most common for NYU news)
-    match_news_ymd = re.search(r'/news/(\d{4})/(\d{1,2})/(\d{1,2})/', url_string)
-    if match_news_ymd:
-        year, month, day = match_news_ymd.groups()
-        try:
-            dt = datetime(int(year), int(month), int(day))
-            return dt.strftime("%Y-%m-%d")
-        except ValueError:
-            pass
-            
-    # Match ..._DD-MM-YYYY/story.html (most common for Emory news)
-    m = re.search(r'_(\d{2})-(\d{2})-(\d{4})/story\.html$', url_string)
-    if m:
-        day, month, year = m.groups()
-        try:
-            dt = datetime(int(year), int(month), int(day))
-            return dt.strftime('%Y-%m-%d')
-        except ValueError:
-            return None
-        
-    # Pattern for /YYYY/MM/DD/ (generic)
-    match_ymd = re.search(r'/(\d{4})/(\d{1,2})/(\d{1,2})/', url_string)
-    if match_ymd:
-        year, month, day = match_ymd.groups()
-        try:
-            dt = datetime(int(year), int(month), int(day))
-            return dt.strftime("%Y-%m-%d")
-        except ValueError:
-            pass        
-    return None
+    found = date_from_url(url_string)
+    return found.isoformat() if found else None
 
 
 def extract_ymd_from_text(date_string: str) -> str | None:
@@ -52,45 +118,5 @@ def extract_ymd_from_text(date_string: str) -> str | None:
 
     Returns None if no supported format matches.
     """
-    if not date_string:
-        return None
-
-    # Normalize whitespace and remove ordinal suffixes (1st, 2nd, 3rd, 4th)
-    s = re.sub(r"\s+", " ", str(date_string).strip())
-    s = re.sub(r"(\d{1,2})(st|nd|rd|th)", r"\1", s, flags=re.IGNORECASE)
-
-    # Normalize month abbreviations with trailing periods and edge case "Sept"
-    # Remove dots from common month abbreviations like "Mar.", "Aug.", etc.
-    s = re.sub(r"\b(Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Sept|Oct|Nov|Dec)\.\b", r"\1", s)
-    # Map non-standard "Sept" to standard "Sep" expected by %b
-    s = re.sub(r"\bSept\b", "Sep", s)
-
-    # Try common formats from most to least specific
-    candidate_formats = [
-        "%A, %B %d, %Y",   # Tuesday, March 4, 2025
-        "%A, %b %d, %Y",   # Tuesday, Mar 4, 2025
-        "%A, %b. %d, %Y",   # Tuesday, Mar. 4, 2025
-        "%B %d, %Y",       # March 4, 2025
-        "%b %d, %Y",       # Mar 4, 2025
-        "%d %B, %Y",        # 4 September, 2025
-        "%Y-%m-%d",        # Already normalized
-    ]
-
-    for fmt in candidate_formats:
-        try:
-            dt = datetime.strptime(s, fmt)
-            return dt.strftime("%Y-%m-%d")
-        except ValueError:
-            continue
-
-    # If the string contains leading text like "Updated on ...", try last comma segment
-    if "," in s:
-        tail = s.split(",", maxsplit=1)[-1].strip()
-        for fmt in ["%B %d, %Y", "%b %d, %Y"]:
-            try:
-                dt = datetime.strptime(tail, fmt)
-                return dt.strftime("%Y-%m-%d")
-            except ValueError:
-                pass
-
-    return None
\ No newline at end of file
+    found = date_from_text(date_string)
+    return found.isoformat() if found else None
@@ -0,0 +1,68 @@
+# news_bot/discovery/discovery_cache.py
+
+import time
+import logging
+import threading
+from datetime import date
+from ..core import config
+from . import scanner_registry
+
+# Setup logging
+logger = logging.getLogger('discovery_cache')
+
+# Editors often start the same school and week several times in a row from the web
+# UI (another max_reports, a retry after an error). find_relevant_articles keeps its
+# result for DISCOVERY_CACHE_TTL seconds, keyed by
+#   (school id, start date, end date, (scanner name, version) of the school's scanners)
+# so a re-run goes straight to processing. Registering a new scanner or bumping a
+# scanner's version changes the key; /api/start {"refresh": true} bypasses the cache.
+# Empty results are not cached (they are usually a transient failure).
+
+_MAX_ENTRIES = 32
+
+# key -> (stored_at monotonic, articles)
+_entries: dict[tuple, tuple[float, list[dict]]] = {}
+_lock = threading.Lock()
+
+
+def _key(school_id: int, start_date: date, end_date: date) -> tuple:
+    versions = tuple((spec.name, spec.version) for spec in scanner_registry.scanners_for(school_id))
+    return (school_id, start_date.isoformat(), end_date.isoformat(), versions)
+
+
+def get(school_id: int, start_date: date, end_date: date) -> list[dict] | None:
+    """Copies of the cached articles for the school and range, or None when absent or expired."""
+    if config.DISCOVERY_CACHE_TTL <= 0:
+        return None
+    key = _key(school_id, start_date, end_date)
+    with _lock:
+        entry = _entries.get(key)
+        if entry is None:
+            return None
+        stored_at, articles = entry
+        age = time.monotonic() - stored_at
+        if age > config.DISCOVERY_CACHE_TTL:
+            del _entries[key]
+            return None
+    logger.info(f"[DISCOVERY] Reusing {len(articles)} cached articles for school {school_id} "
+                f"({start_date} to {end_date}, {age:.0f}s old)")
+    # The orchestrators append deferred retries to the list they are given
+    return [dict(article) for article in articles]
+
+
+def put(school_id: int, start_date: date, end_date: date, articles: list[dict]) -> None:
+    if config.DISCOVERY_CACHE_TTL <= 0 or not articles:
+        return
+    key = _key(school_id, start_date, end_date)
+    with _lock:
+        _entries[key] = (time.monotonic(), [dict(article) for article in articles])
+        while len(_entries) > _MAX_ENTRIES:
+            oldest = min(_entries, key=lambda k: _entries[k][0])
+            del _entries[oldest]
+
+
+def invalidate(school_id: int | None = None) -> None:
+    """Drops the cached results of one school, or of every school."""
+    with _lock:
+        for key in [k for k in _entries if school_id is None or k[0] == school_id]:
+            del _entries[key]
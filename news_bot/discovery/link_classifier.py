@@ -0,0 +1,110 @@
+# news_bot/discovery/link_classifier.py
+
+import re
+import logging
+from functools import lru_cache
+from urllib.parse import urlsplit
+from ..core import school_config
+
+# Setup logging
+logger = logging.getLogger('link_classifier')
+
+# Anchor filtering shared by the scanners. Each school's profile is compiled once into
+#   - a host set from "domains" (an entry with a path, e.g. "www.nyu.edu/news", only
+#     allows that host under that path prefix; subdomains of a listed host are allowed),
+#   - one case-insensitive alternation of DEFAULT_SKIP_PATTERNS plus the profile's
+#     optional "skip_patterns" (substrings of non-article pages: tags, authors, ...),
+#   - one alternation of the profile's "validators" regexes (an article URL matches at
+#     least one; a profile without validators accepts every allowed, unskipped link).
+# classify() returns the filter the scanners count a rejected link under, or ARTICLE.
+
+ARTICLE = "article"
+WRONG_DOMAIN = "wrong_domain"
+BAD_PATTERN = "bad_pattern"
+
+DEFAULT_SKIP_PATTERNS = [
+    "/category/", "/tag/", "/author/", "/page/",
+    "/staff_name/", "/staff/", "/writer/", "/contributor/",
+    "/about/", "/contact/", "/privacy/", "/terms/",
+    "/subscribe/", "/newsletter/", "/membership/",
+    "/search/", "/archive/", "/topic/",
+    "#", "javascript:", "mailto:",
+]
+
+
+def _alternation(patterns: list[str], flags: int = 0) -> re.Pattern | None:
+    return re.compile("|".join(f"(?:{p})" for p in patterns), flags) if patterns else None
+
+
+class LinkClassifier:
+    """Compiled domain, skip and validator rules of one school."""
+
+    def __init__(self, domains: list[str], skip_patterns: list[str], validators: list[str]):
+        self._hosts: set[str] = set()
+        self._path_prefixes: dict[str, tuple[str, ...]] = {}
+        for domain in domains:
+            host, _, path = domain.lower().partition("/")
+            host = host.removeprefix("www.")
+            if path:
+                self._path_prefixes[host] = self._path_prefixes.get(host, ()) + ("/" + path,)
+            else:
+                self._hosts.add(host)
+        self._skip_re = _alternation([re.escape(p) for p in skip_patterns], re.IGNORECASE)
+        self._valid_re = _alternation(validators)
+
+    def allows_domain(self, url: str) -> bool:
+        parts = urlsplit(url)
+        host = (parts.hostname or "").removeprefix("www.")
+        labels = host.split(".")
+        for i in range(len(labels) - 1):
+            suffix = ".".join(labels[i:])
+            if suffix in self._hosts:
+                return True
+            prefixes = self._path_prefixes.get(suffix)
+            if prefixes and parts.path.startswith(prefixes):
+                return True
+        return False
+
+    def classify(self, url: str) -> str:
+        """ARTICLE, or the reason the absolute URL is not an article link (WRONG_DOMAIN / BAD_PATTERN)."""
+        if not url.startswith("http") or not self.allows_domain(url):
+            return WRONG_DOMAIN
+        if self._skip_re and self._skip_re.search(url):
+            return BAD_PATTERN
+        if self._valid_re and not self._valid_re.search(url):
+            return BAD_PATTERN
+        return ARTICLE
+
+    def classify_all(self, urls) -> list[str]:
+        """classify() for every URL of a page, in order."""
+        return [self.classify(url) for url in urls]
+
+    def is_article(self, url: str) -> bool:
+        return self.classify(url) == ARTICLE
+
+
+@lru_cache(maxsize=None)
+def for_school(school_key: str) -> LinkClassifier:
+    """The school's classifier, compiled on first use."""
+    profile = school_config.SCHOOL_PROFILES[school_key]
+    logger.debug(f"[LINKS] Compiling link rules for {school_key}")
+    return LinkClassifier(profile.get("domains", []),
+                          DEFAULT_SKIP_PATTERNS + profile.get("skip_patterns", []),
+                          profile.get("validators", []))
+
+
+def for_school_id(school_id: int) -> LinkClassifier:
+    """for_school() by the profile's numeric id (the school dicts passed around carry no key)."""
+    for key, profile in school_config.SCHOOL_PROFILES.items():
+        if profile["id"] == school_id:
+            return for_school(key)
+    raise KeyError(f"No school profile with id {school_id}")
+
+
+def for_url(url: str) -> LinkClassifier | None:
+    """The classifier of the school whose domains include url, or None."""
+    for key in school_config.SCHOOL_PROFILES:
+        classifier = for_school(key)
+        if classifier.allows_domain(url):
+            return classifier
+    return None
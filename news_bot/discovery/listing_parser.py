@@ -0,0 +1,167 @@
+"""
+Single-pass link extraction for discovery listing pages.
+
+Category and archive pages are only mined for article links, so instead of
+building a full BeautifulSoup tree and re-scanning it with find_all() and
+container selectors, the page is streamed once through the stdlib tokenizer
+and each anchor is emitted together with the date found next to it.
+"""
+import re
+from html.parser import HTMLParser
+from typing import NamedTuple
+from urllib.parse import urljoin
+
+from .date_extractor import extract_ymd_from_text
+
+
+class ListingLink(NamedTuple):
+    href: str            # absolute URL
+    text: str            # anchor text, stripped like get_text(strip=True)
+    date: str | None     # YYYY-MM-DD found inside the anchor or its card
+    in_card: bool        # anchor sits inside a heading or an article/list card
+
+
+# Elements that group one listing entry (headline, teaser, dateline)
+_CARD_TAGS = {"article", "li"}
+_CARD_CLASS_RE = re.compile(r"post|article|entry|news|story|item|card|teaser|listing|promo", re.I)
+_HEADING_TAGS = {"h1", "h2", "h3", "h4", "h5"}
+_SKIP_CONTENT_TAGS = {"script", "style", "noscript", "template"}
+_VOID_TAGS = {"area", "base", "br", "col", "embed", "hr", "img", "input", "link", "meta",
+              "param", "source", "track", "wbr"}
+
+_MONTHS = r"(?:Jan(?:uary)?|Feb(?:ruary)?|Mar(?:ch)?|Apr(?:il)?|May|Jun(?:e)?|Jul(?:y)?|Aug(?:ust)?|Sep(?:t(?:ember)?)?|Oct(?:ober)?|Nov(?:ember)?|Dec(?:ember)?)\.?"
+_TEXT_DATE_RE = re.compile(
+    rf"\b{_MONTHS}\s+\d{{1,2}}(?:st|nd|rd|th)?,?\s+\d{{4}}\b"      # March 4, 2025 / Mar. 4 2025
+    rf"|\b\d{{1,2}}\s+{_MONTHS},?\s+\d{{4}}\b"                      # 4 March 2025
+    r"|\b\d{4}-\d{2}-\d{2}\b",                                      # 2025-03-04
+    re.I,
+)
+_ISO_DATE_RE = re.compile(r"^(\d{4}-\d{2}-\d{2})")
+
+
+def _parse_text_date(text: str) -> str | None:
+    m = _TEXT_DATE_RE.search(text)
+    if not m:
+        return None
+    found = m.group(0)
+    if _ISO_DATE_RE.match(found):
+        return found
+    # extract_ymd_from_text expects "Month D, YYYY" / "D Month, YYYY"
+    normalized = re.sub(r"([A-Za-z])\.", r"\1", found.replace(",", "").strip())
+    normalized = re.sub(r"(\d)\s+(\d{4})$", r"\1, \2", normalized)
+    return extract_ymd_from_text(normalized)
+
+
+class _ListingTokenizer(HTMLParser):
+    def __init__(self, base_url: str):
+        super().__init__(convert_charrefs=True)
+        self.base_url = base_url
+        self.stack: list[tuple[str, dict | None]] = []   # (tag, card opened by this tag)
+        self.cards: list[dict] = []                      # open cards, innermost last
+        self.heading_depth = 0
+        self.skip_depth = 0
+        self.anchor: dict | None = None
+        self.anchors: list[dict] = []
+
+    # --- helpers ---
+    def _note_date(self, date_str: str | None) -> None:
+        if not date_str:
+            return
+        if self.anchor is not None and not self.anchor["date"]:
+            self.anchor["date"] = date_str
+        if self.cards and not self.cards[-1]["date"]:
+            self.cards[-1]["date"] = date_str
+
+    def _close_anchor(self) -> None:
+        if self.anchor is not None:
+            self.anchors.append(self.anchor)
+            self.anchor = None
+
+    # --- tokenizer callbacks ---
+    def handle_starttag(self, tag, attrs):
+        if tag in _VOID_TAGS:
+            return
+        attrs = dict(attrs)
+        card = None
+        if tag in _SKIP_CONTENT_TAGS:
+            self.skip_depth += 1
+        elif tag in _HEADING_TAGS:
+            self.heading_depth += 1
+        elif tag in _CARD_TAGS or (tag in ("div", "section") and _CARD_CLASS_RE.search(attrs.get("class") or "")):
+            card = {"date": None}
+            self.cards.append(card)
+
+        if tag == "a":
+            self._close_anchor()  # nested anchors are invalid HTML; treat as sibling
+            href = (attrs.get("href") or "").strip()
+            if href:
+                self.anchor = {
+                    "href": urljoin(self.base_url, href),
+                    "parts": [],
+                    "date": None,
+                    "card": self.cards[-1] if self.cards else None,
+                    "in_card": bool(self.cards) or self.heading_depth > 0,
+                }
+        elif tag == "time":
+            m = _ISO_DATE_RE.match((attrs.get("datetime") or "").strip())
+            if m:
+                self._note_date(m.group(1))
+        self.stack.append((tag, card))
+
+    def handle_endtag(self, tag):
+        if not any(t == tag for t, _ in self.stack):
+            return  # stray end tag
+        while self.stack:
+            open_tag, card = self.stack.pop()
+            if open_tag in _SKIP_CONTENT_TAGS:
+                self.skip_depth -= 1
+            elif open_tag in _HEADING_TAGS:
+                self.heading_depth -= 1
+            if card is not None and self.cards and self.cards[-1] is card:
+                self.cards.pop()
+            if open_tag == "a":
+                self._close_anchor()
+            if open_tag == tag:
+                break
+
+    def handle_data(self, data):
+        if self.skip_depth:
+            return
+        text = data.strip()
+        if not text:
+            return
+        if self.anchor is not None:
+            self.anchor["parts"].append(text)
+        if any(ch.isdigit() for ch in text):
+            self._note_date(_parse_text_date(text))
+
+
+def extract_listing_links(markup: str | bytes, base_url: str) -> list[ListingLink]:
+    """
+    Streams a listing page once and returns every anchor with an href as
+    ListingLink(href, text, date, in_card), in document order.
+    The date is the first one found inside the anchor, otherwise the first one
+    found anywhere in its enclosing card (<time datetime>, or text such as
+    "March 4, 2025").
+    """
+    if isinstance(markup, bytes):
+        try:
+            markup = markup.decode("utf-8")
+        except UnicodeDecodeError:
+            markup = markup.decode("cp1252", errors="replace")
+
+    tokenizer = _ListingTokenizer(base_url)
+    tokenizer.feed(markup)
+    tokenizer.close()
+    tokenizer._close_anchor()
+
+    links = []
+    for a in tokenizer.anchors:
+        card = a["card"]
+        links.append(ListingLink(
+            href=a["href"],
+            text="".join(a["parts"]),
+            date=a["date"] or (card["date"] if card else None),
+            in_card=a["in_card"],
+        ))
+    return links
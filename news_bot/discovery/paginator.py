@@ -0,0 +1,152 @@
+# news_bot/discovery/paginator.py
+
+import logging
+from datetime import date
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Iterator, NamedTuple
+from ..core import config
+from ..utils import http_client
+from . import crawl_frontier
+
+# Setup logging
+logger = logging.getLogger('paginator')
+
+# Listing pages are assumed newest-first. The paginator
+#   1. fetches the first page; if everything on it is newer than end_date (an old-date
+#      backfill), it gallops (first+1, +2, +4, ...) and then binary-searches for the
+#      first page that reaches back into the range, instead of walking every page;
+#   2. from there yields pages in order while keeping a sliding window of the next
+#      pages in flight, and stops before the first page whose items are all older
+#      than start_date (or that does not exist);
+#   3. with incremental discovery, also stops before the first page that holds only
+#      items earlier runs already delivered (see crawl_frontier.py);
+#   4. stops after _MAX_FAILED_PAGES pages in a row failed to fetch or parse, so a
+#      broken source is not walked to max_pages.
+
+# Shared by all scanners; separate from the discovery pool so a scanner waiting on its
+# pages never blocks the pool that runs it
+_page_pool = ThreadPoolExecutor(max_workers=config.PAGINATOR_WORKERS, thread_name_prefix="paginator")
+_MAX_FAILED_PAGES = 2
+
+
+class Page(NamedTuple):
+    number: int
+    items: list                 # whatever the scanner parsed from the page
+    dates: list[date]           # publication dates seen on the page (may be empty)
+    exists: bool = True         # False past the last page (404, empty result, 304 Not Modified)
+    urls: tuple = ()            # article URLs on the page, for incremental discovery
+    failed: bool = False        # fetch_page raised; yielded empty
+
+
+def _newer_than_range(page: Page, end_date: date) -> bool:
+    return page.exists and bool(page.dates) and min(page.dates) > end_date
+
+
+def _older_than_range(page: Page, start_date: date) -> bool:
+    return bool(page.dates) and max(page.dates) < start_date
+
+
+def _safe_fetch(fetch_page: Callable[[int], Page], number: int, deadline: float | None = None) -> Page:
+    # Runs on a paginator thread, which takes over the scanner's fetch deadline
+    try:
+        with http_client.fetch_deadline(deadline):
+            return fetch_page(number)
+    except http_client.DeadlineExceeded:
+        logger.info(f"[PAGINATE] Scanner deadline passed, not fetching page {number}")
+        return Page(number, [], [], exists=False)
+    except Exception as e:
+        logger.warning(f"[PAGINATE] Page {number} failed: {e}")
+        print(f"  Error fetching page {number}: {e}")
+        return Page(number, [], [], exists=True, failed=True)
+
+
+def _find_boundary(fetch_page, first_page: int, last_page: int, end_date: date, cache: dict,
+                   deadline: float | None = None) -> int | None:
+    """First page number whose items reach end_date or older, or None if there is none."""
+    def get(n):
+        if n not in cache:
+            cache[n] = _safe_fetch(fetch_page, n, deadline)
+        return cache[n]
+
+    if not _newer_than_range(get(first_page), end_date):
+        return first_page
+
+    # Gallop: lo is always a page that is entirely newer than the range
+    lo, step = first_page, 1
+    hi = None
+    while lo + step <= last_page:
+        probe = lo + step
+        if _newer_than_range(get(probe), end_date):
+            lo, step = probe, step * 2
+        else:
+            hi = probe
+            break
+    if hi is None:
+        if lo + 1 > last_page:
+            return None
+        hi = last_page
+        if _newer_than_range(get(hi), end_date):
+            return None
+
+    # Binary search in (lo, hi] for the first page that is not entirely newer
+    while hi - lo > 1:
+        mid = (lo + hi) // 2
+        if _newer_than_range(get(mid), end_date):
+            lo = mid
+        else:
+            hi = mid
+    logger.info(f"[PAGINATE] Boundary page {hi} found after {len(cache)} page fetches")
+    return hi if get(hi).exists else None
+
+
+def paginate(fetch_page: Callable[[int], Page], start_date: date, end_date: date, *,
+             first_page: int = 1, max_pages: int | None = None, window: int | None = None) -> Iterator[Page]:
+    """
+    Yields Page objects in page order for the pages that can hold articles between
+    start_date and end_date. fetch_page(n) is called from worker threads and must
+    only fetch and parse (no shared state). A page that raises is yielded empty
+    (two in a row end the pagination);
+    pagination ends once the scanner's fetch deadline (http_client.fetch_deadline) passes.
+    Breaking out of the loop cancels the pages still queued.
+    """
+    max_pages = max_pages or config.MAX_CATEGORY_PAGES_TO_SCAN
+    frontier = crawl_frontier.current()     # bound to the scanner's thread, so read it here
+    deadline = http_client.current_deadline()
+    window = max(1, window or config.PAGINATOR_WINDOW)
+    last_page = first_page + max_pages - 1
+    cache: dict[int, Page] = {}
+
+    boundary = _find_boundary(fetch_page, first_page, last_page, end_date, cache, deadline)
+    if boundary is None:
+        logger.info(f"[PAGINATE] No page within {max_pages} reaches back to {end_date}")
+        return
+
+    futures = {}
+    next_submit = boundary
+    current = boundary
+    failed_in_a_row = 0
+    try:
+        while current <= last_page:
+            while next_submit <= last_page and next_submit < current + window:
+                if next_submit not in cache:
+                    futures[next_submit] = _page_pool.submit(_safe_fetch, fetch_page, next_submit, deadline)
+                next_submit += 1
+            page = cache.pop(current, None) or futures.pop(current).result()
+            if not page.exists:
+                logger.info(f"[PAGINATE] Page {current} does not exist, stopping")
+                return
+            if _older_than_range(page, start_date):
+                logger.info(f"[PAGINATE] Page {current} is older than {start_date}, stopping")
+                return
+            failed_in_a_row = failed_in_a_row + 1 if page.failed else 0
+            if failed_in_a_row >= _MAX_FAILED_PAGES:
+                logger.warning(f"[PAGINATE] {failed_in_a_row} pages in a row failed (last: {current}), stopping")
+                return
+            if frontier.page_is_seen(page.urls, page.dates):
+                frontier.mark_caught_up(f"page {current} holds only items seen by earlier runs")
+                return
+            yield page
+            current += 1
+    finally:
+        for future in futures.values():
+            future.cancel()
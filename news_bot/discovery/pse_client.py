@@ -0,0 +1,254 @@
+# news_bot/discovery/pse_client.py
+
+import os
+import re
+import json
+import time
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from datetime import datetime, timezone
+from ..core import config
+from ..utils import http_client
+from ..utils.url_canonicalizer import SeenUrls
+from .date_extractor import date_from_url
+from . import link_classifier
+
+# Setup logging
+logger = logging.getLogger('pse_client')
+
+# Google Programmable Search Engine as a top-up source. find_relevant_articles only
+# calls it when the scanners found fewer than MAX_SEARCH_RESULTS_TO_PROCESS articles.
+#   - one query per "pse_sites" entry (the school's keywords OR'ed, site:-restricted,
+#     sort=date:r:START:END so Google applies the date window), issued concurrently;
+#     a site's next page is only requested when its previous page came back full;
+#   - every query reserves a unit of PSE_DAILY_QUOTA first (the ledger is kept in
+#     DISCOVERY_STATE_DIR/pse_state.json and resets with Google's Pacific-time day),
+#     a run issues at most PSE_MAX_QUERIES_PER_RUN and stops waiting after
+#     PSE_TIME_BUDGET seconds;
+#   - responses are cached per (query, date window, page) for PSE_CACHE_TTL_HOURS,
+#     and cache hits cost no quota.
+# Calls go through http_client (host scheduling, p95 timeouts, fetch stats) against
+# the JSON endpoint rather than googleapiclient, which downloads its discovery
+# document on every build().
+
+PSE_ENDPOINT = "https://www.googleapis.com/customsearch/v1"
+STATE_FILENAME = "pse_state.json"
+_RESULTS_PER_PAGE = 10          # the API maximum
+_MAX_CACHED_QUERIES = 500
+_QUOTA_REASONS = {"dailyLimitExceeded", "rateLimitExceeded", "quotaExceeded"}
+_KEY_PARAM_RE = re.compile(r"\b(key|cx)=[^&\s'\"]+")
+
+_pool = ThreadPoolExecutor(max_workers=config.PSE_WORKERS, thread_name_prefix="pse")
+_state: dict | None = None
+_state_lock = threading.Lock()
+
+
+def is_configured() -> bool:
+    return bool(config.GOOGLE_API_KEY and config.CUSTOM_SEARCH_ENGINE_ID)
+
+
+def _quota_day() -> str:
+    # Google resets Custom Search quotas at midnight Pacific time
+    try:
+        from zoneinfo import ZoneInfo
+        return datetime.now(ZoneInfo("America/Los_Angeles")).date().isoformat()
+    except Exception:
+        return datetime.now(timezone.utc).date().isoformat()
+
+
+def _state_path() -> str:
+    return os.path.join(config.DISCOVERY_STATE_DIR, STATE_FILENAME)
+
+
+def _load_state() -> dict:
+    # Caller holds _state_lock
+    global _state
+    if _state is None:
+        try:
+            with open(_state_path(), 'r', encoding='utf-8') as f:
+                _state = json.load(f)
+        except FileNotFoundError:
+            _state = {}
+        except (OSError, ValueError) as e:
+            logger.warning(f"[PSE] Could not read PSE state, starting fresh: {e}")
+            _state = {}
+        _state.setdefault("quota", {"day": None, "used": 0})
+        _state.setdefault("cache", {})
+    if _state["quota"]["day"] != _quota_day():
+        _state["quota"] = {"day": _quota_day(), "used": 0}
+    return _state
+
+
+def _save_state() -> None:
+    # Caller holds _state_lock; write-then-rename so a crash never leaves half a file
+    now = time.time()
+    ttl = config.PSE_CACHE_TTL_HOURS * 3600
+    cache = {k: v for k, v in _state["cache"].items() if now - v["stored"] < ttl}
+    _state["cache"] = dict(sorted(cache.items(), key=lambda kv: kv[1]["stored"])[-_MAX_CACHED_QUERIES:])
+    path = _state_path()
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = path + ".tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(_state, f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+    except OSError as e:
+        logger.warning(f"[PSE] Could not save PSE state: {e}")
+
+
+def quota_remaining() -> int:
+    with _state_lock:
+        return max(0, config.PSE_DAILY_QUOTA - _load_state()["quota"]["used"])
+
+
+def _reserve_query() -> bool:
+    with _state_lock:
+        quota = _load_state()["quota"]
+        if quota["used"] >= config.PSE_DAILY_QUOTA:
+            return False
+        quota["used"] += 1
+        _save_state()
+        return True
+
+
+def _exhaust_quota() -> None:
+    with _state_lock:
+        _load_state()["quota"]["used"] = config.PSE_DAILY_QUOTA
+        _save_state()
+
+
+def _cache_key(params: dict) -> str:
+    return "|".join(f"{k}={params[k]}" for k in sorted(params))
+
+
+def _cached(key: str) -> list[dict] | None:
+    with _state_lock:
+        entry = _load_state()["cache"].get(key)
+        if entry and time.time() - entry["stored"] < config.PSE_CACHE_TTL_HOURS * 3600:
+            return entry["items"]
+    return None
+
+
+def _error_reasons(e: Exception) -> set[str]:
+    """The "reason"s of a Custom Search error response body (empty when there is none)."""
+    try:
+        error = e.response.json().get("error", {})
+    except Exception:
+        return set()
+    reasons = {item.get("reason") for item in error.get("errors", []) if isinstance(item, dict)}
+    reasons.update(d.get("reason") for d in error.get("details", []) if isinstance(d, dict))
+    return {r for r in reasons if r}
+
+
+def _describe_error(e: Exception) -> str:
+    # requests puts the full URL (with key= and cx=) in HTTPError and connection error texts
+    status = getattr(getattr(e, "response", None), "status_code", None)
+    if status is not None:
+        reasons = ", ".join(sorted(_error_reasons(e))) or "no reason given"
+        return f"HTTP {status} ({reasons})"
+    return _KEY_PARAM_RE.sub(r"\1=***", f"{type(e).__name__}: {e}")
+
+
+def _query(params: dict, key: str) -> list[dict]:
+    """One API call (on the PSE pool); the trimmed items are cached."""
+    resp = http_client.get(PSE_ENDPOINT, accept=("application/json",),
+                           params={**params, "key": config.GOOGLE_API_KEY, "cx": config.CUSTOM_SEARCH_ENGINE_ID})
+    resp.raise_for_status()
+    items = [{"title": item.get("title", "N/A"), "link": item.get("link"), "snippet": item.get("snippet", "")}
+             for item in resp.json().get("items", [])]
+    with _state_lock:
+        _load_state()["cache"][key] = {"stored": time.time(), "items": items}
+        _save_state()
+    return items
+
+
+def find_articles(school: dict, needed: int) -> list[dict[str, str]]:
+    """Up to `needed` in-range candidates from the school's pse_sites, within quota and time budget."""
+    if not is_configured():
+        print("Info: Google PSE not configured (API Key or CX ID missing). Skipping PSE search.")
+        return []
+    sites = school.get("pse_sites") or []
+    keywords = [k.strip() for k in school.get("relevance_keywords", []) if k.strip()]
+    if not sites or not keywords or needed <= 0:
+        return []
+
+    start_date, end_date = config.get_news_date_range()
+    classifier = link_classifier.for_school_id(school['id'])
+    terms = " OR ".join(f'"{k}"' for k in keywords)
+    date_window = f"date:r:{start_date.strftime('%Y%m%d')}:{end_date.strftime('%Y%m%d')}"
+    query_budget = config.PSE_MAX_QUERIES_PER_RUN
+    deadline = time.monotonic() + config.PSE_TIME_BUDGET
+    print(f"\n--- Querying Google PSE for {school['school_name']} ({len(sites)} site(s), "
+          f"{quota_remaining()} queries left today) ---")
+
+    found: list[dict] = []
+    seen = SeenUrls()
+    queued = [(site, 1) for site in sites]
+    pending = {}
+    issued = cache_hits = 0
+
+    def take(site: str, page: int, items: list[dict]) -> None:
+        for item in items:
+            url = item.get("link")
+            if not url or not url.startswith("http") or url in seen:
+                continue
+            if not classifier.allows_domain(url):
+                continue
+            article_date = date_from_url(url)
+            if article_date and (article_date < start_date or article_date > end_date):
+                continue
+            seen.add(url)
+            found.append({"title": item["title"], "url": url, "snippet": item["snippet"],
+                          "url_date": article_date.isoformat() if article_date else None})
+        # Only a full page can have a next one
+        if len(items) == _RESULTS_PER_PAGE and page < config.PSE_PAGES_PER_SITE:
+            queued.append((site, page + 1))
+
+    while True:
+        while queued and len(found) < needed:
+            site, page = queued.pop(0)
+            params = {"q": f"({terms}) site:{site}", "sort": date_window, "num": _RESULTS_PER_PAGE,
+                      "start": 1 + (page - 1) * _RESULTS_PER_PAGE}
+            key = _cache_key(params)
+            items = _cached(key)
+            if items is not None:
+                cache_hits += 1
+                take(site, page, items)
+                continue
+            if issued >= query_budget:
+                logger.info(f"[PSE] Query budget ({query_budget}/run) reached")
+                queued.clear()
+                break
+            if not _reserve_query():
+                logger.warning("[PSE] Daily quota exhausted")
+                print("Info: Google PSE daily quota exhausted; skipping further queries.")
+                queued.clear()
+                break
+            issued += 1
+            pending[_pool.submit(_query, params, key)] = (site, page)
+
+        if not pending or len(found) >= needed:
+            break
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            logger.warning(f"[PSE] Time budget ({config.PSE_TIME_BUDGET}s) spent, "
+                           f"dropping {len(pending)} pending queries")
+            break
+        done, _ = wait(pending, timeout=remaining, return_when=FIRST_COMPLETED)
+        for future in done:
+            site, page = pending.pop(future)
+            try:
+                take(site, page, future.result())
+            except Exception as e:
+                # Only a quota reason exhausts the ledger; a bad key or disabled API is a plain error
+                if getattr(e, "response", None) is not None and _error_reasons(e) & _QUOTA_REASONS:
+                    _exhaust_quota()
+                    queued.clear()
+                reason = _describe_error(e)
+                logger.warning(f"[PSE] Query for {site} (page {page}) failed: {reason}")
+                print(f"  PSE query for {site} (page {page}) failed: {reason}")
+
+    logger.info(f"[PSE] {len(found)} in-range results from {issued} queries and {cache_hits} cached responses")
+    print(f"Google PSE yielded {len(found)} articles ({issued} queries, {cache_hits} from cache)")
+    return found[:needed]
@@ -0,0 +1,215 @@
+# news_bot/discovery/scanner_registry.py
+
+import os
+import json
+import logging
+import threading
+from datetime import datetime
+from typing import Callable, NamedTuple
+from ..core import config
+
+# Setup logging
+logger = logging.getLogger('scanner_registry')
+
+# Discovery scanners register themselves with @register_scanner, declaring the
+# schools they cover, the source_method stored on their articles, a cost class and
+# a priority (lower runs first and wins URL ties when results are merged).
+#
+# Every run's outcome is recorded in DISCOVERY_STATE_DIR/scanner_health.json:
+# last success, yield, latency, consecutive empty runs and consecutive failures.
+# A scanner that keeps coming back empty (SCANNER_ZERO_YIELD_LIMIT) or failing
+# (SCANNER_FAILURE_LIMIT) is flagged; flagged scanners are skipped, except for a
+# probe run every few runs (more often for cheap scanners) so a source that comes
+# back is picked up again. A school never has all of its scanners skipped.
+
+COST_CHEAP = "cheap"           # one or two requests
+COST_MODERATE = "moderate"     # a handful of listing pages
+COST_EXPENSIVE = "expensive"   # many pages, or a paid API
+
+# Skipped runs between probe runs of a flagged scanner, by cost class
+_PROBE_EVERY = {COST_CHEAP: 2, COST_MODERATE: 4, COST_EXPENSIVE: 8}
+HEALTH_FILENAME = "scanner_health.json"
+
+
+class ScannerSpec(NamedTuple):
+    name: str
+    fn: Callable[[], list[dict]]
+    schools: tuple[int, ...]
+    source_method: str          # label stored on each article ("archive_scan", "category_scan", ...)
+    cost: str
+    priority: int
+    timeout: int | None         # seconds; None = DISCOVERY_SCANNER_TIMEOUT
+    version: int = 1            # bump when the scanner's output changes (invalidates cached discovery results)
+
+
+_SCANNERS: dict[str, ScannerSpec] = {}
+
+
+def register_scanner(name: str, *, schools: list[int], source_method: str = "archive_scan",
+                     cost: str = COST_MODERATE, priority: int = 100, timeout: int | None = None,
+                     version: int = 1):
+    """Decorator that registers a zero-argument scanner function returning article dicts."""
+    if cost not in _PROBE_EVERY:
+        raise ValueError(f"Unknown cost class '{cost}' for scanner '{name}'")
+
+    def decorator(fn):
+        if name in _SCANNERS:
+            raise ValueError(f"Scanner '{name}' is already registered")
+        _SCANNERS[name] = ScannerSpec(name=name, fn=fn, schools=tuple(schools), source_method=source_method,
+                                      cost=cost, priority=priority, timeout=timeout, version=version)
+        return fn
+    return decorator
+
+
+def scanners_for(school_id: int) -> list[ScannerSpec]:
+    """Every scanner registered for the school, in priority order."""
+    specs = [spec for spec in _SCANNERS.values() if school_id in spec.schools]
+    return sorted(specs, key=lambda spec: spec.priority)
+
+
+def all_scanners() -> list[ScannerSpec]:
+    return sorted(_SCANNERS.values(), key=lambda spec: (spec.schools, spec.priority))
+
+
+# --- Health -------------------------------------------------------------------
+
+_health: dict[str, dict] | None = None
+_health_lock = threading.Lock()
+
+
+def _health_path() -> str:
+    return os.path.join(config.DISCOVERY_STATE_DIR, HEALTH_FILENAME)
+
+
+def _load_health() -> dict[str, dict]:
+    # Caller holds _health_lock
+    global _health
+    if _health is None:
+        try:
+            with open(_health_path(), 'r', encoding='utf-8') as f:
+                _health = json.load(f)
+        except FileNotFoundError:
+            _health = {}
+        except (OSError, ValueError) as e:
+            logger.warning(f"[REGISTRY] Could not read scanner health, starting fresh: {e}")
+            _health = {}
+    return _health
+
+
+def _save_health() -> None:
+    # Caller holds _health_lock; write-then-rename so a crash never leaves half a file
+    path = _health_path()
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = path + ".tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(_health, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, path)
+    except OSError as e:
+        logger.warning(f"[REGISTRY] Could not save scanner health: {e}")
+
+
+def _new_record() -> dict:
+    return {
+        "runs": 0,
+        "last_run": None,
+        "last_success": None,        # last run that returned at least one article
+        "last_yield": None,
+        "avg_yield": None,           # EWMA of articles per run
+        "last_latency_s": None,
+        "consecutive_zero": 0,
+        "consecutive_failures": 0,
+        "last_error": None,
+        "skipped_since_probe": 0,
+    }
+
+
+def _is_flagged(record: dict) -> bool:
+    return (record["consecutive_zero"] >= config.SCANNER_ZERO_YIELD_LIMIT
+            or record["consecutive_failures"] >= config.SCANNER_FAILURE_LIMIT)
+
+
+def select_scanners(school_id: int) -> list[ScannerSpec]:
+    """
+    The school's scanners minus flagged ones that are not due for a probe run.
+    When every scanner of the school is flagged they all run.
+    """
+    specs = scanners_for(school_id)
+    if not config.SKIP_UNHEALTHY_SCANNERS:
+        return specs
+    with _health_lock:
+        health = _load_health()
+        flagged = [spec for spec in specs if _is_flagged(health.get(spec.name, _new_record()))]
+        if len(flagged) == len(specs):
+            return specs
+        selected = []
+        for spec in specs:
+            if spec not in flagged:
+                selected.append(spec)
+                continue
+            record = health.setdefault(spec.name, _new_record())
+            if record["skipped_since_probe"] >= _PROBE_EVERY[spec.cost]:
+                logger.info(f"[REGISTRY] Probing flagged scanner '{spec.name}'")
+                selected.append(spec)
+            else:
+                record["skipped_since_probe"] += 1
+                logger.warning(f"[REGISTRY] Skipping flagged scanner '{spec.name}' "
+                               f"({record['consecutive_zero']} empty / {record['consecutive_failures']} failed runs in a row)")
+                print(f"Skipping scanner '{spec.name}': empty or failing in its last runs (it is retried periodically)")
+        _save_health()
+    return selected
+
+
+def record_run(name: str, yielded: int | None, latency: float, error: str | None = None,
+               caught_up: bool = False) -> None:
+    """
+    Records one scanner run; yielded=None means the scanner raised or timed out.
+    caught_up: an incremental run that stopped on already-seen content, so an
+    empty result is not held against the scanner.
+    """
+    with _health_lock:
+        health = _load_health()
+        record = health.setdefault(name, _new_record())
+        now = datetime.now().isoformat(timespec='seconds')
+        was_flagged = _is_flagged(record)
+        record["runs"] += 1
+        record["last_run"] = now
+        record["last_latency_s"] = round(latency, 2)
+        record["skipped_since_probe"] = 0
+        if yielded is None:
+            record["consecutive_failures"] += 1
+            record["last_error"] = error
+        else:
+            record["consecutive_failures"] = 0
+            record["last_error"] = None
+            record["last_yield"] = yielded
+            avg = record["avg_yield"]
+            record["avg_yield"] = round(yielded if avg is None else avg * 0.7 + yielded * 0.3, 2)
+            if yielded or caught_up:
+                record["consecutive_zero"] = 0
+                record["last_success"] = now
+            else:
+                record["consecutive_zero"] += 1
+        if _is_flagged(record) and not was_flagged:
+            logger.warning(f"[REGISTRY] Scanner '{name}' flagged as unhealthy "
+                           f"({record['consecutive_zero']} empty / {record['consecutive_failures']} failed runs in a row)")
+        elif was_flagged and not _is_flagged(record):
+            logger.info(f"[REGISTRY] Scanner '{name}' is healthy again")
+        _save_health()
+
+
+def get_scanner_health() -> dict:
+    """Registered scanners with their declared metadata and recorded health, for /api/debug."""
+    with _health_lock:
+        health = _load_health()
+        return {
+            spec.name: {
+                "schools": list(spec.schools),
+                "source_method": spec.source_method,
+                "cost": spec.cost,
+                "version": spec.version,
+                "flagged": _is_flagged(health.get(spec.name, _new_record())),
+                **health.get(spec.name, _new_record()),
+            }
+            for spec in all_scanners()
+        }
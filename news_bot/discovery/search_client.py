@@ -3,136 +3,126 @@
 import os
 import logging
 import time
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
 from datetime import date, timedelta, datetime
-from googleapiclient.discovery import build # For Google Custom Search API
 from ..core import config
 
-from .date_extractor import extract_date_from_url
-from .sources.nyu_scrawler import nyu_scan_archive_pages_for_date_range, nyu_scan_category_pages_for_links
-from .sources.emory_scrawler import emory_scan_archive_pages_for_date_range
-from .sources.ucd_scrawler import ucd_scan_category_pages_for_links
-from .sources.ubc_scrawler import ubc_scan_archive_pages_for_date_range
-from .sources.usc_scrawler import usc_scan_archive_pages_for_date_range
-from .sources.edin_scrawler import edin_scan_category_pages_for_date_range
+from . import scanner_registry, crawl_frontier, discovery_cache, pse_client
+from ..utils import http_client
+from ..utils.url_canonicalizer import SeenUrls
+from .scanner_registry import ScannerSpec
+# Importing the source modules registers their scanners
+from .sources import nyu_scrawler, emory_scrawler, ucd_scrawler, ubc_scrawler, usc_scrawler, edin_scrawler, feed_scanner, wp_api_scanner, sitemap_scanner  # noqa: F401
 
 # Setup logging
 logger = logging.getLogger('search_client')
 
-def find_articles_with_google_pse(school: dict[str, str]) -> list[dict[str, str]]:
+# Shared by every discovery run; scanners spend their time waiting on the network
+_scanner_pool = ThreadPoolExecutor(max_workers=config.DISCOVERY_WORKERS, thread_name_prefix="discovery")
+# A scanner past its deadline fails its next fetch (http_client.fetch_deadline); this is
+# how long run_scanners waits for it to wind down before abandoning the thread
+_STOP_GRACE = 15
+
+
+def _run_bound(spec: ScannerSpec, frontier: crawl_frontier.Frontier, timeout: float, started: dict) -> list[dict]:
+    # Runs on a pool thread; the scanner (and its paginator) find the frontier via crawl_frontier.current().
+    # The timeout counts from here, not from submission, so time spent queued is not charged to the scanner.
+    started[spec.name] = time.time()
+    with crawl_frontier.bound(frontier), http_client.fetch_deadline(time.monotonic() + timeout):
+        return spec.fn()
+
+
+def run_scanners(scanners: list[ScannerSpec],
+                 frontiers: dict[str, crawl_frontier.Frontier] | None = None) -> dict[str, list[dict]]:
     """
-    Queries the Google Programmable Search Engine (PSE) to find news articles.
-    Uses the configured date range from config.get_news_date_range().
+    Runs scanners concurrently on the shared pool and returns name -> articles.
+    A scanner that raises or runs past its timeout contributes []; past the
+    timeout its fetches fail fast (cooperative stop) so it frees its pool slot.
+    A scanner still queued after its timeout (pool saturated) is cancelled.
+    Every run outcome is recorded in the scanner registry's health stats. With
+    frontiers (incremental discovery), URLs delivered by earlier runs are
+    dropped and each completed scanner's frontier is marked for commit.
     """
-    if not config.GOOGLE_API_KEY or not config.CUSTOM_SEARCH_ENGINE_ID:
-        print("Info: Google PSE not configured (API Key or CX ID missing). Skipping PSE search.")
-        return []
+    frontiers = frontiers or {}
+    submitted = time.time()
+    started: dict[str, float] = {}      # scanner name -> time it began running (set on the pool thread)
+    futures = {}
+    for spec in scanners:
+        frontier = frontiers.get(spec.name) or crawl_frontier.Frontier(spec.name)
+        timeout = spec.timeout or config.DISCOVERY_SCANNER_TIMEOUT
+        futures[_scanner_pool.submit(_run_bound, spec, frontier, timeout, started)] = (spec, frontier, timeout)
 
-    query = " OR ".join([f'"{keyword.strip()}"' for keyword in school['relevance_keywords'] if keyword.strip()])
-    found_articles_from_pse = []
-    try:
-        service = build("customsearch", "v1", developerKey=config.GOOGLE_API_KEY)
-        print(f"\n--- Querying Google PSE (Engine ID: {config.CUSTOM_SEARCH_ENGINE_ID}) ---")
-        print(f"PSE Query: {query}")
-        
-        # Use the configured date range
-        start_date, end_date = config.get_news_date_range()
-        
-        # Try multiple search strategies for better date-specific results
-        search_strategies = [
-            # Strategy 1: Use dateRestrict parameter (searches within last N days)
-            {"use_date_restrict": True},
-            # Strategy 2: Add date to query
-            {"add_date_to_query": True},
-            # Strategy 3: Use sort parameter
-            {"use_sort": True}
-        ]
-        
-        for strategy in search_strategies:
-            if len(found_articles_from_pse) >= config.MAX_SEARCH_RESULTS_TO_PROCESS:
-                break
-                
-            search_params = {
-                "q": query,
-                "cx": config.CUSTOM_SEARCH_ENGINE_ID,
-                "num": min(10, config.MAX_SEARCH_RESULTS_TO_PROCESS - len(found_articles_from_pse))
-            }
-            
-            if strategy.get("add_date_to_query"):
-                # Add date range to query
-                date_query = f"{query} after:{start_date.strftime('%Y-%m-%d')} before:{end_date.strftime('%Y-%m-%d')}"
-                search_params["q"] = date_query
-                print(f"PSE Strategy: Adding date range to query")
-            elif strategy.get("use_sort"):
-                # Use sort parameter
-                start_date_str = start_date.strftime("%Y%m%d")
-                end_date_str = end_date.strftime("%Y%m%d")
-                search_params["sort"] = f"date:r:{start_date_str}:{end_date_str}"
-                print(f"PSE Strategy: Using sort parameter for {start_date} to {end_date}")
-            
+    def deadline(future) -> float:
+        spec, _, timeout = futures[future]
+        began = started.get(spec.name)
+        return submitted + timeout if began is None else began + timeout + _STOP_GRACE
+
+    results = {spec.name: [] for spec in scanners}
+    pending = set(futures)
+    while pending:
+        # Re-check at least every second: a queued scanner's deadline moves when it starts
+        wake = min(min(deadline(f) for f in pending), time.time() + 1)
+        done, pending = wait(pending, timeout=max(0, wake - time.time()), return_when=FIRST_COMPLETED)
+        for future in done:
+            spec, frontier, timeout = futures[future]
+            name = spec.name
+            began = started.get(name, submitted)
+            elapsed = time.time() - began
             try:
-                res = service.cse().list(**search_params).execute()
-                
-                if 'items' in res:
-                    for item in res['items']:
-                        title = item.get('title', 'N/A')
-                        url = item.get('link')
-                        snippet = item.get('snippet', '')
-                        
-                        # Skip if already found
-                        if any(a['url'] == url for a in found_articles_from_pse):
-                            continue
-                            
-                        if not url or not url.startswith("http"):
-                            continue
-                        
-                        # Domain check
-                        if not any(domain in url for domain in school['domains']):
-                            continue
-                        
-                        # Try to extract date from URL for filtering
-                        url_date = extract_date_from_url(url)
-                        if url_date:
-                            try:
-                                article_date = datetime.strptime(url_date, "%Y-%m-%d").date()
-                                if article_date < start_date or article_date > end_date:
-                                    print(f"  PSE result outside date range: {url_date} - {title[:50]}...")
-                                    continue
-                            except ValueError:
-                                pass
-                        
-                        found_articles_from_pse.append({
-                            "title": title, 
-                            "url": url, 
-                            "snippet": snippet,
-                            "url_date": url_date
-                        })
-                    
-                    print(f"  Strategy yielded {len(res.get('items', []))} results, {len(found_articles_from_pse)} within date range")
-                else:
-                    print(f"  Strategy yielded no results")
-                    
+                articles = future.result() or []
             except Exception as e:
-                print(f"  Strategy failed: {e}")
+                logger.error(f"[DISCOVERY] Scanner '{name}' failed: {e}")
+                print(f"Warning: Scanner '{name}' failed: {e}")
+                scanner_registry.record_run(name, None, elapsed, error=str(e))
                 continue
-        
-        print(f"Retrieved {len(found_articles_from_pse)} articles from Google PSE after all strategies.")
-        
-    except Exception as e:
-        print(f"An error occurred while querying Google PSE: {e}")
-    
-    return found_articles_from_pse
+            if elapsed > timeout:
+                # Stopped at its deadline: the results are partial, use none of them
+                logger.warning(f"[DISCOVERY] Scanner '{name}' timed out after {timeout}s; ignoring its results")
+                print(f"Warning: Scanner '{name}' timed out; continuing without it.")
+                scanner_registry.record_run(name, None, elapsed, error="timeout")
+                continue
+            results[name] = frontier.filter_new(articles)
+            frontier.completed = True
+            queued = f" (queued {began - submitted:.1f}s)" if began - submitted >= 1 else ""
+            if frontier.enabled:
+                logger.info(f"[DISCOVERY] Scanner '{name}' finished in {elapsed:.2f}s{queued} with {len(articles)} "
+                            f"articles, {len(results[name])} new since the last run")
+            else:
+                logger.info(f"[DISCOVERY] Scanner '{name}' finished in {elapsed:.2f}s{queued} "
+                            f"with {len(articles)} articles")
+            scanner_registry.record_run(name, len(articles), elapsed, caught_up=frontier.caught_up)
+        for future in [f for f in pending if deadline(f) <= time.time()]:
+            spec, _, timeout = futures[future]
+            if future.cancel():
+                # Never started: every pool slot was busy. Not the scanner's fault, so no health record.
+                pending.discard(future)
+                logger.warning(f"[DISCOVERY] Scanner '{spec.name}' still queued after {timeout}s "
+                               f"({config.DISCOVERY_WORKERS} discovery workers busy); skipping it")
+                print(f"Warning: Scanner '{spec.name}' could not start in time; continuing without it.")
+                continue
+            if spec.name not in started or deadline(future) > time.time():
+                continue    # started just now; its own deadline applies
+            pending.discard(future)
+            logger.warning(f"[DISCOVERY] Scanner '{spec.name}' did not stop within {_STOP_GRACE}s of its "
+                           f"{timeout}s timeout; abandoning its thread")
+            print(f"Warning: Scanner '{spec.name}' timed out; continuing without it.")
+            scanner_registry.record_run(spec.name, None, time.time() - started[spec.name], error="timeout")
+    return results
 
-def find_relevant_articles(school: dict[str, str]) -> list[dict[str, str]]:
+
+def find_relevant_articles(school: dict[str, str], refresh: bool = False) -> list[dict[str, str]]:
     """
     Main discovery function. Combines results from archive pages, category scans, and Google PSE.
     Filters articles to match the configured date range.
+    A result for the same school and range from the last DISCOVERY_CACHE_TTL seconds is
+    reused unless refresh is set (see discovery_cache.py).
     """
     logger.info("=" * 60)
     logger.info(f"[DISCOVERY] Starting article discovery for: {school.get('school_name', 'Unknown')}")
     logger.info("=" * 60)
     
     all_discovered_articles = []
-    processed_urls = set()
+    processed_urls = SeenUrls()     # cross-source: URL variants of one story count once
     
     # Get configured date range for filtering
     start_date, end_date = config.get_news_date_range()
@@ -140,89 +130,82 @@ def find_relevant_articles(school: dict[str, str]) -> list[dict[str, str]]:
     logger.info(f"[DISCOVERY] School ID: {school.get('id')}")
     print(f"\nSearching for articles from {start_date} to {end_date}")
 
-    # First, try archive pages for specific dates (most targeted approach)
-    logger.info(f"[DISCOVERY] Scanning archives for school ID: {school['id']}")
-    archive_start = time.time()
-    
-    if school['id'] == 1:
-        logger.info("[DISCOVERY] Using NYU archive scanner")
-        articles_from_archives = nyu_scan_archive_pages_for_date_range()
-    elif school['id'] == 2:
-        logger.info("[DISCOVERY] Using Emory archive scanner")
-        articles_from_archives = emory_scan_archive_pages_for_date_range()
-    elif school['id'] == 3:
-        logger.info("[DISCOVERY] Using UCD category scanner")
-        articles_from_archives = ucd_scan_category_pages_for_links()
-    elif school['id'] == 4:
-        logger.info("[DISCOVERY] Using UBC archive scanner")
-        articles_from_archives = ubc_scan_archive_pages_for_date_range()
-    elif school['id'] == 5:
-        logger.info("[DISCOVERY] Using USC archive scanner")
-        articles_from_archives = usc_scan_archive_pages_for_date_range()
-    elif school['id'] == 6:
-        logger.info("[DISCOVERY] Using Edinburgh category scanner")
-        articles_from_archives = edin_scan_category_pages_for_date_range()
-    else:
-        logger.warning(f"[DISCOVERY] No scanner configured for school ID: {school['id']}")
-        articles_from_archives = []
-    
-    archive_elapsed = time.time() - archive_start
-    logger.info(f"[DISCOVERY] Archive scan completed in {archive_elapsed:.2f}s, found {len(articles_from_archives)} articles")
-    
-    for article in articles_from_archives:
-        if article["url"] not in processed_urls:
-            article["source_method"] = "archive_scan"
-            all_discovered_articles.append(article)
-            processed_urls.add(article["url"])
-    
-    # Then scan category pages if we need more articles (NYU only)
-    if school['id'] == 1 and len(all_discovered_articles) < config.MAX_SEARCH_RESULTS_TO_PROCESS:
-        print(f"Found {len(all_discovered_articles)} articles from archives, scanning category pages for more...")
-        articles_from_categories = nyu_scan_category_pages_for_links()
-        for article in articles_from_categories:
+    if not refresh:
+        cached = discovery_cache.get(school['id'], start_date, end_date)
+        if cached is not None:
+            print(f"Reusing {len(cached)} articles discovered for this school and date range in the last "
+                  f"{config.DISCOVERY_CACHE_TTL // 60} minutes (start with refresh to crawl again)")
+            return cached
+
+    # Run every sub-scanner for the school at once; discovery takes as long as the slowest source.
+    # Scanners flagged as dead (empty or failing run after run) are skipped between probe runs.
+    scanners = scanner_registry.select_scanners(school['id'])
+    if not scanners:
+        logger.warning(f"[DISCOVERY] No scanner registered for school ID: {school['id']}")
+    logger.info(f"[DISCOVERY] Running {len(scanners)} scanner(s) concurrently: {', '.join(s.name for s in scanners)}")
+    if crawl_frontier.is_enabled():
+        logger.info("[DISCOVERY] Incremental discovery: only articles not delivered by earlier runs are kept")
+    frontiers = {spec.name: crawl_frontier.load(spec.name) for spec in scanners}
+    scan_start = time.time()
+    scanner_results = run_scanners(scanners, frontiers)
+    logger.info(f"[DISCOVERY] Scanners completed in {time.time() - scan_start:.2f}s")
+
+    def in_date_range_or_undated(article):
+        # Category listings also carry older stories; keep in-range or (for rolling runs) undated ones
+        if article.get("url_date"):
+            try:
+                article_date = datetime.strptime(article["url_date"], "%Y-%m-%d").date()
+            except ValueError:
+                return True  # If date parsing fails, include the article for further verification
+            return start_date <= article_date <= end_date
+        # No date in URL, include for further verification if not doing historical search
+        return not config.NEWS_START_DATE
+
+    for spec in scanners:
+        source_method = spec.source_method
+        articles = scanner_results[spec.name]
+        if source_method == "category_scan":
+            # Category pages only top up the list when the archives come up short
+            if len(all_discovered_articles) >= config.MAX_SEARCH_RESULTS_TO_PROCESS:
+                continue
+            print(f"Found {len(all_discovered_articles)} articles from archives, adding category page results...")
+            articles = [a for a in articles if in_date_range_or_undated(a)]
+        for article in articles:
             if article["url"] not in processed_urls:
-                article["source_method"] = "category_scan"
-                
-                # Additional date filtering if date was extracted
-                if article.get("url_date"):
-                    try:
-                        article_date = datetime.strptime(article["url_date"], "%Y-%m-%d").date()
-                        if article_date >= start_date and article_date <= end_date:
-                            all_discovered_articles.append(article)
-                            processed_urls.add(article["url"])
-                        else:
-                            # Don't print for every article, just count
-                            pass
-                    except ValueError:
-                        # If date parsing fails, include the article for further verification
-                        all_discovered_articles.append(article)
-                        processed_urls.add(article["url"])
-                else:
-                    # No date in URL, include for further verification if not doing historical search
-                    if not config.NEWS_START_DATE:
-                        all_discovered_articles.append(article)
-                        processed_urls.add(article["url"])
+                article["source_method"] = source_method
+                article["scanner"] = spec.name
+                all_discovered_articles.append(article)
+                processed_urls.add(article["url"])
     
-    # Finally, try Google PSE if we still need more articles
-    # if len(all_discovered_articles) < config.MAX_SEARCH_RESULTS_TO_PROCESS:
-    #     print(f"Found {len(all_discovered_articles)} articles so far, trying Google PSE for more...")
-    #     articles_from_pse = find_articles_with_google_pse(school)
-    #     for article in articles_from_pse:
-    #         if article["url"] not in processed_urls:
-    #             article["source_method"] = "google_pse"
-    #             all_discovered_articles.append(article)
-    #             processed_urls.add(article["url"])
+    # Finally, Google PSE tops up the list when the scanners came up short (it costs quota)
+    if len(all_discovered_articles) < config.MAX_SEARCH_RESULTS_TO_PROCESS and pse_client.is_configured():
+        print(f"Found {len(all_discovered_articles)} articles so far, trying Google PSE for more...")
+        articles_from_pse = pse_client.find_articles(school, config.MAX_SEARCH_RESULTS_TO_PROCESS - len(all_discovered_articles))
+        for article in articles_from_pse:
+            if article["url"] not in processed_urls:
+                article["source_method"] = "google_pse"
+                all_discovered_articles.append(article)
+                processed_urls.add(article["url"])
 
+    wp_api_count = len([a for a in all_discovered_articles if a.get('source_method') == 'wp_api'])
+    feed_count = len([a for a in all_discovered_articles if a.get('source_method') == 'feed_scan'])
+    sitemap_count = len([a for a in all_discovered_articles if a.get('source_method') == 'sitemap_scan'])
     archive_count = len([a for a in all_discovered_articles if a.get('source_method') == 'archive_scan'])
     category_count = len([a for a in all_discovered_articles if a.get('source_method') == 'category_scan'])
     pse_count = len([a for a in all_discovered_articles if a.get('source_method') == 'google_pse'])
     
     logger.info(f"[DISCOVERY] Total unique articles discovered: {len(all_discovered_articles)}")
+    logger.info(f"[DISCOVERY]   - From WordPress APIs: {wp_api_count}")
+    logger.info(f"[DISCOVERY]   - From feeds: {feed_count}")
+    logger.info(f"[DISCOVERY]   - From sitemaps: {sitemap_count}")
     logger.info(f"[DISCOVERY]   - From archives: {archive_count}")
     logger.info(f"[DISCOVERY]   - From categories: {category_count}")
     logger.info(f"[DISCOVERY]   - From Google PSE: {pse_count}")
     
     print(f"\nTotal unique articles discovered from all sources: {len(all_discovered_articles)}")
+    print(f"  - From WordPress APIs: {wp_api_count}")
+    print(f"  - From feeds: {feed_count}")
+    print(f"  - From sitemaps: {sitemap_count}")
     print(f"  - From archives: {archive_count}")
     print(f"  - From categories: {category_count}")
     print(f"  - From Google PSE: {pse_count}")
@@ -244,6 +227,21 @@ def find_relevant_articles(school: dict[str, str]) -> list[dict[str, str]]:
     
     # Show what we're returning
     limited_articles = all_discovered_articles[:config.MAX_SEARCH_RESULTS_TO_PROCESS]
+
+    # Remember what this run hands to the pipeline so the next incremental run skips it.
+    # A scanner whose in-range articles were cut (result cap, skipped category scan) keeps
+    # its old page validators, or a 304 next run would hide those articles for good.
+    delivered_urls = SeenUrls(a["url"] for a in limited_articles)
+    for spec in scanners:
+        wanted = scanner_results[spec.name]
+        if spec.source_method == "category_scan":
+            wanted = [a for a in wanted if in_date_range_or_undated(a)]
+        all_delivered = all(a["url"] in delivered_urls for a in wanted)
+        if not all_delivered:
+            logger.info(f"[DISCOVERY] Not all new articles of '{spec.name}' were kept; "
+                        f"its listing pages will be fetched in full next run")
+        crawl_frontier.commit(frontiers[spec.name],
+                              [a for a in limited_articles if a.get("scanner") == spec.name], all_delivered)
     
     logger.info(f"[DISCOVERY] Returning top {len(limited_articles)} articles (max: {config.MAX_SEARCH_RESULTS_TO_PROCESS})")
     print(f"\nReturning top {len(limited_articles)} articles for processing:")
@@ -259,7 +257,8 @@ def find_relevant_articles(school: dict[str, str]) -> list[dict[str, str]]:
     logger.info("=" * 60)
     logger.info("[DISCOVERY] Article discovery complete")
     logger.info("=" * 60)
-    
+
+    discovery_cache.put(school['id'], start_date, end_date, limited_articles)
     return limited_articles
 
 if __name__ == '__main__':
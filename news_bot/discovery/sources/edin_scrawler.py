@@ -2,18 +2,22 @@ import re
 from datetime import datetime, date, timedelta
 from urllib.parse import urljoin
 import requests
-from bs4 import BeautifulSoup
-from ...discovery.date_extractor import extract_ymd_from_text, extract_date_from_url
+from ...utils.html_parser import make_soup
+from ...utils.url_canonicalizer import SeenUrls
+from ...discovery.scanner_registry import register_scanner, COST_MODERATE
+from ...discovery import crawl_frontier, link_classifier
+from ...discovery.date_extractor import date_from_text, date_from_url
 from ...core import config, school_config
 
 school = school_config.SCHOOL_PROFILES['edin']
 
+@register_scanner("edin_news", schools=[6], cost=COST_MODERATE, priority=10)
 def edin_scan_edinburgh_news_pages_for_date_range() -> list[dict]:
     start_date, end_date = config.get_news_date_range()
     print(f"\n--- Scanning Category Pages for {start_date} to {end_date} ---")
     
     found_articles: list[dict] = []
-    processed_urls: set[str] = set()
+    processed_urls = SeenUrls()
     
     if not school.get('category_pages'):
         return []
@@ -29,12 +33,15 @@ def edin_scan_edinburgh_news_pages_for_date_range() -> list[dict]:
         headers = {
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
         }
-        resp = requests.get(page_url, headers=headers, timeout=config.URL_FETCH_TIMEOUT)
+        resp = crawl_frontier.current().fetch(page_url, headers=headers)
+        if resp is None:
+            print(f"  Unchanged since the last run: {page_url}")
+            return []
         if resp.status_code == 404:
             print(f"  Archive not found: {page_url}")
             return []
         resp.raise_for_status()
-        soup = BeautifulSoup(resp.content, 'html.parser')
+        soup = make_soup(resp.content)
         cards = soup.find_all('div', class_='news-listing')
         for card in cards:
             a = card.find('a', href=True)
@@ -42,10 +49,10 @@ def edin_scan_edinburgh_news_pages_for_date_range() -> list[dict]:
             abs_url = urljoin(page_url, href)
             title = a.get_text(strip=True) or 'Untitled'
             card_date = card.find('span', class_='news-date').get_text(strip=True)
-            url_date = extract_ymd_from_text(card_date)
-            if url_date is None:
+            article_date = date_from_text(card_date)
+            if article_date is None:
                 continue
-            article_date = datetime.strptime(url_date, "%Y-%m-%d").date()
+            url_date = article_date.isoformat()
             if article_date >= start_date and article_date <= end_date:
                 found_articles.append({
                     "url": abs_url,
@@ -57,12 +64,13 @@ def edin_scan_edinburgh_news_pages_for_date_range() -> list[dict]:
         print(f"  Error accessing Edinburgh category page {page_url}: {e}")
     return found_articles
 
+@register_scanner("edin_student", schools=[6], cost=COST_MODERATE, priority=20)
 def edin_scan_thestudent_news_pages_for_date_range() -> list[dict]:
     start_date, end_date = config.get_news_date_range()
     print(f"\n--- Scanning The Student News Pages for {start_date} to {end_date} ---")
     
     found_articles: list[dict] = []
-    processed_urls: set[str] = set()
+    processed_urls = SeenUrls()
     
     page_url = school['category_pages'][1]
     page_count = 0
@@ -74,29 +82,24 @@ def edin_scan_thestudent_news_pages_for_date_range() -> list[dict]:
         headers = {
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
         }
-        response = requests.get(page_url, headers=headers, timeout=config.URL_FETCH_TIMEOUT)
+        response = crawl_frontier.current().fetch(page_url, headers=headers)
+        if response is None:
+            print(f"  Unchanged since the last run: {page_url}")
+            return []
         
         if response.status_code == 404:
             print(f"  Archive page not found: {page_url}")
             return []
         
         response.raise_for_status()
-        soup = BeautifulSoup(response.content, 'html.parser')
+        soup = make_soup(response.content)
         
-        for link in soup.find('div', class_='zeen-col--wide').find_all('a', href=True):
-            href = link['href']
-            abs_url = urljoin(page_url, href)
-            
-            if abs_url in processed_urls:
-                continue
-            # Filter out non-article URLs
-            skip_patterns = [
-                "/staff_name/", "/staff/", "/writer/", "/contributor/",
-                "/category/news/", "/tag/", "/author/", "/page/",
-                "/about/", "/contact/", "/privacy/", "/terms/",
-                "#", "javascript:", "mailto:"
-            ]
-            if any(skip_path in abs_url.lower() for skip_path in skip_patterns):
+        anchors = soup.find('div', class_='zeen-col--wide').find_all('a', href=True)
+        abs_urls = [urljoin(page_url, link['href']) for link in anchors]
+        # Domain, skip list and URL patterns in one pass (see link_classifier.py)
+        verdicts = link_classifier.for_school('edin').classify_all(abs_urls)
+        for link, abs_url, verdict in zip(anchors, abs_urls, verdicts):
+            if abs_url in processed_urls or verdict != link_classifier.ARTICLE:
                 continue
                                 
             # Chect if the a element has a text content as title
@@ -104,11 +107,10 @@ def edin_scan_thestudent_news_pages_for_date_range() -> list[dict]:
                 continue
             title = link.get_text(strip=True) or 'Untitled'
             
-            url_date = extract_date_from_url(abs_url)
-            if url_date is None:
+            article_date = date_from_url(abs_url)
+            if article_date is None:
                 continue
-            
-            article_date = datetime.strptime(url_date, "%Y-%m-%d").date()
+            url_date = article_date.isoformat()
             if article_date >= start_date and article_date <= end_date:
                 found_articles.append({
                     "url": abs_url,
@@ -2,8 +2,13 @@ import re
 from datetime import datetime, date, timedelta
 from urllib.parse import urljoin
 import requests
-from bs4 import BeautifulSoup
-from ...discovery.date_extractor import extract_date_from_url, extract_ymd_from_text
+from ...utils.html_parser import make_soup
+from ...utils import http_client
+from ...utils.url_canonicalizer import SeenUrls
+from ...discovery.scanner_registry import register_scanner, COST_MODERATE
+from ...discovery.date_extractor import date_from_url, date_from_text
+from ...discovery.paginator import paginate, Page
+from ...discovery import crawl_frontier, link_classifier
 from ...core import config, school_config
 
 school = school_config.SCHOOL_PROFILES['emory']
@@ -20,95 +25,106 @@ def _month_iter(start_date: date, end_date: date):
             y += 1
 
 
+@register_scanner("emory_wheel", schools=[2], cost=COST_MODERATE, priority=20)
 def emory_scan_wheel_pages_for_date_range() -> list[dict]:
     start_date, end_date = config.get_news_date_range()
     print(f"\n--- Scanning Archive Pages for {start_date} to {end_date} ---")
     
     found_articles: list[dict] = []
-    processed_urls: set[str] = set()
+    processed_urls = SeenUrls()
 
     if not school.get('category_pages'):
         return []
 
     # Emory uses a monthly index page
     page_url = school['category_pages'][1]  # https://www.emorywheel.com/section/news?page=1&per_page=20
-    # Try to scan multiple pages if the site supports pagination
-    max_pages = config.MAX_CATEGORY_PAGES_TO_SCAN  # Use config value    
-    break_signal = False
-    
-    for page_num in range(1, max_pages):
-        if break_signal:
-            break
+    frontier = crawl_frontier.current()
+    classifier = link_classifier.for_school('emory')
+
+    def fetch_page(page_num: int) -> Page:
         current_page_url = f"{page_url}?page={page_num}&per_page=20"
         print(f"Checking Emory wheel page: {current_page_url}")
-        try:
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-            }
-            resp = requests.get(current_page_url, headers=headers, timeout=config.URL_FETCH_TIMEOUT)
-            if resp.status_code == 404:
-                print(f"  Page not found: {current_page_url}")
+        headers = {
+            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+        }
+        resp = frontier.fetch(current_page_url, headers=headers)
+        if resp is None:
+            print(f"  Unchanged since the last run: {current_page_url}")
+            return Page(page_num, [], [], exists=False)
+        if resp.status_code == 404:
+            print(f"  Page not found: {current_page_url}")
+            return Page(page_num, [], [])
+        resp.raise_for_status()
+        soup = make_soup(resp.content)
+
+        candidates = []
+        for article in soup.find_all('article'):
+            anchors = article.find_all('a', href=True)
+            datelines = article.find_all('span', class_='dateline')
+            if len(anchors) < 2 or len(datelines) < 2:
                 continue
-            resp.raise_for_status()
-            soup = BeautifulSoup(resp.content, 'html.parser')
-            
-            
-            for article in soup.find_all('article'):
-                a = article.find_all('a', href=True)[1]
-                href = a['href']
-                abs_url = urljoin(current_page_url, href)
-                if 'emorywheel.com/article/' not in abs_url:
-                    continue
-                if abs_url in processed_urls:
-                    continue
-                
-                title = a['title'] or 'Untitled'
-                url_date = article.find_all('span', class_='dateline')[1].get_text(strip=True)
-                url_date = extract_ymd_from_text(url_date)
-                
-                # Compare dates only after converting to a date object
-                if url_date:
-                    try:
-                        article_date = datetime.strptime(url_date, '%Y-%m-%d').date()
-                        if article_date < start_date:
-                            break_signal = True                       
-                        if article_date < start_date or article_date > end_date:
-                            print(start_date, url_date, end_date)
-                            continue
-                    except ValueError:
-                        # If parsing fails, keep the article without filtering by date
-                        pass       
-                
-                found_articles.append({
-                    'title': title,
-                    'url': abs_url,
-                    'snippet': title,
-                    'url_date': url_date
-                })
-                processed_urls.add(abs_url)
-                
-        except requests.exceptions.RequestException as e:
-            print(f"  Error accessing Emory wheel page {current_page_url}: {e}")
-        except Exception as e:
-            print(f"  Error processing Emory wheel page {current_page_url}: {e}")
+            candidates.append((anchors[1], urljoin(current_page_url, anchors[1]['href']), datelines[1]))
+
+        items, dates = [], []
+        # Domain, skip list and URL patterns in one pass (see link_classifier.py)
+        verdicts = classifier.classify_all(abs_url for _, abs_url, _ in candidates)
+        for (a, abs_url, dateline), verdict in zip(candidates, verdicts):
+            if verdict != link_classifier.ARTICLE:
+                continue
+            article_date = date_from_text(dateline.get_text(strip=True))
+            url_date = article_date.isoformat() if article_date else None
+            if article_date:
+                dates.append(article_date)
+            items.append({'title': a.get('title') or 'Untitled', 'url': abs_url, 'url_date': url_date})
+        return Page(page_num, items, dates, urls=tuple(item['url'] for item in items))
+
+    # Pages are prefetched concurrently and paging stops once a page is entirely
+    # older than the range
+    for page in paginate(fetch_page, start_date, end_date, first_page=1,
+                         max_pages=max(1, config.MAX_CATEGORY_PAGES_TO_SCAN - 1)):
+        for item in page.items:
+            abs_url = item['url']
+            if abs_url in processed_urls:
+                continue
+            url_date = item['url_date']
+
+            # Compare dates only after converting to a date object
+            if url_date:
+                try:
+                    article_date = datetime.strptime(url_date, '%Y-%m-%d').date()
+                    if article_date < start_date or article_date > end_date:
+                        continue
+                except ValueError:
+                    # If parsing fails, keep the article without filtering by date
+                    pass
+
+            found_articles.append({
+                'title': item['title'],
+                'url': abs_url,
+                'snippet': item['title'],
+                'url_date': url_date
+            })
+            processed_urls.add(abs_url)
 
     print(f"Emory wheel pages yielded {len(found_articles)} articles in range")
     return found_articles
 
 
 
+@register_scanner("emory_edu", schools=[2], cost=COST_MODERATE, priority=10)
 def emory_scan_edu_pages_for_date_range() -> list[dict]:
     start_date, end_date = config.get_news_date_range()
     print(f"\n--- Scanning Archive Pages for {start_date} to {end_date} ---")
     
     found_articles: list[dict] = []
-    processed_urls: set[str] = set()
+    processed_urls = SeenUrls()
 
     if not school.get('archive_patterns'):
         return []
 
     # Emory uses a monthly index page
     monthly_pattern = school['archive_patterns'][0]  # https://news.emory.edu/stories/{year}/{month:02d}/index.html
+    classifier = link_classifier.for_school('emory')
 
     for y, m in _month_iter(start_date, end_date):
         # get the archive url for the month
@@ -118,40 +134,34 @@ def emory_scan_edu_pages_for_date_range() -> list[dict]:
             headers = {
                 'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
             }
-            resp = requests.get(archive_url, headers=headers, timeout=config.URL_FETCH_TIMEOUT)
+            resp = http_client.get(archive_url, headers=headers)
             if resp.status_code == 404:
                 print(f"  Archive not found: {archive_url}")
                 continue
             resp.raise_for_status()
-            soup = BeautifulSoup(resp.content, 'html.parser')
+            soup = make_soup(resp.content)
 
             # Find story links on the monthly index
-            for a in soup.find_all('a', href=True):
-                href = a['href']
-                abs_url = urljoin(archive_url, href)
-                if 'news.emory.edu/stories/' not in abs_url:
-                    continue
-                if not abs_url.endswith('/story.html'):
-                    continue
-                if abs_url in processed_urls:
+            anchors = soup.find_all('a', href=True)
+            abs_urls = [urljoin(archive_url, a['href']) for a in anchors]
+            # Domain, skip list and URL patterns in one pass (see link_classifier.py)
+            verdicts = classifier.classify_all(abs_urls)
+            for a, abs_url, verdict in zip(anchors, abs_urls, verdicts):
+                if verdict != link_classifier.ARTICLE or abs_url in processed_urls:
                     continue
 
                 title = a.get_text(strip=True) or 'Untitled'
 
                 # Try to extract date from slug; if missing, approximate to month start
-                url_date = extract_date_from_url(abs_url)
+                ad = date_from_url(abs_url)
                 # If date is not found, fetch the date from child element(<div class="tag-list-item-meta">) of <a href="...">
-                if url_date is None:
+                if ad is None:
                     meta = a.find('div', class_='tag-list-item-meta')
                     if meta:
-                        url_date = meta.get_text(strip=True)
-
-                try:
-                    ad = datetime.strptime(url_date, '%Y-%m-%d').date()
-                    if ad < start_date or ad > end_date:
-                        continue
-                except ValueError:
-                    pass
+                        ad = date_from_text(meta.get_text(strip=True))
+                if ad and (ad < start_date or ad > end_date):
+                    continue
+                url_date = ad.isoformat() if ad else None
 
                 found_articles.append({
                     'title': title,
@@ -0,0 +1,267 @@
+# news_bot/discovery/sources/sitemap_scanner.py
+
+import io
+import os
+import re
+import json
+import zlib
+import hashlib
+import logging
+from datetime import date
+from functools import partial
+from typing import Iterator, NamedTuple
+from urllib.parse import urlsplit, unquote
+from xml.etree import ElementTree
+from ...core import config, school_config
+from ...utils import http_client
+from ...utils.url_canonicalizer import SeenUrls
+from ...discovery.scanner_registry import register_scanner, COST_CHEAP
+from ...discovery import link_classifier
+from ...discovery.sources.feed_scanner import parse_feed_date
+
+# Setup logging
+logger = logging.getLogger('sitemap_scanner')
+
+# Sitemap discovery for newsrooms without a usable feed, listed under a school's "sitemaps":
+#   "sitemaps": [{"site": "https://news.emory.edu", "include": r"/stories/\d{4}/\d{2}/"},
+#                {"url": "https://example.edu/news-sitemap.xml"}]
+# A "site" entry uses the Sitemap: lines of its robots.txt (else /sitemap.xml). Indexes
+# are followed only into child sitemaps whose lastmod reaches the date range, and
+# <url> entries are kept when their news:publication_date (or lastmod) falls in the
+# range, the URL matches "include" and the school's link classifier takes it for an
+# article. Every sitemap document is stored under DISCOVERY_STATE_DIR/sitemaps and
+# re-fetched with a conditional GET, so an unchanged index costs a 304.
+
+SITEMAP_CACHE_DIRNAME = "sitemaps"
+_MAX_SITEMAP_BYTES = 50 * 1024 * 1024     # the protocol's limit for one sitemap; caps the download and the decompressed body
+_MAX_CHILD_SITEMAPS = 20                  # per site, newest lastmod first
+_MAX_INDEX_DEPTH = 2
+_SITEMAP_CONTENT_TYPES = ("application/xml", "text/xml", "application/x-gzip", "application/gzip",
+                          "application/octet-stream", "text/plain")
+
+HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
+    'Accept': 'application/xml, text/xml;q=0.9, */*;q=0.8',
+}
+
+
+class SitemapEntry(NamedTuple):
+    loc: str
+    lastmod: date | None
+    published: date | None      # news:publication_date
+    title: str | None           # news:title
+    is_sitemap: bool            # True for the <sitemap> children of an index
+
+
+def _local_name(tag: str) -> str:
+    return tag.rsplit('}', 1)[-1]
+
+
+def parse_sitemap(content: bytes) -> Iterator[SitemapEntry]:
+    """Yields the <url> / <sitemap> entries of a urlset or sitemap index, clearing each one once read."""
+    try:
+        for _, element in ElementTree.iterparse(io.BytesIO(content), events=("end",)):
+            name = _local_name(element.tag)
+            if name not in ("url", "sitemap"):
+                continue
+            fields: dict[str, str] = {}
+            for child in element.iter():
+                child_name = _local_name(child.tag)
+                if child_name not in fields and child.text and child.text.strip():
+                    fields[child_name] = child.text.strip()
+            element.clear()
+            if not fields.get("loc"):
+                continue
+            yield SitemapEntry(
+                loc=fields["loc"],
+                lastmod=parse_feed_date(fields.get("lastmod")),
+                published=parse_feed_date(fields.get("publication_date")),
+                title=fields.get("title"),
+                is_sitemap=name == "sitemap",
+            )
+    except ElementTree.ParseError as e:
+        # A body cut at the size cap still yields the entries before the cut
+        logger.warning(f"[SITEMAP] Stopped parsing at malformed XML: {e}")
+
+
+# --- Conditional-GET cache --------------------------------------------------------
+
+def _cache_paths(url: str) -> tuple[str, str]:
+    key = hashlib.sha1(url.encode('utf-8')).hexdigest()
+    cache_dir = os.path.join(config.DISCOVERY_STATE_DIR, SITEMAP_CACHE_DIRNAME)
+    return os.path.join(cache_dir, key + ".xml"), os.path.join(cache_dir, key + ".json")
+
+
+def _read_cached(url: str) -> tuple[dict, bytes | None]:
+    body_path, meta_path = _cache_paths(url)
+    try:
+        with open(meta_path, 'r', encoding='utf-8') as f:
+            meta = json.load(f)
+        with open(body_path, 'rb') as f:
+            return meta, f.read()
+    except (OSError, ValueError):
+        return {}, None
+
+
+def _write_cached(url: str, response, body: bytes) -> None:
+    meta = {"url": url, "etag": response.headers.get("ETag"), "last_modified": response.headers.get("Last-Modified")}
+    if not (meta["etag"] or meta["last_modified"]):
+        return
+    body_path, meta_path = _cache_paths(url)
+    try:
+        os.makedirs(os.path.dirname(body_path), exist_ok=True)
+        for path, data, mode in ((body_path, body, 'wb'), (meta_path, json.dumps(meta), 'w')):
+            tmp_path = path + ".tmp"
+            with open(tmp_path, mode) as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+    except OSError as e:
+        logger.warning(f"[SITEMAP] Could not cache {url}: {e}")
+
+
+def _gunzip(body: bytes, limit: int) -> tuple[bytes, bool]:
+    """Decompresses a gzip body in chunks up to limit bytes; (data, truncated). A .gz bomb stops at the cap."""
+    decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+    try:
+        data = decompressor.decompress(body, limit)
+    except zlib.error as e:
+        logger.warning(f"[SITEMAP] Corrupt gzip body: {e}")
+        return b"", True
+    return data, bool(decompressor.unconsumed_tail)
+
+
+def fetch_sitemap(url: str) -> bytes | None:
+    """The (decompressed) sitemap document, from the cache when the server answers 304; None on 404."""
+    meta, cached = _read_cached(url)
+    headers = dict(HEADERS)
+    if cached is not None:
+        if meta.get("etag"):
+            headers["If-None-Match"] = meta["etag"]
+        if meta.get("last_modified"):
+            headers["If-Modified-Since"] = meta["last_modified"]
+    resp = http_client.get(url, headers=headers, accept=_SITEMAP_CONTENT_TYPES, max_bytes=_MAX_SITEMAP_BYTES)
+    if resp.status_code == 304 and cached is not None:
+        logger.info(f"[SITEMAP] {url} not modified, using cached copy")
+        return cached
+    if resp.status_code == 404:
+        return None
+    resp.raise_for_status()
+    body = resp.content
+    truncated = getattr(resp, "truncated", False)
+    if body[:2] == b"\x1f\x8b":
+        body, cut = _gunzip(body, _MAX_SITEMAP_BYTES)
+        if cut:
+            logger.warning(f"[SITEMAP] {url} decompresses past {_MAX_SITEMAP_BYTES} bytes, keeping the first part")
+        truncated = truncated or cut
+    if not truncated:
+        _write_cached(url, resp, body)
+    return body
+
+
+# --- Scanning ---------------------------------------------------------------------
+
+def _title_from_url(url: str) -> str:
+    # Plain sitemaps carry no titles; the slug is close enough for the candidate list
+    segments = [s for s in urlsplit(url).path.split('/') if s and s not in ("index.html", "story.html")]
+    slug = re.sub(r'\.\w+$', '', unquote(segments[-1])) if segments else url
+    return re.sub(r'[-_]+', ' ', slug).strip().capitalize() or "Untitled"
+
+
+def _root_sitemaps(entry: dict) -> list[str]:
+    if entry.get("url"):
+        return [entry["url"]]
+    site = entry["site"].rstrip('/')
+    declared = [u for u in http_client.robots_sitemaps(site + "/") if urlsplit(u).netloc == urlsplit(site).netloc]
+    return declared or [f"{site}/sitemap.xml"]
+
+
+def scan_sitemap(entry: dict, start_date: date, end_date: date, processed_urls: SeenUrls,
+                 classifier: link_classifier.LinkClassifier) -> list[dict]:
+    """In-range article candidates from one "sitemaps" entry; URLs already in processed_urls are skipped (and added)."""
+    include = re.compile(entry["include"]) if entry.get("include") else None
+    found_articles = []
+    to_visit = [(url, 0) for url in _root_sitemaps(entry)]
+    visited: set[str] = set()
+    children_followed = 0
+
+    while to_visit:
+        url, depth = to_visit.pop(0)
+        if url in visited:
+            continue
+        visited.add(url)
+        print(f"Checking sitemap: {url}")
+        try:
+            content = fetch_sitemap(url)
+        except Exception as e:
+            logger.warning(f"[SITEMAP] Failed to fetch {url}: {e}")
+            print(f"  Error fetching sitemap {url}: {e}")
+            continue
+        if content is None:
+            continue
+
+        children, in_range = [], []
+        for item in parse_sitemap(content):
+            if item.is_sitemap:
+                # Nothing in a child last modified before the range can be new
+                if item.lastmod is None or item.lastmod >= start_date:
+                    children.append(item)
+                continue
+            if item.loc in processed_urls or (include and not include.search(item.loc)):
+                continue
+            item_date = item.published or item.lastmod
+            if item_date is None or item_date < start_date or item_date > end_date:
+                continue
+            in_range.append(item)
+
+        # Domain, skip list and URL patterns in one pass (see link_classifier.py)
+        verdicts = classifier.classify_all(item.loc for item in in_range)
+        for item, verdict in zip(in_range, verdicts):
+            if verdict != link_classifier.ARTICLE or item.loc in processed_urls:
+                continue
+            title = item.title or _title_from_url(item.loc)
+            found_articles.append({
+                "title": title,
+                "url": item.loc,
+                "snippet": title,
+                # lastmod only bounds the publication date from above; verification dates the page
+                "url_date": item.published.isoformat() if item.published else None,
+            })
+            processed_urls.add(item.loc)
+
+        if depth >= _MAX_INDEX_DEPTH:
+            continue
+        children.sort(key=lambda c: c.lastmod or date.max, reverse=True)
+        for child in children:
+            if children_followed >= _MAX_CHILD_SITEMAPS:
+                logger.info(f"[SITEMAP] {url}: child sitemap limit ({_MAX_CHILD_SITEMAPS}) reached")
+                break
+            to_visit.append((child.loc, depth + 1))
+            children_followed += 1
+
+    logger.info(f"[SITEMAP] {entry.get('site') or entry.get('url')}: {len(found_articles)} URLs in range "
+                f"from {len(visited)} sitemap(s)")
+    return found_articles
+
+
+def scan_sitemaps(school_key: str) -> list[dict]:
+    """Candidates whose sitemap dates fall in the news date range, from the school's sitemaps."""
+    school = school_config.SCHOOL_PROFILES[school_key]
+    start_date, end_date = config.get_news_date_range()
+    print(f"\n--- Scanning Sitemaps for {school['school_name']} ({start_date} to {end_date}) ---")
+
+    found_articles: list[dict] = []
+    processed_urls = SeenUrls()
+    classifier = link_classifier.for_school(school_key)
+    for entry in school.get("sitemaps", []):
+        found_articles.extend(scan_sitemap(entry, start_date, end_date, processed_urls, classifier))
+
+    print(f"Sitemaps yielded {len(found_articles)} articles in range")
+    return found_articles
+
+
+# One sitemap scanner per school that lists sitemaps; after the feeds (which carry
+# titles and text) and before the HTML listing scanners
+for _key, _profile in school_config.SCHOOL_PROFILES.items():
+    if _profile.get("sitemaps"):
+        register_scanner(f"{_key}_sitemaps", schools=[_profile["id"]], source_method="sitemap_scan",
+                         cost=COST_CHEAP, priority=7)(partial(scan_sitemaps, _key))
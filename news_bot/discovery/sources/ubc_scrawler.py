@@ -2,8 +2,13 @@ import re
 from datetime import datetime, date, timedelta
 from urllib.parse import urljoin
 import requests
-from bs4 import BeautifulSoup
-from ...discovery.date_extractor import extract_date_from_url
+from ...utils.html_parser import make_soup
+from ...utils import http_client
+from ...utils.url_canonicalizer import SeenUrls
+from ...discovery.scanner_registry import register_scanner, COST_MODERATE
+from ...discovery.date_extractor import date_from_text
+from ...discovery.paginator import paginate, Page
+from ...discovery import crawl_frontier, link_classifier
 from ...core import config, school_config
 
 
@@ -31,6 +36,7 @@ def _month_iter(start_date: date, end_date: date):
             m = 1
             y += 1
 
+@register_scanner("ubc_ubyssey", schools=[4], cost=COST_MODERATE, priority=20)
 def ubc_scan_ubyssey_pages_for_date_range() -> list[dict]:
     school = school_config.SCHOOL_PROFILES['ubc']
     start_date, end_date = config.get_news_date_range()
@@ -38,20 +44,24 @@ def ubc_scan_ubyssey_pages_for_date_range() -> list[dict]:
     print(f"\n--- Scanning Ubyssey Pages for {start_date} to {end_date} ---")
     
     found_articles = []
-    processed_urls = set()
+    processed_urls = SeenUrls()
     
     try:
         headers = {
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
         }
-        resp = requests.get(page_url, headers=headers, timeout=config.URL_FETCH_TIMEOUT)
+        resp = crawl_frontier.current().fetch(page_url, headers=headers)
+        if resp is None:
+            print(f"  Unchanged since the last run: {page_url}")
+            return []
         if resp.status_code == 404:
             print(f"  Page not found: {page_url}")
 
         resp.raise_for_status()
-        soup = BeautifulSoup(resp.content, 'html.parser')
+        soup = make_soup(resp.content)
         
         
+        candidates = []
         for article in soup.find_all('article'):
             headline = article.find('h3', class_='o-article__headline')
             if not headline:
@@ -60,37 +70,33 @@ def ubc_scan_ubyssey_pages_for_date_range() -> list[dict]:
             link = headline.find('a', href=True)
             if not link:
                 continue
-            href = link['href']
-            abs_url = urljoin(page_url, href)
-            if 'ubyssey.ca/news/' not in abs_url:
-                continue
-            if abs_url in processed_urls:
+            candidates.append((article, title, urljoin(page_url, link['href'])))
+
+        # Domain, skip list and URL patterns in one pass (see link_classifier.py)
+        verdicts = link_classifier.for_school('ubc').classify_all(abs_url for _, _, abs_url in candidates)
+        for (article, title, abs_url), verdict in zip(candidates, verdicts):
+            if verdict != link_classifier.ARTICLE or abs_url in processed_urls:
                 continue
              
-            url_date = article.get("time")
-            if url_date is None:
+            time_text = article.get("time")
+            if time_text is None:
                 continue
-            if url_date.startswith('today'):
-                url_date = datetime.now().strftime('%Y-%m-%d')
-            elif url_date.startswith('yesterday'):
-                url_date = (datetime.now() - timedelta(days=1)).strftime('%Y-%m-%d')
+            if time_text.startswith('today'):
+                article_date = date.today()
+            elif time_text.startswith('yesterday'):
+                article_date = date.today() - timedelta(days=1)
             else:
                 # format: Dec. 2, 2025 -> 2025-12-02
-                url_date = extract_date_from_url(url_date)
-                
-            
-            # Compare dates only after converting to a date object
-            try:
-                article_date = datetime.strptime(url_date, '%Y-%m-%d').date()
+                article_date = date_from_text(time_text)
+            url_date = article_date.isoformat() if article_date else None
+
+            # If parsing fails, keep the article without filtering by date
+            if article_date:
                 if article_date < start_date:
-                    break_signal = True                       
+                    break_signal = True
                 if article_date < start_date or article_date > end_date:
-                    print(start_date, url_date, end_date)
                     continue
-            except ValueError:
-                # If parsing fails, keep the article without filtering by date
-                pass       
-            
+
             found_articles.append({
                 'title': title,
                 'url': abs_url,
@@ -106,89 +112,94 @@ def ubc_scan_ubyssey_pages_for_date_range() -> list[dict]:
 
     return found_articles
 
+@register_scanner("ubc_today", schools=[4], cost=COST_MODERATE, priority=10)
 def ubc_scan_category_pages_for_date_range() -> list[dict]:
     school = school_config.SCHOOL_PROFILES['ubc']
     start_date, end_date = config.get_news_date_range()
-    page = 0
-    flag = True
     print(f"\n--- Scanning Category Pages for {start_date} to {end_date} ---")
     
     found_articles: list[dict] = []
-    processed_urls: set[str] = set()
+    processed_urls = SeenUrls()
 
     if not school.get('category_pages'):
         return []
 
-    for page_url in school['category_pages']:
-        # UBC uses a pagination system, flip page until the page date is outside the range
-        while flag:
-            print(f"Checking UBC category page: {page_url}")
-            
+    # The category page is the ubctoday Drupal view; it is paged through its AJAX
+    # endpoint once, and relative card links resolve against ubctoday.ubc.ca
+    page_url = school['category_pages'][0]
+    classifier = link_classifier.for_school('ubc')
+
+    def fetch_page(page_num: int) -> Page:
+        print(f"Checking UBC category page: {page_url} (page {page_num})")
+        ajax_url = "https://ubctoday.ubc.ca/views/ajax"
+        payload = {
+        "view_name": "content_roundup",
+        "view_display_id": "block_1",
+        "view_args": "",
+        "view_path": "/updates-news-and-stories",
+        "pager_element": "0",
+        "page": page_num,
+        "_drupal_ajax": "1",
+        "_wrapper_format": "drupal_ajax",
+        }
+        headers = {
+            "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/127.0.0.0 Safari/537.36",
+            "Accept": "application/json",
+            "X-Requested-With": "XMLHttpRequest",
+            "Referer": "https://ubctoday.ubc.ca/updates-news-and-stories",
+        }
+        cmds = http_client.post(
+            ajax_url,
+            data=payload,
+            headers=headers,
+        ).json()
+        html = next((c.get("data") for c in cmds if isinstance(c, dict) and c.get("command") == "insert"), "")
+        soup = make_soup(html)
+
+        cards = []
+        for card in soup.find_all('div', class_='ubc-card__content'):
+            # extract the link
+            link = card.find('a', href=True)
+            if not link:
+                continue
             try:
-                ajax_url = "https://ubctoday.ubc.ca/views/ajax"
-                payload = {
-                "view_name": "content_roundup",
-                "view_display_id": "block_1",
-                "view_args": "",
-                "view_path": "/updates-news-and-stories",
-                "pager_element": "0",
-                "page": page,
-                "_drupal_ajax": "1",
-                "_wrapper_format": "drupal_ajax",
-                }
-                headers = {
-                    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/127.0.0.0 Safari/537.36",
-                    "Accept": "application/json",
-                    "X-Requested-With": "XMLHttpRequest",
-                    "Referer": "https://ubctoday.ubc.ca/updates-news-and-stories",
-                }
-                cmds = requests.post(
-                    ajax_url,
-                    data=payload,
-                    headers=headers,
-                    timeout=config.URL_FETCH_TIMEOUT  # or (10, 30)
-                ).json()
-                html = next((c.get("data") for c in cmds if isinstance(c, dict) and c.get("command") == "insert"), "")
-                soup = BeautifulSoup(html, "html.parser")
-                
-                for card in soup.find_all('div', class_='ubc-card__content'):
-                    # extract the link
-                    link = card.find('a', href=True)
-                    if link:
-                        href = link['href']
-                        abs_url = urljoin(page_url, href)
-                        # deduplication + ignore news from news.ok.ubc.ca
-                        if abs_url in processed_urls or "https://news.ok.ubc.ca/" in abs_url:
-                            continue
-                        
-                        # extract the title
-                        title = card.find('h2', class_='card__title').find('span').get_text(strip=True)
-                        
-                        # extract the date - select the second div element inside the card
-                        date = card.find_all('div')[1].get_text(strip=True)
-                        
-                        url_date_str = to_url_date(date.split('|')[0])
-                        if not url_date_str:
-                            continue
-                        article_date = datetime.strptime(url_date_str, "%Y-%m-%d").date()
-                        if article_date > end_date:
-                            # newer than window → skip this card
-                            continue                 
-                        if article_date < start_date:
-                            flag = False
-                            break
-                        # add the article to the list
-                        found_articles.append({
-                            "title": title,
-                            "url": abs_url,
-                            "snippet": title,
-                            "url_date": url_date_str
-                        })
-                        processed_urls.add(abs_url)
-                                       
-                page += 1
-            except Exception as e:
-                print(f"  Error accessing UBC category page {page_url}: {e}")
+                # extract the title
+                title = card.find('h2', class_='card__title').find('span').get_text(strip=True)
+                # extract the date - select the second div element inside the card
+                date_text = card.find_all('div')[1].get_text(strip=True)
+            except (AttributeError, IndexError):
+                continue
+            url_date_str = to_url_date(date_text.split('|')[0])
+            if not url_date_str:
+                continue
+            cards.append({"url": urljoin(page_url, link['href']), "title": title, "url_date": url_date_str})
+        dates = [datetime.strptime(c["url_date"], "%Y-%m-%d").date() for c in cards]
+        # An empty insert means we paged past the end of the view
+        return Page(page_num, cards, dates, exists=bool(soup.find('div', class_='ubc-card__content')),
+                    urls=tuple(c["url"] for c in cards))
+
+    # UBC pages through a Drupal view (page 0 is the newest); the paginator stops
+    # once a page is entirely older than the range
+    for page in paginate(fetch_page, start_date, end_date, first_page=0):
+        # Domain, skip list and URL patterns in one pass (see link_classifier.py);
+        # news.ok.ubc.ca is not one of the profile's domains
+        verdicts = classifier.classify_all(card["url"] for card in page.items)
+        for card, verdict in zip(page.items, verdicts):
+            abs_url = card["url"]
+            if verdict != link_classifier.ARTICLE or abs_url in processed_urls:
+                continue
+            article_date = datetime.strptime(card["url_date"], "%Y-%m-%d").date()
+            if article_date > end_date or article_date < start_date:
+                # outside the window → skip this card
+                continue
+            # add the article to the list
+            found_articles.append({
+                "title": card["title"],
+                "url": abs_url,
+                "snippet": card["title"],
+                "url_date": card["url_date"]
+            })
+            processed_urls.add(abs_url)
     return found_articles
 
 
@@ -198,7 +209,7 @@ def ubc_scan_archive_pages_for_date_range() -> list[dict]:
     print(f"\n--- Scanning Archive Pages for {start_date} to {end_date} ---")
     
     found_articles: list[dict] = []
-    processed_urls: set[str] = set()
+    processed_urls = SeenUrls()
 
     # if not school.get('archive_patterns'):
     #     return []
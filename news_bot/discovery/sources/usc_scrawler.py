@@ -1,10 +1,13 @@
 from datetime import date, timedelta, datetime
 from googleapiclient.discovery import build # For Google Custom Search API
 from ...core import config, school_config
-from ...discovery.date_extractor import extract_date_from_url, extract_ymd_from_text
+from ...discovery.date_extractor import date_from_url, date_from_text
 from ...utils import prompt_logger, openrouter_client
+from ...utils.url_canonicalizer import SeenUrls
+from ...discovery.scanner_registry import register_scanner, COST_CHEAP
+from ...discovery import crawl_frontier, link_classifier
 import requests # For fetching category pages
-from bs4 import BeautifulSoup # For parsing category pages
+from ...utils.html_parser import make_soup
 from urllib.parse import urljoin # For resolving relative URLs
 import re # For regular expressions
 import json
@@ -213,29 +216,33 @@ import json
 #     return found_articles
 
     
+@register_scanner("usc_cbs", schools=[5], cost=COST_CHEAP, priority=30)
 def usc_scan_ubcnews_for_links() -> list[dict]:
     start_date, end_date = config.get_news_date_range()
     print(f"\n--- Scanning USC News for {start_date} to {end_date} ---")
     found_articles = []
-    processed_urls = set()
+    processed_urls = SeenUrls()
     
     url = "https://www.cbsnews.com/tag/university-of-southern-california/"
     try:
         headers = {
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
         }
-        response = requests.get(url, headers=headers, timeout=config.URL_FETCH_TIMEOUT)
+        response = crawl_frontier.current().fetch(url, headers=headers)
+        if response is None:
+            print(f"  Unchanged since the last run: {url}")
+            return []
         response.raise_for_status()
-        soup = BeautifulSoup(response.content, 'html.parser')
+        soup = make_soup(response.content)
         side_bar_section = soup.find('section', id="component-list-latest-news")
         articles = side_bar_section.find_all('article')
-        for article in articles:
-            title = article.find('h4').text
-            
-            url = article.find('a')['href']
-            # skip video articles
-            if '/video/' in url:
+        urls = [urljoin(response.url, article.find('a')['href']) for article in articles]
+        # Domain, skip list (video clips) and URL patterns in one pass (see link_classifier.py)
+        verdicts = link_classifier.for_school('usc').classify_all(urls)
+        for article, url, verdict in zip(articles, urls, verdicts):
+            if verdict != link_classifier.ARTICLE:
                 continue
+            title = article.find('h4').text
             
             # Find article overview text
             overview = article.find('p', class_="item__dek").text
@@ -247,14 +254,10 @@ def usc_scan_ubcnews_for_links() -> list[dict]:
                 url_date = article_date.strftime('%Y-%m-%d')
             else:
                 # e.g., "Apr 26, 2024" -> extract_ymd_from_text returns "YYYY-MM-DD" or None
-                extracted = extract_ymd_from_text(dt_str)
-                if not extracted:
-                    continue
-                url_date = extracted
-                try:
-                    article_date = datetime.strptime(extracted, "%Y-%m-%d").date()
-                except ValueError:
+                article_date = date_from_text(dt_str)
+                if not article_date:
                     continue
+                url_date = article_date.isoformat()
             # Compare using article_date (datetime.date) to avoid str vs date errors
             if article_date:
                 if article_date < start_date:
@@ -271,20 +274,24 @@ def usc_scan_ubcnews_for_links() -> list[dict]:
     return found_articles
 
 
+@register_scanner("usc_latimes", schools=[5], cost=COST_CHEAP, priority=20)
 def usc_latimes_news_pages_for_links() -> list[dict]:
     start_date, end_date = config.get_news_date_range()
     print(f"\n--- Scanning USC LATimes News for {start_date} to {end_date} ---")
     found_articles = []
-    processed_urls = set()
+    processed_urls = SeenUrls()
     
     url = "https://www.latimes.com/topic/education"
     try:
         headers = {
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
         }
-        response = requests.get(url, headers=headers, timeout=config.URL_FETCH_TIMEOUT)
+        response = crawl_frontier.current().fetch(url, headers=headers)
+        if response is None:
+            print(f"  Unchanged since the last run: {url}")
+            return []
         response.raise_for_status()
-        soup = BeautifulSoup(response.text, "html.parser")
+        soup = make_soup(response.text)
 
         # New LATimes listing structure (per screenshot):
         # <div class="list-items">
@@ -298,6 +305,7 @@ def usc_latimes_news_pages_for_links() -> list[dict]:
         #   </div>
         # </div>
         items = soup.select("div.list-items div.list-items-item")
+        candidates = []
         for li in items:
             a = (li.select_one("div.promo-content a[href]") or
                  li.select_one("a.tnt-asset-link[href]") or
@@ -309,9 +317,12 @@ def usc_latimes_news_pages_for_links() -> list[dict]:
             href = a['href']
             if not href:
                 continue
+            candidates.append((li, title, urljoin(response.url, href)))
 
-            abs_url = urljoin(response.url, href)
-            if abs_url in processed_urls:
+        # Domain, skip list and URL patterns in one pass (see link_classifier.py)
+        verdicts = link_classifier.for_school('usc').classify_all(abs_url for _, _, abs_url in candidates)
+        for (li, title, abs_url), verdict in zip(candidates, verdicts):
+            if verdict != link_classifier.ARTICLE or abs_url in processed_urls:
                 continue
 
             # Prefer a <time datetime="..."> if present; fallback to date extracted from URL
@@ -327,12 +338,8 @@ def usc_latimes_news_pages_for_links() -> list[dict]:
                     article_date = None
                     url_date = None
             if article_date is None:
-                url_date = extract_date_from_url(abs_url)
-                if url_date:
-                    try:
-                        article_date = datetime.strptime(url_date, "%Y-%m-%d").date()
-                    except ValueError:
-                        article_date = None
+                article_date = date_from_url(abs_url)
+                url_date = article_date.isoformat() if article_date else None
 
             # Date window filtering only when we have a date
             if article_date:
@@ -354,35 +361,39 @@ def usc_latimes_news_pages_for_links() -> list[dict]:
     return found_articles
         
         
+@register_scanner("usc_news", schools=[5], cost=COST_CHEAP, priority=10)
 def usc_scan_uscnews_for_links() -> list[dict]:
     start_date, end_date = config.get_news_date_range()
     print(f"\n--- Scanning USC News for {start_date} to {end_date} ---")
     found_articles = []
-    processed_urls = set()
+    processed_urls = SeenUrls()
     
     url = "https://today.usc.edu/category/university/"
     try:
         headers = {
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
         }
-        response = requests.get(url, headers=headers, timeout=config.URL_FETCH_TIMEOUT)
+        response = crawl_frontier.current().fetch(url, headers=headers)
+        if response is None:
+            print(f"  Unchanged since the last run: {url}")
+            return []
         response.raise_for_status()
-        soup = BeautifulSoup(response.content, 'html.parser')
+        soup = make_soup(response.content)
         articles = soup.find_all("article")
-        for article in articles:
+        urls = [urljoin(response.url, article.find('a')['href']) for article in articles]
+        # Domain, skip list and URL patterns in one pass (see link_classifier.py)
+        verdicts = link_classifier.for_school('usc').classify_all(urls)
+        for article, url, verdict in zip(articles, urls, verdicts):
+            if verdict != link_classifier.ARTICLE:
+                continue
             title = article.find('h3').text.strip()
-            url = article.find('a')['href']
             
             # e.g., Dec 5, 2025
             url_date_text = article.find('div', class_="f--field f--eyebrow date").find('span').text.strip()
-            url_date = extract_ymd_from_text(url_date_text)
-            if not url_date:
-                continue
-            # Convert to datetime.date for correct comparison
-            try:
-                article_date = datetime.strptime(url_date, "%Y-%m-%d").date()
-            except ValueError:
+            article_date = date_from_text(url_date_text)
+            if not article_date:
                 continue
+            url_date = article_date.isoformat()
             if article_date < start_date or article_date > end_date:
                 continue
             
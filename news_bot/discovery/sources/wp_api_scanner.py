@@ -0,0 +1,180 @@
+# news_bot/discovery/sources/wp_api_scanner.py
+
+import logging
+import threading
+from datetime import date, datetime, timedelta
+from functools import partial
+import requests
+from ...core import config, school_config
+from ...utils import http_client
+from ...utils.html_parser import make_soup
+from ...utils.url_canonicalizer import SeenUrls
+from ...discovery.scanner_registry import register_scanner, COST_CHEAP
+from ...discovery import link_classifier
+from ...discovery.sources.feed_scanner import article_text_from_html, scan_feed
+
+# Setup logging
+logger = logging.getLogger('wp_api_scanner')
+
+# Discovery through the WordPress REST API for sites listed under a school's "wp_api":
+#   "wp_api": [{"base": "https://nyunews.com", "category": "news"}]
+# One query per 100 posts returns exactly the posts published in the date range
+# (after/before are applied by the server) with only the fields we use, including
+# the rendered content, which becomes the article's prefetched_text. When the API
+# is disabled or blocked (401/403/404) or answers with something other than a JSON
+# list of posts (an HTML page, a broken body), the site's /feed/ is scanned instead.
+# Sites are handled one by one: a failing site does not cost the others their posts.
+
+_PER_PAGE = 100
+_MAX_API_PAGES = 10
+_FIELDS = "date,link,title,excerpt,content"
+_JSON_CONTENT_TYPES = ("application/json",)
+_FALLBACK_STATUSES = {401, 403, 404}
+
+HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
+    'Accept': 'application/json',
+}
+
+# (base, category slug) -> category id, or None when the slug does not exist
+_category_ids: dict[tuple[str, str], int | None] = {}
+_category_lock = threading.Lock()
+
+
+def _category_id(base: str, slug: str) -> int | None:
+    key = (base, slug)
+    with _category_lock:
+        if key in _category_ids:
+            return _category_ids[key]
+    resp = http_client.get(f"{base}/wp-json/wp/v2/categories", headers=HEADERS, accept=_JSON_CONTENT_TYPES,
+                           params={"slug": slug, "_fields": "id"})
+    resp.raise_for_status()
+    found = resp.json()
+    category_id = found[0]["id"] if found else None
+    if category_id is None:
+        logger.warning(f"[WP] {base}: no category '{slug}', querying all posts")
+    with _category_lock:
+        _category_ids[key] = category_id
+    return category_id
+
+
+def _rendered(field) -> str:
+    # Titles and excerpts come as HTML with entities (&#8217;, &amp;)
+    html = (field or {}).get("rendered", "") if isinstance(field, dict) else (field or "")
+    return " ".join(make_soup(html).get_text().split()) if html else ""
+
+
+def query_posts(site: dict, start_date: date, end_date: date) -> list[dict]:
+    """Posts published between start_date and end_date (inclusive), newest first."""
+    base = site["base"].rstrip('/')
+    params = {
+        # WordPress compares against the site's local publication time
+        "after": f"{start_date.isoformat()}T00:00:00",
+        "before": f"{(end_date + timedelta(days=1)).isoformat()}T00:00:00",
+        "_fields": _FIELDS,
+        "per_page": _PER_PAGE,
+        "orderby": "date",
+        "order": "desc",
+    }
+    if site.get("category"):
+        category_id = _category_id(base, site["category"])
+        if category_id is not None:
+            params["categories"] = category_id
+
+    posts = []
+    page, total_pages = 1, 1
+    while page <= min(total_pages, _MAX_API_PAGES):
+        print(f"Querying WordPress API: {base} (page {page})")
+        resp = http_client.get(f"{base}/wp-json/wp/v2/posts", headers=HEADERS, accept=_JSON_CONTENT_TYPES,
+                               params={**params, "page": page})
+        resp.raise_for_status()
+        batch = resp.json()
+        if not isinstance(batch, list):
+            raise ValueError(f"expected a list of posts, got {type(batch).__name__}")
+        posts.extend(batch)
+        total_pages = int(resp.headers.get("X-WP-TotalPages") or 1)
+        page += 1
+    return posts
+
+
+def _api_unusable(e: Exception) -> str | None:
+    """Why the site's REST API cannot be used (so its feed should be), or None for other errors."""
+    if isinstance(e, requests.exceptions.HTTPError):
+        if e.response is not None and e.response.status_code in _FALLBACK_STATUSES:
+            return f"HTTP {e.response.status_code}"
+        return None
+    if isinstance(e, http_client.ContentSkipped):
+        return f"not JSON ({e.reason})"
+    if isinstance(e, (ValueError, KeyError, TypeError)):
+        return f"bad JSON: {type(e).__name__}"
+    return None
+
+
+def scan_wp_api(school_key: str) -> list[dict]:
+    """In-range posts (with rendered content) from the school's WordPress sites."""
+    school = school_config.SCHOOL_PROFILES[school_key]
+    start_date, end_date = config.get_news_date_range()
+    print(f"\n--- Querying WordPress APIs for {school['school_name']} ({start_date} to {end_date}) ---")
+
+    found_articles: list[dict] = []
+    processed_urls = SeenUrls()
+    sites = school.get("wp_api", [])
+    failures: list[Exception] = []
+    for site in sites:
+        base = site["base"].rstrip('/')
+        try:
+            posts = query_posts(site, start_date, end_date)
+        except Exception as e:
+            reason = _api_unusable(e)
+            if reason is None:
+                logger.warning(f"[WP] {base}: query failed, skipping the site: {e}")
+                print(f"  WordPress API query failed for {base}: {e}")
+                failures.append(e)
+                continue
+            logger.warning(f"[WP] {base}: REST API unavailable ({reason}), using its feed")
+            print(f"  WordPress API unavailable for {base}, scanning {base}/feed/ instead")
+            try:
+                found_articles.extend(scan_feed({"url": f"{base}/feed/", "paged": True}, start_date, end_date,
+                                                processed_urls, link_classifier.for_school(school_key)))
+            except Exception as feed_error:
+                logger.warning(f"[WP] {base}: feed fallback failed too: {feed_error}")
+                failures.append(feed_error)
+            continue
+
+        kept = 0
+        for post in posts:
+            url = post.get("link")
+            if not url or url in processed_urls:
+                continue
+            try:
+                published = datetime.fromisoformat(post["date"]).date()
+            except (KeyError, TypeError, ValueError):
+                published = None
+            title = _rendered(post.get("title")) or "Untitled"
+            article = {
+                "title": title,
+                "url": url,
+                "snippet": _rendered(post.get("excerpt")) or title,
+                "url_date": published.isoformat() if published else None,
+            }
+            text = article_text_from_html(title, published, (post.get("content") or {}).get("rendered"))
+            if text:
+                article["prefetched_text"] = text
+            found_articles.append(article)
+            processed_urls.add(url)
+            kept += 1
+        logger.info(f"[WP] {site['base']}: {kept} posts in range")
+
+    if sites and len(failures) == len(sites):
+        # Nothing worked: report a failed run to the registry rather than an empty one
+        raise failures[-1]
+    print(f"WordPress APIs yielded {len(found_articles)} articles in range")
+    return found_articles
+
+
+# One API scanner per school that lists WordPress sites; exact server-side date
+# bounds make it the first source consulted
+for _key, _profile in school_config.SCHOOL_PROFILES.items():
+    if _profile.get("wp_api"):
+        register_scanner(f"{_key}_wp_api", schools=[_profile["id"]], source_method="wp_api",
+                         cost=COST_CHEAP, priority=3)(partial(scan_wp_api, _key))
@@ -4,9 +4,10 @@ from datetime import datetime, date, timedelta
 
 from .core import config, school_config
 from .discovery import search_client
-from .processing import article_handler
+from .processing import article_handler, dedup
 from .generation import summarizer
-from .utils import file_manager, prompt_logger
+from .utils import file_manager, prompt_logger, http_client
+from .utils.url_canonicalizer import SeenUrls
 from .localization import translator
 
 def run_news_bot():
@@ -64,7 +65,9 @@ def run_news_bot():
     print(f"Info: Discovered {len(discovered_articles)} potential articles overall.")
 
     final_news_reports = []
-    processed_urls = set()
+    processed_urls = SeenUrls()
+    duplicate_index = dedup.NearDuplicateIndex()
+    retry_queue = http_client.DeferredRetryQueue()
     articles_processed_count = 0
 
     print("\n--- Steps 2-4: Processing, Summarizing, Translating, and Refining Articles ---")
@@ -90,12 +93,27 @@ def run_news_bot():
             continue
         processed_urls.add(article_url)
 
-        # Step 2a: Fetch and extract text
-        article_text = article_handler.fetch_and_extract_text(article_url)
+        # Step 2a: Fetch and extract text (feeds that ship the full post already supplied it)
+        article_text = article_info.get("prefetched_text")
+        if article_text:
+            print(f"  Using full text from the feed ({len(article_text.split())} words), no page fetch needed.")
+        else:
+            article_text = article_handler.fetch_and_extract_text(article_url, retry_queue=retry_queue, seen_urls=processed_urls)
         if not article_text:
+            if article_url in retry_queue and not article_info.get("deferred"):
+                # Transient failure: retry once after every other candidate has been tried
+                discovered_articles.append({**article_info, "deferred": True})
+                processed_urls.discard(article_url)
+                print(f"  Deferred: Fetch failed ({retry_queue.reason(article_url)}), will retry at the end of the run.")
+                continue
             print(f"  Skipping: Failed to fetch or extract text.")
             continue
 
+        duplicate = duplicate_index.check_and_add(article_url, article_text)
+        if duplicate:
+            print(f"  Skipping: Near-duplicate of {duplicate.key[:100]} (similarity {duplicate.similarity:.2f}).")
+            continue
+
         # Step 2b: Verify article
         verification_results = article_handler.verify_article_with_gemini(choosen_school, article_text, article_url, article_date)
         if not verification_results:
@@ -4,22 +4,63 @@ import requests
 import os
 import logging
 import time
-from bs4 import BeautifulSoup
 from datetime import datetime, date, timedelta
 import json
 import re # For URL date parsing
+from urllib.parse import urljoin, urlsplit, urlunsplit, parse_qsl, urlencode
 from ..discovery.date_extractor import extract_date_from_url
-from ..utils import prompt_logger, openrouter_client
+from ..discovery import link_classifier
+from ..utils import prompt_logger, openrouter_client, http_client
+from ..utils.html_parser import make_soup
+from ..utils.url_canonicalizer import SeenUrls, canonical_link
+from . import extraction_rules, content_extractor
 
 from ..core import config
 
 # Setup logging
 logger = logging.getLogger('article_handler')
 
-def fetch_and_extract_text(url: str) -> str | None:
+def _jsonld_article_body(soup) -> str | None:
+    """Returns a NewsArticle/Article articleBody from JSON-LD when it has more than 100 words."""
+    for script in soup.find_all('script', type='application/ld+json'):
+        try:
+            data = json.loads(script.string or "")
+        except Exception:
+            continue
+        # JSON-LD may be a dict or a list of dicts
+        candidates = data if isinstance(data, list) else [data]
+        for item in candidates:
+            if not isinstance(item, dict):
+                continue
+            item_type = item.get('@type') or item.get('type')
+            if isinstance(item_type, list):
+                item_type = next((t for t in item_type if isinstance(t, str)), None)
+            if item_type in {'NewsArticle', 'Article'}:
+                body = item.get('articleBody') or item.get('text')
+                if body and len(str(body).split()) > 100:
+                    return body
+    return None
+
+
+def _amp_url(url: str) -> str:
+    """Adds outputType=amp to the query string unless it is already set."""
+    parts = urlsplit(url)
+    query_pairs = dict(parse_qsl(parts.query, keep_blank_values=True))
+    if 'outputType' not in query_pairs:
+        query_pairs['outputType'] = 'amp'
+    return urlunsplit((parts.scheme, parts.netloc, parts.path, urlencode(query_pairs), parts.fragment))
+
+
+def fetch_and_extract_text(url: str, retry_queue: http_client.DeferredRetryQueue | None = None,
+                           seen_urls: SeenUrls | None = None) -> str | None:
     """
     Fetches content from a URL and extracts clean textual content.
+    When the fetch fails for a transient reason (timeout, connection error, 5xx/429,
+    open circuit) and retry_queue is given, the URL is deferred there.
+    With seen_urls, the page's rel=canonical URL is recorded there, and None is
+    returned when that canonical story was already processed under another URL.
     """
+    requested_url = url
     logger.info(f"[FETCH] Starting fetch for URL: {url}")
     print(f"Fetching and extracting text from: {url}")
     fetch_start = time.time()
@@ -28,159 +69,79 @@ def fetch_and_extract_text(url: str) -> str | None:
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
         }
         logger.debug(f"[FETCH] Sending GET request with timeout={config.URL_FETCH_TIMEOUT}s")
-        response = requests.get(url, headers=headers, timeout=config.URL_FETCH_TIMEOUT)
+        response = http_client.get(url, headers=headers, accept=http_client.HTML_CONTENT_TYPES)
         logger.debug(f"[FETCH] Response status: {response.status_code}, content-length: {len(response.content)}")
         response.raise_for_status()
-        soup = BeautifulSoup(response.content, 'html.parser')
+        if response.truncated:
+            print(f"Info: Page body truncated at {config.MAX_FETCH_BYTES} bytes: {url}")
+        soup = make_soup(response.content)
         logger.debug(f"[FETCH] HTML parsed successfully")
-        # if read full button found, extract the text from button's url (apply to UBC)
-        try:
-            read_full_button = soup.find('a', text='Read the full message')
+        if seen_urls is not None:
+            canonical = canonical_link(soup, url)
+            classifier = link_classifier.for_url(url) if canonical else None
+            if classifier and not classifier.is_article(canonical):
+                # Home page or section canonical (broken template): not an alias of the story
+                canonical = None
+            if canonical and not seen_urls.add_alias(url, canonical):
+                logger.info(f"[FETCH] {url} declares already processed canonical URL {canonical}, skipping")
+                print(f"Info: {url} is a copy of already processed {canonical}. Skipping.")
+                return None
+        rule = extraction_rules.get_rule(url)
+
+        # Some hosts (UBC Today) only tease the message and link to the full text
+        if rule.follow_link_text:
+            read_full_button = soup.find('a', href=True, string=rule.follow_link_text)
             if read_full_button:
-                url = read_full_button['href']
-                print(f"DEBUG: read full button found, url: {url}\n")
-                response = requests.get(url, headers=headers, timeout=config.URL_FETCH_TIMEOUT)
-                response.raise_for_status()
-                soup = BeautifulSoup(response.content, 'html.parser')
-        except Exception as e:
-            print(f"not read full button found")
-            pass
-        
-        # --- Domain-specific extraction: The Student News (avoid hidden trending preview article) ---
-        article_body = None
-        try:
-            from urllib.parse import urlparse
-            domain = urlparse(url).netloc
-        except Exception:
-            domain = ''
-
-        if 'thestudentnews.co.uk' in domain:
-            # Prefer the real article content container inside the primary content area
-            tsn_selectors = [
-                '#content #primary article .entry-content',
-                '#primary .entry-content',
-                'main.site-main article .entry-content',
-                '.single-post .entry-content',
-                '.entry-content'
-            ]
-            for css in tsn_selectors:
-                el = soup.select_one(css)
-                if el:
-                    article_body = el
-                    print(f"DEBUG: thestudentnews extractor using selector: '{css}'")
-                    break
-        
-        # --- Domain-specific extraction: LA Times (robust against paywall/teasers) ---
-        if not article_body and 'latimes.com' in domain:
-            # 1) Try JSON-LD 'articleBody' which LA Times provides with full text
-            try:
-                import json as _json
-                article_text_from_jsonld = None
-                for script in soup.find_all('script', type='application/ld+json'):
-                    try:
-                        data = _json.loads(script.string or "")
-                    except Exception:
-                        continue
-                    # JSON-LD may be a dict or a list of dicts
-                    candidates = data if isinstance(data, list) else [data]
-                    for item in candidates:
-                        if not isinstance(item, dict):
-                            continue
-                        item_type = item.get('@type') or item.get('type')
-                        if isinstance(item_type, list):
-                            item_type = next((t for t in item_type if isinstance(t, str)), None)
-                        if item_type in {'NewsArticle', 'Article'}:
-                            body = item.get('articleBody') or item.get('text')
-                            if body and len(body.split()) > 100:
-                                article_text_from_jsonld = body
-                                break
-                    if article_text_from_jsonld:
-                        break
-                if article_text_from_jsonld:
-                    cleaned = "\n".join([ln.strip() for ln in str(article_text_from_jsonld).splitlines() if ln.strip()])
-                    print("DEBUG: LA Times extractor used JSON-LD articleBody")
-                    return cleaned
-            except Exception as _e_lat_json:
-                print(f"DEBUG: LA Times JSON-LD parse failed: {_e_lat_json}")
-                pass
-            
-            # 2) Fallback to AMP version (?outputType=amp) which is static HTML
+                full_url = urljoin(url, read_full_button['href'])
+                print(f"DEBUG: read full button found, url: {full_url}\n")
+                try:
+                    response = http_client.get(full_url, headers=headers, accept=http_client.HTML_CONTENT_TYPES)
+                    response.raise_for_status()
+                    url, soup = full_url, make_soup(response.content)
+                    rule = extraction_rules.get_rule(url)
+                except requests.exceptions.RequestException as e:
+                    print(f"DEBUG: read full message fetch failed, keeping teaser page: {e}")
+
+        # --- Domain-specific extraction (rules from SCHOOL_PROFILES[...]['selectors']) ---
+        article_body, css = extraction_rules.select_first(soup, rule.content)
+        if article_body:
+            print(f"DEBUG: {rule.host} extractor using selector: '{css}'")
+
+        if not article_body and rule.prefer_jsonld:
+            article_text_from_jsonld = _jsonld_article_body(soup)
+            if article_text_from_jsonld:
+                cleaned = "\n".join([ln.strip() for ln in str(article_text_from_jsonld).splitlines() if ln.strip()])
+                print(f"DEBUG: {rule.host} extractor used JSON-LD articleBody")
+                return cleaned
+
+        if not article_body and rule.prefer_amp:
+            # AMP version (?outputType=amp) is static HTML
             try:
-                from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
-                parts = urlsplit(url)
-                query_pairs = dict(parse_qsl(parts.query, keep_blank_values=True))
-                if 'outputType' not in query_pairs:
-                    query_pairs['outputType'] = 'amp'
-                amp_url = urlunsplit((parts.scheme, parts.netloc, parts.path, urlencode(query_pairs), parts.fragment))
+                amp_url = _amp_url(url)
                 if amp_url != url:
-                    print(f"DEBUG: Fetching LA Times AMP page: {amp_url}")
-                    amp_resp = requests.get(amp_url, headers=headers, timeout=config.URL_FETCH_TIMEOUT)
+                    print(f"DEBUG: Fetching AMP page: {amp_url}")
+                    amp_resp = http_client.get(amp_url, headers=headers, accept=http_client.HTML_CONTENT_TYPES)
                     if amp_resp.ok:
-                        amp_soup = BeautifulSoup(amp_resp.content, 'html.parser')
-                        # Prefer focused article containers; otherwise read from <main> or <article>
-                        amp_selectors = [
-                            '[data-qa="article-body"]',
-                            'div.article-body',
-                            'article .article-body',
-                            'article',
-                            'main'
-                        ]
-                        for css in amp_selectors:
-                            el = amp_soup.select_one(css)
-                            if el:
-                                article_body = el
-                                print(f"DEBUG: LA Times AMP extractor using selector: '{css}'")
-                                break
-            except Exception as _e_lat_amp:
-                print(f"DEBUG: LA Times AMP fetch failed: {_e_lat_amp}")
-                pass
-
-        # --- Generic extraction (ordered: specific containers first, 'article' last) ---
-        if not article_body:
-            main_content_tags = ['.entry-content', '.post-content', '.td-post-content', 'main', 'article']
-            for tag_or_class in main_content_tags:
-                if tag_or_class.startswith('.'):
-                    article_body = soup.find(class_=tag_or_class[1:])
-                else:
-                    article_body = soup.find(tag_or_class)
-                if article_body:
-                    print(f"DEBUG: article_body found via generic selector '{tag_or_class}', url: {url}")
-                    break
-        
-        if not article_body:
-            article_body = soup.body
+                        article_body, css = extraction_rules.select_first(make_soup(amp_resp.content), rule.amp_content)
+                        if article_body:
+                            print(f"DEBUG: {rule.host} AMP extractor using selector: '{css}'")
+            except requests.exceptions.RequestException as _e_amp:
+                print(f"DEBUG: AMP fetch failed: {_e_amp}")
 
+        # --- Text: the rule's container if one matched, else text-density main-content detection ---
         text_content = ""
         if article_body:
-            for unwanted_tag in article_body(['script', 'style', 'nav', 'footer', 'aside', 'header', 'form', 'button', 'input', 'textarea', 'select', 'option']):
-                unwanted_tag.decompose()
-            
-            common_annoyances_selectors = [
-                '[class*="mask"]',
-                '[class*="ad"], [id*="ad"]' ,
-                '[class*="popup"], [id*="popup"]' ,
-                '[class*="overlay"], [id*="overlay"]' ,
-                '[class*="banner"], [id*="banner"]' ,
-                '[class*="cookie"], [id*="cookie"]',
-                '[class*="share"], [id*="share"]' # Share buttons/widgets
-            ]
-            for selector in common_annoyances_selectors:
-                for unwanted_element in article_body.select(selector):
-                    unwanted_element.decompose()
-
-            paragraphs = article_body.find_all('p')
-            # print(f"DEBUG: paragraphs: {paragraphs}\n")
-            if paragraphs:
-                text_content = "\n".join([p.get_text(strip=True) for p in paragraphs if p.get_text(strip=True)])
-            
-            if not text_content or len(text_content.split()) < 30: # Slightly lower threshold
-                alternative_text = article_body.get_text(separator='\n', strip=True)
-                if len(alternative_text.split()) > len(text_content.split()):
-                    text_content = alternative_text
+            text_content = content_extractor.container_text(article_body)
+
+        if len(text_content.split()) < 30: # Slightly lower threshold
+            main_text = content_extractor.extract_main_text(soup)
+            if len(main_text.split()) > len(text_content.split()):
+                print(f"DEBUG: article text taken from main-content detection, url: {url}")
+                text_content = main_text
         
         if not text_content.strip():
              print(f"Info: No significant text content from primary containers of {url}. Trying full soup minus known non-content tags.")
-             for unwanted_tag in soup(['script', 'style', 'nav', 'footer', 'aside', 'header', 'form', 'button', 'input', 'textarea', 'select', 'option']):
+             for unwanted_tag in soup(extraction_rules.NON_CONTENT_TAGS):
                 unwanted_tag.decompose()
              text_content = soup.get_text(separator='\n', strip=True)
 
@@ -195,18 +156,33 @@ def fetch_and_extract_text(url: str) -> str | None:
         print(f"Successfully extracted text from {url} (approx. {len(cleaned_text.split())} words).")
         return cleaned_text
 
+    except http_client.ContentSkipped as e:
+        fetch_elapsed = time.time() - fetch_start
+        logger.info(f"[FETCH] Skipped {url} after {fetch_elapsed:.2f}s: {e.reason}")
+        print(f"Info: Skipping URL {url} ({e.reason}).")
+    except http_client.HostUnavailable:
+        logger.info(f"[FETCH] Host circuit open, not fetching {url}")
+        print(f"Info: Host temporarily unavailable (circuit open), skipping URL {url}")
+        if retry_queue is not None:
+            retry_queue.defer(requested_url, "circuit_open")
     except requests.exceptions.Timeout:
         fetch_elapsed = time.time() - fetch_start
         logger.error(f"[FETCH] Timeout after {fetch_elapsed:.2f}s for URL {url}")
         print(f"Error: Timeout while fetching URL {url}")
+        if retry_queue is not None:
+            retry_queue.defer(requested_url, "timeout")
     except requests.exceptions.HTTPError as e:
         fetch_elapsed = time.time() - fetch_start
         logger.error(f"[FETCH] HTTP error {e.response.status_code} after {fetch_elapsed:.2f}s for URL {url}")
         print(f"Error: HTTP error {e.response.status_code} while fetching URL {url}")
+        if retry_queue is not None and http_client.is_transient(e):
+            retry_queue.defer(requested_url, f"http_{e.response.status_code}")
     except requests.exceptions.RequestException as e:
         fetch_elapsed = time.time() - fetch_start
         logger.error(f"[FETCH] Request error after {fetch_elapsed:.2f}s for URL {url}: {e}")
         print(f"Error: Could not fetch URL {url}. Details: {str(e)}")
+        if retry_queue is not None and http_client.is_transient(e):
+            retry_queue.defer(requested_url, "connection_error")
     except Exception as e:
         fetch_elapsed = time.time() - fetch_start
         logger.error(f"[FETCH] Unexpected error after {fetch_elapsed:.2f}s for URL {url}: {e}")
@@ -0,0 +1,326 @@
+# -*- coding: utf-8 -*-
+"""
+browser_pool.py
+Long-lived Playwright Chromium for image_generator.
+
+Launching Chromium dominates the render time of a single image, so browsers are
+kept alive across renders instead of being launched per image:
+  - each worker is a dedicated thread that owns one sync_playwright instance and
+    one browser (the sync API must stay on the thread that started it); renders are
+    queued to the workers and the caller blocks on the result;
+  - a worker keeps one page per (page_width, device_scale) and reuses it with
+    set_content();
+  - before each render the browser is health-checked (is_connected) and relaunched
+    if it died; a render that fails because the browser crashed is retried once on
+    a fresh browser;
+  - a browser is recycled after WXIMG_BROWSER_MAX_RENDERS renders, or when its
+    worker's process tree (Playwright driver + Chromium) uses more than
+    WXIMG_BROWSER_MAX_RSS_MB (Linux /proc).
+"""
+from __future__ import annotations
+import atexit
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from pathlib import Path
+from typing import Callable, Optional
+
+# ----------------- 参数 -----------------
+MAX_RENDERS_PER_BROWSER = int(os.environ.get("WXIMG_BROWSER_MAX_RENDERS", "50"))
+MAX_BROWSER_RSS_MB      = int(os.environ.get("WXIMG_BROWSER_MAX_RSS_MB", "1024"))   # 每个浏览器；0 = 不检查内存
+DEFAULT_WORKERS         = int(os.environ.get("WXIMG_RENDER_WORKERS", "1"))
+VIEWPORT_HEIGHT         = 1500
+READY_SELECTOR          = "#page-root"
+READY_TIMEOUT_MS        = 15000
+SETTLE_MS               = 800
+# ---------------------------------------
+
+
+def _debug(msg: str) -> None:
+    if os.environ.get("WXIMG_DEBUG"):
+        print(f"[browser_pool] {msg}")
+
+
+def _process_table() -> tuple[dict[int, list[int]], dict[int, int]]:
+    """(ppid -> child pids, pid -> RSS kB) of every process in /proc."""
+    children: dict[int, list[int]] = {}
+    rss_kb: dict[int, int] = {}
+    try:
+        pids = [int(name) for name in os.listdir("/proc") if name.isdigit()]
+    except OSError:
+        return children, rss_kb
+    for pid in pids:
+        try:
+            with open(f"/proc/{pid}/status", "r") as f:
+                ppid, rss = None, 0
+                for line in f:
+                    if line.startswith("PPid:"):
+                        ppid = int(line.split()[1])
+                    elif line.startswith("VmRSS:"):
+                        rss = int(line.split()[1])
+        except (OSError, ValueError, IndexError):
+            continue
+        if ppid is not None:
+            children.setdefault(ppid, []).append(pid)
+            rss_kb[pid] = rss
+    return children, rss_kb
+
+
+def _child_pids(pid: int) -> set[int]:
+    return set(_process_table()[0].get(pid, []))
+
+
+def _process_tree_rss_mb(root_pid: int, include_root: bool = False) -> float:
+    """RSS (MB) of every descendant of root_pid (and of root_pid itself with include_root)."""
+    children, rss_kb = _process_table()
+    total = rss_kb.get(root_pid, 0) if include_root else 0
+    stack = list(children.get(root_pid, []))
+    while stack:
+        pid = stack.pop()
+        total += rss_kb.get(pid, 0)
+        stack.extend(children.get(pid, []))
+    return total / 1024
+
+
+# Workers start their Playwright drivers one at a time, so the new child process of
+# this one is known to be the starting worker's driver
+_driver_start_lock = threading.Lock()
+
+
+# ================= 单个工作线程 =================
+class _Worker(threading.Thread):
+    def __init__(self, pool: "BrowserPool", index: int):
+        super().__init__(name=f"browser-pool-{index}", daemon=True)
+        self.pool = pool
+        self._playwright = None
+        self._browser = None
+        self._pages: dict[tuple[int, int], object] = {}
+        self._driver_pid: int | None = None     # Playwright driver; this worker's Chromium runs under it
+        self.renders = 0        # 当前浏览器已渲染次数
+        self.launches = 0
+
+    # ---------- 浏览器生命周期 ----------
+    def _launch(self) -> None:
+        if self._playwright is None:
+            from playwright.sync_api import sync_playwright
+            with _driver_start_lock:
+                before = _child_pids(os.getpid())
+                self._playwright = sync_playwright().start()
+                started = _child_pids(os.getpid()) - before
+            self._driver_pid = started.pop() if len(started) == 1 else None
+            if self._driver_pid is None:
+                _debug(f"{self.name}: could not identify the Playwright driver process; memory recycling is off")
+        started = time.perf_counter()
+        self._browser = self._playwright.chromium.launch(**self.pool.launch_kwargs())
+        self.renders = 0
+        self.launches += 1
+        _debug(f"{self.name}: browser launched in {time.perf_counter() - started:.2f}s (launch #{self.launches})")
+
+    def _close_browser(self) -> None:
+        for page in self._pages.values():
+            try:
+                page.context.close()
+            except Exception:
+                pass
+        self._pages.clear()
+        if self._browser is not None:
+            try:
+                self._browser.close()
+            except Exception:
+                pass
+            self._browser = None
+
+    def _recycle(self, reason: str) -> None:
+        _debug(f"{self.name}: recycling browser after {self.renders} renders ({reason})")
+        self._close_browser()
+
+    def _healthy(self) -> bool:
+        try:
+            return self._browser is not None and self._browser.is_connected()
+        except Exception:
+            return False
+
+    def _page(self, page_width: int, device_scale: int):
+        key = (page_width, device_scale)
+        page = self._pages.get(key)
+        if page is None or page.is_closed():
+            context = self._browser.new_context(
+                viewport={"width": page_width, "height": VIEWPORT_HEIGHT},
+                device_scale_factor=device_scale,
+            )
+            page = context.new_page()
+            self._pages[key] = page
+        return page
+
+    def _drop_page(self, page_width: int, device_scale: int) -> None:
+        page = self._pages.pop((page_width, device_scale), None)
+        if page is not None:
+            try:
+                page.context.close()
+            except Exception:
+                pass
+
+    # ---------- 渲染 ----------
+    def _render_once(self, html: str, out_path: Path, page_width: int, device_scale: int) -> None:
+        if not self._healthy():
+            if self._browser is not None:
+                self._recycle("health check failed")
+            self._launch()
+        page = self._page(page_width, device_scale)
+        page.set_content(html)
+        page.wait_for_selector(READY_SELECTOR, timeout=READY_TIMEOUT_MS)
+        page.wait_for_timeout(SETTLE_MS)
+        page.screenshot(path=str(out_path), full_page=True)
+
+    def _render(self, html: str, out_path: Path, page_width: int, device_scale: int) -> None:
+        try:
+            self._render_once(html, out_path, page_width, device_scale)
+        except Exception as e:
+            if self._healthy():
+                # 页面本身的问题（超时等）：关闭并丢弃该页面，浏览器保留
+                self._drop_page(page_width, device_scale)
+                raise
+            _debug(f"{self.name}: browser died during render ({e}), retrying on a fresh browser")
+            self._recycle("crashed")
+            self._render_once(html, out_path, page_width, device_scale)
+        self.renders += 1
+        self.pool._count_render()
+        if MAX_RENDERS_PER_BROWSER and self.renders >= MAX_RENDERS_PER_BROWSER:
+            self._recycle(f"reached {MAX_RENDERS_PER_BROWSER} renders")
+        elif MAX_BROWSER_RSS_MB and self._driver_pid:
+            rss = _process_tree_rss_mb(self._driver_pid, include_root=True)
+            if rss > MAX_BROWSER_RSS_MB:
+                self._recycle(f"browser processes use {rss:.0f} MB > {MAX_BROWSER_RSS_MB} MB")
+
+    def run(self) -> None:
+        try:
+            while True:
+                job = self.pool._jobs.get()
+                if job is None:
+                    self.pool._retire(self)
+                    break
+                future, args = job
+                if not future.set_running_or_notify_cancel():
+                    continue
+                try:
+                    self._render(*args)
+                    future.set_result(None)
+                except BaseException as e:
+                    future.set_exception(e)
+        finally:
+            self._close_browser()
+            if self._playwright is not None:
+                try:
+                    self._playwright.stop()
+                except Exception:
+                    pass
+                self._playwright = None
+                self._driver_pid = None
+
+
+# ================= 浏览器池 =================
+class BrowserPool:
+    """Queue of HTML→PNG renders served by long-lived browser worker threads."""
+
+    def __init__(self, launch_kwargs: Callable[[], dict], workers: int = DEFAULT_WORKERS):
+        self.launch_kwargs = launch_kwargs
+        self._jobs: queue.Queue = queue.Queue()
+        self._workers: list[_Worker] = []
+        self._lock = threading.Lock()
+        self._renders = 0
+        self._retiring = 0      # stop signals queued by shrink_workers() and not yet taken
+        self._next_index = 0
+        self._closed = False
+        self.ensure_workers(workers)
+
+    def ensure_workers(self, n: int) -> None:
+        """Grows the pool to at least n browser workers (browsers launch on their first render)."""
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("browser pool is closed")
+            while len(self._workers) - self._retiring < max(1, n):
+                worker = _Worker(self, self._next_index)
+                self._next_index += 1
+                worker.start()
+                self._workers.append(worker)
+
+    def shrink_workers(self, n: int) -> None:
+        """
+        Lets the pool fall back to n workers: the extra ones close their browsers once
+        they finish the renders already queued ahead of the stop signal.
+        """
+        with self._lock:
+            if self._closed:
+                return
+            extra = len(self._workers) - self._retiring - max(1, n)
+            for _ in range(max(0, extra)):
+                self._retiring += 1
+                self._jobs.put(None)
+
+    def _retire(self, worker: _Worker) -> None:
+        with self._lock:
+            if worker in self._workers:
+                self._workers.remove(worker)
+            if not self._closed:
+                self._retiring -= 1
+
+    def _count_render(self) -> None:
+        with self._lock:
+            self._renders += 1
+
+    def submit(self, html: str, out_path: Path, page_width: int, device_scale: int) -> Future:
+        future: Future = Future()
+        self._jobs.put((future, (html, Path(out_path), page_width, device_scale)))
+        return future
+
+    def render(self, html: str, out_path: Path, page_width: int, device_scale: int,
+               timeout: Optional[float] = None) -> None:
+        """Renders html to out_path (full-page PNG) and waits for it."""
+        self.submit(html, out_path, page_width, device_scale).result(timeout=timeout)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "workers": len(self._workers) - self._retiring,
+                "renders": self._renders,
+                "launches": sum(w.launches for w in self._workers),
+                "queued": self._jobs.qsize(),
+            }
+
+    def close(self) -> None:
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            workers = list(self._workers)
+        for _ in workers:
+            self._jobs.put(None)
+        for worker in workers:
+            worker.join(timeout=30)
+
+
+_pool: BrowserPool | None = None
+_pool_lock = threading.Lock()
+
+
+def get_pool(launch_kwargs: Callable[[], dict], workers: int | None = None) -> BrowserPool:
+    """The process-wide pool, created on first use (closed at interpreter exit)."""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = BrowserPool(launch_kwargs, workers or DEFAULT_WORKERS)
+            atexit.register(_pool.close)
+        elif workers:
+            _pool.ensure_workers(workers)
+        return _pool
+
+
+def shutdown_pool() -> None:
+    """Closes the process-wide pool and its browsers (the next render starts a new one)."""
+    global _pool
+    with _pool_lock:
+        pool, _pool = _pool, None
+    if pool is not None:
+        pool.close()
@@ -0,0 +1,195 @@
+# news_bot/processing/content_extractor.py
+
+import re
+import logging
+from bs4 import NavigableString, Tag
+from bs4.element import Comment, Declaration, Doctype, ProcessingInstruction
+
+# Setup logging
+logger = logging.getLogger('content_extractor')
+
+# Readability-style main-content detection in one walk of the tree:
+#   1. boilerplate subtrees (nav, footer, hidden elements, class/id words such as
+#      "sidebar" or "share") are pruned while walking, never decomposed;
+#   2. every paragraph-like block scores its parent and grandparent by length and commas;
+#   3. the best candidate (score x (1 - link density)) and its strong siblings are kept.
+
+# Subtrees that never hold article text
+_SKIP_TAGS = {'script', 'style', 'noscript', 'template', 'nav', 'footer', 'aside', 'header', 'form',
+              'button', 'input', 'textarea', 'select', 'option', 'iframe', 'svg', 'figure', 'dialog'}
+# Blocks whose text is emitted; only the scoring ones vote for their ancestors
+_SCORING_TAGS = {'p', 'pre', 'td', 'blockquote'}
+_TEXT_TAGS = _SCORING_TAGS | {'li', 'h2', 'h3', 'h4', 'dd'}
+# Inline children that stay part of a container's loose text (e.g. <div>text<br>text</div>)
+_INLINE_TAGS = {'a', 'abbr', 'b', 'br', 'cite', 'code', 'em', 'font', 'i', 'mark', 'q', 'small',
+                'span', 'strong', 'sub', 'sup', 'time', 'u'}
+_IGNORED_STRINGS = (Comment, Declaration, Doctype, ProcessingInstruction)
+
+# Class/id words, matched as whole tokens so "ad" does not hit "header" or "read"
+_TOKEN = r"(?:^|[\s_-])(?:{})(?:$|[\s_-])"
+_NEGATIVE_RE = re.compile(_TOKEN.format(
+    r"ads?|advert\w*|banner|breadcrumbs?|comments?|cookies?|disqus|footer|header|masthead|menu|modal|"
+    r"nav|navbar|newsletter|outbrain|overlay|popup|promo|recirc|related|share|sharing|sidebar|social|"
+    r"sponsor(?:ed)?|subscribe|subscription|taboola|trending|widget"), re.I)
+_POSITIVE_RE = re.compile(_TOKEN.format(
+    r"article|body|content|entry|main|post|prose|story|text|rich-text"), re.I)
+_HIDDEN_STYLE_RE = re.compile(r"display\s*:\s*none|visibility\s*:\s*hidden", re.I)
+
+_TAG_WEIGHTS = {'article': 10, 'div': 5, 'main': 5, 'section': 3, 'pre': 3, 'td': 3, 'blockquote': 3,
+                'ol': -3, 'ul': -3, 'dl': -3, 'li': -3}
+MIN_BLOCK_CHARS = 25          # shorter blocks do not vote
+MAX_LINK_DENSITY = 0.5        # blocks that are mostly link text are dropped from the output
+_TOP_CANDIDATES = 5           # only these get the (subtree-walking) link-density check
+
+
+def _attr_words(el: Tag) -> str:
+    classes = el.get('class') or []
+    if isinstance(classes, str):
+        classes = [classes]
+    return " ".join(classes) + " " + (el.get('id') or "")
+
+
+def _class_weight(el: Tag) -> int:
+    words = _attr_words(el)
+    weight = 0
+    if _NEGATIVE_RE.search(words):
+        weight -= 25
+    if _POSITIVE_RE.search(words):
+        weight += 25
+    return weight
+
+
+def _is_boilerplate(el: Tag) -> bool:
+    if el.name in _SKIP_TAGS:
+        return True
+    if el.has_attr('hidden') or el.get('aria-hidden') == 'true':
+        return True
+    style = el.get('style')
+    if style and _HIDDEN_STYLE_RE.search(style):
+        return True
+    words = _attr_words(el)
+    return bool(_NEGATIVE_RE.search(words)) and not _POSITIVE_RE.search(words)
+
+
+def _text_of(el: Tag) -> str:
+    return el.get_text(" ", strip=True)
+
+
+def _link_chars(el: Tag) -> int:
+    return sum(len(a.get_text(strip=True)) for a in el.find_all('a'))
+
+
+def _collect_blocks(root: Tag) -> list[tuple[Tag, bool, str, int]]:
+    """
+    Walks root once (pre-order, boilerplate pruned) and returns text blocks in
+    document order as (owner, scores, text, link_chars). owner is the block element,
+    or the container itself for loose text directly inside a <div>/<section>.
+    """
+    blocks = []
+    stack = [root]
+    while stack:
+        el = stack.pop()
+        if el.name in _TEXT_TAGS:
+            text = _text_of(el)
+            if text:
+                blocks.append((el, el.name in _SCORING_TAGS, text, _link_chars(el)))
+            continue
+
+        loose_parts = []
+        loose_links = 0
+        children = []
+        for child in el.contents:
+            if isinstance(child, NavigableString):
+                if not isinstance(child, _IGNORED_STRINGS):
+                    text = child.strip()
+                    if text:
+                        loose_parts.append(text)
+            elif not isinstance(child, Tag) or _is_boilerplate(child):
+                continue
+            elif child.name in _INLINE_TAGS and not child.find(_TEXT_TAGS):
+                text = _text_of(child)
+                if text:
+                    loose_parts.append(text)
+                    if child.name == 'a':
+                        loose_links += len(text)
+                    else:
+                        loose_links += _link_chars(child)
+            else:
+                children.append(child)
+        if loose_parts:
+            blocks.append((el, True, " ".join(loose_parts), loose_links))
+        stack.extend(reversed(children))
+    return blocks
+
+
+def _score_candidates(blocks) -> dict:
+    """Returns id(element) -> [element, score] for every ancestor that received votes."""
+    candidates = {}
+
+    def vote(el, points):
+        if el is None or not isinstance(el, Tag) or el.name in ('html', '[document]'):
+            return
+        entry = candidates.get(id(el))
+        if entry is None:
+            entry = candidates[id(el)] = [el, _TAG_WEIGHTS.get(el.name, 0) + _class_weight(el)]
+        entry[1] += points
+
+    for owner, scores, text, _ in blocks:
+        if not scores or len(text) < MIN_BLOCK_CHARS:
+            continue
+        points = 1 + text.count(',') + text.count('，') + min(len(text) // 100, 3)
+        # Loose text belongs to its container; paragraphs vote for their parent
+        parent = owner if owner.name not in _TEXT_TAGS else owner.parent
+        vote(parent, points)
+        vote(parent.parent if parent is not None else None, points / 2)
+    return candidates
+
+
+def _ancestors_in(el: Tag, selected: set[int]) -> bool:
+    if id(el) in selected:
+        return True
+    return any(id(parent) in selected for parent in el.parents)
+
+
+def _join(blocks) -> str:
+    lines = []
+    for _, _, text, link_chars in blocks:
+        if link_chars and link_chars / max(len(text), 1) > MAX_LINK_DENSITY:
+            continue
+        lines.append(text)
+    return "\n".join(lines)
+
+
+def container_text(container: Tag) -> str:
+    """Text of an already-chosen article container, with boilerplate subtrees skipped."""
+    return _join(_collect_blocks(container))
+
+
+def extract_main_text(soup) -> str:
+    """
+    Finds the main content of a page by text density and returns its text,
+    one block per line. Returns "" when no block is long enough to vote.
+    """
+    root = soup.body or soup
+    blocks = _collect_blocks(root)
+    candidates = _score_candidates(blocks)
+    if not candidates:
+        return ""
+
+    top = sorted(candidates.values(), key=lambda c: c[1], reverse=True)[:_TOP_CANDIDATES]
+    for entry in top:
+        text_len = len(_text_of(entry[0])) or 1
+        entry[1] *= 1 - min(_link_chars(entry[0]) / text_len, 1)
+    best, best_score = max(top, key=lambda c: c[1])
+
+    # Siblings that scored well (split article bodies, pull quotes) stay with the winner
+    threshold = max(10, best_score * 0.2)
+    selected = {id(best)}
+    if best.parent is not None:
+        for el, score in candidates.values():
+            if el is not best and el.parent is best.parent and score >= threshold:
+                selected.add(id(el))
+
+    logger.debug(f"[EXTRACT] Best candidate <{best.name} class={best.get('class')}> "
+                 f"score={best_score:.1f}, {len(selected) - 1} sibling(s)")
+    return _join(b for b in blocks if _ancestors_in(b[0], selected))
@@ -0,0 +1,100 @@
+# news_bot/processing/dedup.py
+
+import re
+import random
+import hashlib
+import logging
+from typing import NamedTuple
+from ..core import config
+
+# Setup logging
+logger = logging.getLogger('dedup')
+
+# Near-duplicate detection on extracted article text: MinHash signatures over word
+# shingles, bucketed with banded LSH so each new article is compared only with the
+# few earlier articles that share a band. Catches the same story under another URL,
+# syndicated copies and AMP variants before they reach the LLM.
+
+SHINGLE_WORDS = 5
+NUM_PERM = 64
+BANDS = 16                         # 16 bands x 4 rows: candidates from ~0.5 Jaccard, confirmed at the threshold
+_ROWS = NUM_PERM // BANDS
+_MASK64 = (1 << 64) - 1
+_WORD_RE = re.compile(r"\w+", re.UNICODE)
+
+# Universal hash family h(x) = (a*x + b) mod 2^64 with odd a (a bijection), fixed seed
+_rng = random.Random(20240601)
+_PERMUTATIONS = [(_rng.getrandbits(64) | 1, _rng.getrandbits(64)) for _ in range(NUM_PERM)]
+
+
+class DuplicateMatch(NamedTuple):
+    key: str             # key of the earlier (kept) article
+    similarity: float    # estimated Jaccard similarity of the shingle sets
+
+
+def _shingle_hashes(text: str) -> set[int]:
+    words = _WORD_RE.findall(text.lower())
+    if len(words) < SHINGLE_WORDS:
+        grams = [" ".join(words)] if words else []
+    else:
+        grams = [" ".join(words[i:i + SHINGLE_WORDS]) for i in range(len(words) - SHINGLE_WORDS + 1)]
+    return {int.from_bytes(hashlib.blake2b(g.encode('utf-8'), digest_size=8).digest(), 'little') for g in grams}
+
+
+def minhash_signature(text: str) -> tuple[int, ...] | None:
+    """NUM_PERM-value MinHash signature of the text's word shingles, or None for empty text."""
+    hashes = _shingle_hashes(text)
+    if not hashes:
+        return None
+    return tuple(min((a * h + b) & _MASK64 for h in hashes) for a, b in _PERMUTATIONS)
+
+
+def estimate_similarity(sig_a: tuple[int, ...], sig_b: tuple[int, ...]) -> float:
+    return sum(x == y for x, y in zip(sig_a, sig_b)) / NUM_PERM
+
+
+class NearDuplicateIndex:
+    """
+    Streaming index for one run. check_and_add() returns a DuplicateMatch when the
+    text is a near-duplicate of an earlier one (which stays the canonical copy),
+    otherwise indexes the text and returns None.
+    """
+
+    def __init__(self, threshold: float | None = None):
+        self.threshold = config.DEDUP_SIMILARITY_THRESHOLD if threshold is None else threshold
+        self._signatures: dict[str, tuple[int, ...]] = {}
+        self._exact: dict[str, str] = {}               # digest of normalized text -> key
+        self._buckets: dict[tuple, list[str]] = {}     # (band, band values) -> keys
+
+    def __len__(self) -> int:
+        return len(self._signatures)
+
+    def check_and_add(self, key: str, text: str) -> DuplicateMatch | None:
+        digest = hashlib.sha1(" ".join(_WORD_RE.findall(text.lower())).encode('utf-8')).hexdigest()
+        if digest in self._exact:
+            return DuplicateMatch(self._exact[digest], 1.0)
+
+        signature = minhash_signature(text)
+        if signature is None:
+            return None
+        band_keys = [(band, signature[band * _ROWS:(band + 1) * _ROWS]) for band in range(BANDS)]
+
+        best = None
+        seen = set()
+        for band_key in band_keys:
+            for other in self._buckets.get(band_key, ()):
+                if other in seen:
+                    continue
+                seen.add(other)
+                similarity = estimate_similarity(signature, self._signatures[other])
+                if similarity >= self.threshold and (best is None or similarity > best.similarity):
+                    best = DuplicateMatch(other, similarity)
+        if best:
+            logger.info(f"[DEDUP] {key} is a near-duplicate of {best.key} (similarity {best.similarity:.2f})")
+            return best
+
+        self._exact[digest] = key
+        self._signatures[key] = signature
+        for band_key in band_keys:
+            self._buckets.setdefault(band_key, []).append(key)
+        return None
@@ -0,0 +1,99 @@
+# news_bot/processing/extraction_rules.py
+
+import logging
+from functools import lru_cache
+from typing import NamedTuple
+from urllib.parse import urlparse
+
+import soupsieve
+
+from ..core.school_config import SCHOOL_PROFILES
+
+# Setup logging
+logger = logging.getLogger('extraction_rules')
+
+# Tags never part of the article text
+NON_CONTENT_TAGS = ['script', 'style', 'nav', 'footer', 'aside', 'header', 'form', 'button',
+                    'input', 'textarea', 'select', 'option']
+
+
+class ExtractionRule(NamedTuple):
+    host: str                                   # host suffix this rule applies to ("" = generic)
+    content: tuple                              # ((css, compiled), ...) tried in order
+    amp_content: tuple                          # same, applied to the AMP page
+    prefer_jsonld: bool                         # use JSON-LD articleBody when it is long enough
+    prefer_amp: bool                            # fall back to the ?outputType=amp page
+    follow_link_text: str | None                # follow an anchor with this exact text first
+
+
+def _compile_all(selectors: list[str]) -> tuple:
+    return tuple((css, soupsieve.compile(css)) for css in selectors)
+
+
+GENERIC_RULE = ExtractionRule(host="", content=(), amp_content=(), prefer_jsonld=False,
+                              prefer_amp=False, follow_link_text=None)
+
+
+def _build_registry() -> dict[str, ExtractionRule]:
+    """
+    Compiles every school's "selectors" block into host-suffix -> ExtractionRule.
+    Expected shape (all keys optional):
+        "selectors": {
+            "<host suffix>": {
+                "content": [css, ...],
+                "prefer_jsonld": bool,
+                "prefer_amp": bool,
+                "amp_content": [css, ...],
+                "follow_link_text": "Read the full message",
+            }
+        }
+    """
+    registry = {}
+    for school_key, profile in SCHOOL_PROFILES.items():
+        for host, spec in (profile.get("selectors") or {}).items():
+            host = host.lower().removeprefix("www.")
+            if host in registry:
+                logger.warning(f"[RULES] Host '{host}' from '{school_key}' already has a rule; keeping the first")
+                continue
+            registry[host] = ExtractionRule(
+                host=host,
+                content=_compile_all(spec.get("content", [])),
+                amp_content=_compile_all(spec.get("amp_content", [])),
+                prefer_jsonld=bool(spec.get("prefer_jsonld", False)),
+                prefer_amp=bool(spec.get("prefer_amp", False)),
+                follow_link_text=spec.get("follow_link_text"),
+            )
+    logger.debug(f"[RULES] Compiled extraction rules for: {', '.join(sorted(registry)) or 'none'}")
+    return registry
+
+
+_REGISTRY = _build_registry()
+
+
+@lru_cache(maxsize=512)
+def _rule_for_host(host: str) -> ExtractionRule:
+    host = host.lower().split(":")[0].removeprefix("www.")
+    best = None
+    for suffix, rule in _REGISTRY.items():
+        if host == suffix or host.endswith("." + suffix):
+            if best is None or len(suffix) > len(best.host):
+                best = rule
+    return best or GENERIC_RULE
+
+
+def get_rule(url: str) -> ExtractionRule:
+    """Returns the extraction rule for a URL's host (most specific suffix wins)."""
+    try:
+        host = urlparse(url).netloc
+    except ValueError:
+        host = ""
+    return _rule_for_host(host)
+
+
+def select_first(soup, compiled_selectors: tuple):
+    """Returns (element, css) for the first selector that matches, or (None, None)."""
+    for css, pattern in compiled_selectors:
+        el = pattern.select_one(soup)
+        if el is not None:
+            return el, css
+    return None, None
@@ -1,19 +1,26 @@
 # -*- coding: utf-8 -*-
 """
 image_generator.py (brand_color + left_bar_color aware)
-Uses Playwright for stable browser automation.
+Uses Playwright for stable browser automation; browsers are pooled and reused
+across images (browser_pool.py).
 """
 from __future__ import annotations
 import base64
+import hashlib
+import io
+import mmap
 import os
 import re
 import shutil
 import json
+import threading
+from html import unescape as _html_unescape
 from pathlib import Path
 from typing import List, Optional
 from jinja2 import Template
 import markdown2
 from PIL import Image, ImageChops
+from . import browser_pool
 
 # ----------------- 路径与参数 -----------------
 ROOT_DIR = Path(__file__).resolve().parents[1]
@@ -21,6 +28,11 @@ TEMPLATE_DIR       = ROOT_DIR / "templates"
 TEMPLATE_ARTICLE   = TEMPLATE_DIR / "weixin_article_template.html"
 TEMPLATE_REFERENCE = TEMPLATE_DIR / "weixin_reference_template.html"
 FONTS_DIR          = ROOT_DIR / "assets" / "fonts"
+FONT_FILE          = FONTS_DIR / "SourceHanSerifSC-VF.otf"
+
+# 按页面文字子集化字体（需要 fontTools；0 = 始终内嵌完整字体）
+FONT_SUBSET_ENABLED = os.environ.get("WXIMG_FONT_SUBSET", "1") != "0"
+FONT_SUBSET_CACHE   = int(os.environ.get("WXIMG_FONT_SUBSET_CACHE", "64"))   # 内存中保留的子集个数
 
 DEFAULT_PAGE_WIDTH   = 540
 DEFAULT_MIN_HEIGHT   = 2200
@@ -74,15 +86,100 @@ def _embed_image_as_data_uri(image_path_or_url: str) -> str:
     mime = "image/png" if ext == ".png" else "image/jpeg"
     return f"data:{mime};base64,{b64}"
 
+# 字体 data URI 只编码一次：按文件 (mtime, size) 缓存，正文页与参考页共用
+_font_uri_cache: dict = {}
+_font_uri_lock = threading.Lock()
+
 def _font_data_uri() -> str:
-    vf = FONTS_DIR / "SourceHanSerifSC-VF.otf"
+    """Base64 data URI of the CJK font, encoded once per font file version (memory-mapped read)."""
     try:
-        if vf.exists():
-            b64 = base64.b64encode(vf.read_bytes()).decode("ascii")
-            return f"data:font/otf;base64,{b64}"
-    except Exception:
-        pass
-    return ""  # 找不到就返回空，后续兜底使用 file:// 绝对路径
+        st = FONT_FILE.stat()
+    except OSError:
+        return ""  # 找不到就返回空，后续兜底使用 file:// 绝对路径
+    key = (st.st_mtime_ns, st.st_size)
+    with _font_uri_lock:
+        if _font_uri_cache.get("key") != key:
+            try:
+                with open(FONT_FILE, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    b64 = base64.b64encode(mm).decode("ascii")
+            except (OSError, ValueError):
+                return ""
+            _font_uri_cache.update(key=key, uri=f"data:font/otf;base64,{b64}")
+        return _font_uri_cache["uri"]
+
+# 字体子集：只保留页面实际用到的字形，按 (字体版本, 字符集) 的哈希缓存
+_FONT_SRC_SLOT = "__WXIMG_FONT_SRC__"
+_SUBSET_BASE_CHARS = frozenset(chr(c) for c in range(0x20, 0x7F)) | frozenset("，。、；：？！“”‘’（）《》【】—…·")
+_subset_cache: dict[str, str] = {}
+_subset_lock = threading.Lock()
+_subset_unavailable_logged = False
+
+def _page_chars(html: str) -> frozenset[str]:
+    """Characters of the page outside its tags (so not the data URIs), plus ASCII and common CJK punctuation."""
+    return frozenset(_html_unescape(re.sub(r"<[^>]+>", " ", html))) | _SUBSET_BASE_CHARS
+
+def _subset_font_data_uri(chars: frozenset[str]) -> str:
+    """Data URI of FONT_FILE cut down to chars (variation axes and layout features kept); "" when unavailable."""
+    global _subset_unavailable_logged
+    try:
+        from fontTools import subset
+        from fontTools.ttLib import TTFont
+    except ImportError:
+        if not _subset_unavailable_logged:
+            _subset_unavailable_logged = True
+            print("[image_generator] fontTools not installed, embedding the full font")
+        return ""
+    try:
+        st = FONT_FILE.stat()
+    except OSError:
+        return ""
+    codepoints = sorted(ord(c) for c in chars if ord(c) >= 0x20)
+    digest = hashlib.sha1(f"{st.st_mtime_ns}:{st.st_size}:".encode("ascii")
+                          + ",".join(map(str, codepoints)).encode("ascii")).hexdigest()
+    with _subset_lock:
+        uri = _subset_cache.pop(digest, None)
+        if uri is not None:
+            _subset_cache[digest] = uri          # 最近使用的放到末尾
+            return uri
+
+    # 子集化放在锁外，多个渲染线程可以并行
+    options = subset.Options()
+    options.layout_features = ["*"]              # 保留 vert/halt/palt 等排版特性
+    options.name_IDs = ["*"]
+    options.notdef_outline = True
+    try:
+        font = TTFont(str(FONT_FILE))
+        subsetter = subset.Subsetter(options)
+        subsetter.populate(unicodes=codepoints)
+        subsetter.subset(font)
+        buf = io.BytesIO()
+        font.save(buf)
+        font.close()
+    except Exception as e:
+        print(f"[image_generator] font subsetting failed, embedding the full font: {e}")
+        return ""
+    data = buf.getvalue()
+    uri = f"data:font/otf;base64,{base64.b64encode(data).decode('ascii')}"
+    if os.environ.get("WXIMG_DEBUG"):
+        print(f"[image_generator] font subset: {len(codepoints)} chars, {len(data) / 1024:.0f} KB "
+              f"(full font {st.st_size / 1024:.0f} KB)")
+    with _subset_lock:
+        _subset_cache[digest] = uri
+        while len(_subset_cache) > max(1, FONT_SUBSET_CACHE):
+            _subset_cache.pop(next(iter(_subset_cache)))
+    return uri
+
+def _font_src(chars: frozenset[str] | None = None) -> str:
+    """@font-face src: subset for chars when possible, else the full memoized font, else file://."""
+    if chars and FONT_SUBSET_ENABLED:
+        uri = _subset_font_data_uri(chars)
+        if uri:
+            return uri
+    return _font_data_uri() or FONT_FILE.resolve().as_uri()
+
+def _fill_font_src(html: str) -> str:
+    """Replaces the font slot of a page rendered with font_src=_FONT_SRC_SLOT by the font for its text."""
+    return html.replace(_FONT_SRC_SLOT, _font_src(_page_chars(html)), 1)
 
 def _guess_chrome_path() -> str | None:
     """Find Chrome/Chromium executable path across different environments."""
@@ -140,13 +237,13 @@ def _render_html(
     tpl = _ensure_article_template()
     body_html = _to_html(content)
     cover_src = _embed_image_as_data_uri(cover_image) if cover_image else ""
-    font_src = _font_data_uri() or (FONTS_DIR / "SourceHanSerifSC-VF.otf").resolve().as_uri()
 
     if os.environ.get("WXIMG_DEBUG"):
         print(f"[image_generator] brand_color={brand_color} left_bar_color={left_bar_color}")
 
-    return tpl.render(
-        font_src=font_src,
+    # 先用占位符渲染，得到整页文字（含模板里的固定文字）后再按字符集嵌入字体
+    html = tpl.render(
+        font_src=_FONT_SRC_SLOT,
         page_width=page_width,
         min_height=min_height,
         title_size=title_size,
@@ -160,15 +257,11 @@ def _render_html(
         brand_color=brand_color,
         left_bar_color=left_bar_color,
     )
+    return _fill_font_src(html)
 
 # ================= HTML → PNG (Using Playwright) =================
-def _html_to_png_sync(html: str, out_path: Path, page_width: int, device_scale: int) -> None:
-    """Convert HTML to PNG using Playwright (synchronous API - more stable than pyppeteer)."""
-    from playwright.sync_api import sync_playwright
-    
-    # Try to find system Chrome/Chromium as fallback
-    chrome_path = _guess_chrome_path()
-    
+def _launch_kwargs() -> dict:
+    """Chromium launch options for the browser pool."""
     launch_kwargs = {
         "headless": True,
         "args": [
@@ -182,24 +275,22 @@ def _html_to_png_sync(html: str, out_path: Path, page_width: int, device_scale:
     }
     
     # Use system Chrome if available (important for Railway/Docker deployments)
+    chrome_path = _guess_chrome_path()
     if chrome_path:
         launch_kwargs["executable_path"] = chrome_path
-    
-    with sync_playwright() as p:
-        browser = p.chromium.launch(**launch_kwargs)
-        
-        try:
-            page = browser.new_page(
-                viewport={"width": page_width, "height": 1500},
-                device_scale_factor=device_scale,
-            )
-            
-            page.set_content(html)
-            page.wait_for_selector("#page-root", timeout=15000)
-            page.wait_for_timeout(800)
-            page.screenshot(path=str(out_path), full_page=True)
-        finally:
-            browser.close()
+    return launch_kwargs
+
+def _html_to_png_sync(html: str, out_path: Path, page_width: int, device_scale: int) -> None:
+    """Convert HTML to PNG on a pooled, long-lived Playwright browser (see browser_pool.py)."""
+    browser_pool.get_pool(_launch_kwargs).render(html, out_path, page_width, device_scale)
+
+def ensure_render_workers(n: int) -> None:
+    """Lets up to n images render at the same time (one pooled browser per worker)."""
+    browser_pool.get_pool(_launch_kwargs, workers=n)
+
+def release_render_workers() -> None:
+    """After a parallel job: lets the pool fall back to its default size (WXIMG_RENDER_WORKERS)."""
+    browser_pool.get_pool(_launch_kwargs).shrink_workers(browser_pool.DEFAULT_WORKERS)
 
 # ================= 智能裁剪 =================
 def _smart_crop_bottom_keep(
@@ -349,15 +440,14 @@ def make_reference_image_from_reports(
                 seen.add(u)
                 urls.append(u)
 
-    font_src = _font_data_uri() or (FONTS_DIR / "SourceHanSerifSC-VF.otf").resolve().as_uri()
     tpl = _ensure_reference_template(template_path)
-    html = tpl.render(
-        font_src=font_src,
+    html = _fill_font_src(tpl.render(
+        font_src=_FONT_SRC_SLOT,
         page_width=page_width,
         min_height=min_height,
         urls=urls,
         brand_color=brand_color,
-    )
+    ))
     _html_to_png_sync(html, out_path, page_width, device_scale)
     _smart_crop_bottom_keep(
         out_path,
@@ -0,0 +1,248 @@
+# news_bot/utils/host_scheduler.py
+
+import time
+import logging
+import threading
+from collections import deque
+from urllib.parse import urlsplit
+from urllib.robotparser import RobotFileParser
+from ..core import config
+
+# Setup logging
+logger = logging.getLogger('host_scheduler')
+
+# Per-host politeness for every fetch that goes through http_client:
+#   - robots.txt is fetched once per host (cached for ROBOTS_TXT_TTL) and its
+#     Crawl-delay / Request-rate raise the host's minimum spacing;
+#   - at most `limit` requests run against a host at once, and request starts are
+#     spaced by `interval` seconds;
+#   - AIMD: every fast success adds ~1 to the limit per window (up to
+#     HOST_MAX_CONCURRENCY); a 429/503 or a latency spike halves it and doubles the
+#     interval, and Retry-After pauses the host;
+#   - circuit breaker: BREAKER_FAILURE_THRESHOLD consecutive failures (connection
+#     errors, timeouts, 5xx, 429) open the host for BREAKER_COOLDOWN seconds, then a
+#     single half-open trial decides whether it closes again;
+#   - the per-host timeout follows observed p95 latency instead of the flat
+#     URL_FETCH_TIMEOUT once enough samples exist.
+
+_BACKOFF_STATUSES = {429, 503}
+_LATENCY_SPIKE_FACTOR = 3.0       # latency above this multiple of the host's baseline counts as congestion
+_MAX_INTERVAL = 10.0              # seconds
+_MAX_RETRY_AFTER = 60.0           # seconds
+_LATENCY_SAMPLES = 50
+_MIN_TIMEOUT_SAMPLES = 8
+_TIMEOUT_P95_FACTOR = 3.0         # timeout = p95 x factor, clamped to [MIN_ADAPTIVE_TIMEOUT, URL_FETCH_TIMEOUT]
+
+BREAKER_CLOSED = "closed"
+BREAKER_OPEN = "open"
+BREAKER_HALF_OPEN = "half_open"
+
+
+class _HostState:
+    def __init__(self, host: str):
+        self.host = host
+        self.cond = threading.Condition()
+        self.active = 0
+        self.limit = max(1.0, config.HOST_MAX_CONCURRENCY / 2)
+        self.base_interval = config.HOST_MIN_INTERVAL
+        self.interval = self.base_interval
+        self.next_start = 0.0           # monotonic time the next request may start
+        self.latency_baseline = None    # EWMA of successful request latency
+        self.requests = 0
+        self.backoffs = 0
+        self.robots = None              # RobotFileParser, or None when unavailable
+        self.robots_fetched_at = None
+        self.robots_lock = threading.Lock()
+        self.latencies = deque(maxlen=_LATENCY_SAMPLES)
+        self.consecutive_failures = 0
+        self.breaker = BREAKER_CLOSED
+        self.opened_at = 0.0
+        self.trial_in_flight = False
+        self.short_circuited = 0
+
+    def p95_latency(self) -> float | None:
+        if len(self.latencies) < _MIN_TIMEOUT_SAMPLES:
+            return None
+        ordered = sorted(self.latencies)
+        return ordered[int(0.95 * (len(ordered) - 1))]
+
+    def snapshot(self) -> dict:
+        with self.cond:
+            return {
+                "active": self.active,
+                "limit": round(self.limit, 2),
+                "interval_s": round(self.interval, 3),
+                "crawl_delay_s": round(self.base_interval, 3),
+                "latency_baseline_s": round(self.latency_baseline, 3) if self.latency_baseline else None,
+                "requests": self.requests,
+                "backoffs": self.backoffs,
+                "breaker": self.breaker,
+                "consecutive_failures": self.consecutive_failures,
+                "short_circuited": self.short_circuited,
+                "p95_latency_s": round(self.p95_latency(), 3) if self.p95_latency() else None,
+            }
+
+
+_hosts: dict[str, _HostState] = {}
+_hosts_lock = threading.Lock()
+
+
+def _state_for(host: str) -> _HostState:
+    with _hosts_lock:
+        state = _hosts.get(host)
+        if state is None:
+            state = _hosts[host] = _HostState(host)
+        return state
+
+
+def _load_robots(state: _HostState, scheme: str, fetch) -> None:
+    """Fetches and parses robots.txt once per TTL; failures allow everything."""
+    with state.robots_lock:
+        now = time.monotonic()
+        if state.robots_fetched_at is not None and now - state.robots_fetched_at < config.ROBOTS_TXT_TTL:
+            return
+        state.robots_fetched_at = now
+        robots_url = f"{scheme}://{state.host}/robots.txt"
+        parser = RobotFileParser(robots_url)
+        try:
+            resp = fetch(robots_url)
+            if resp.status_code >= 400:
+                parser.allow_all = True
+            else:
+                parser.parse(resp.text.splitlines())
+        except Exception as e:
+            logger.debug(f"[SCHED] robots.txt unavailable for {state.host}: {e}")
+            parser.allow_all = True
+        state.robots = parser
+
+        delay = parser.crawl_delay("*")
+        rate = parser.request_rate("*")
+        if rate and rate.requests:
+            delay = max(delay or 0, rate.seconds / rate.requests)
+        if delay:
+            with state.cond:
+                state.base_interval = max(config.HOST_MIN_INTERVAL, min(float(delay), _MAX_INTERVAL))
+                state.interval = max(state.interval, state.base_interval)
+            logger.info(f"[SCHED] {state.host}: robots.txt crawl delay {state.base_interval:.2f}s")
+
+
+def allowed(url: str, fetch) -> bool:
+    """
+    Returns False when robots.txt disallows url for all user agents.
+    `fetch(url)` is used to download robots.txt (unscheduled, once per host).
+    """
+    parts = urlsplit(url)
+    state = _state_for(parts.netloc.lower())
+    _load_robots(state, parts.scheme or "https", fetch)
+    return state.robots is None or state.robots.can_fetch("*", url)
+
+
+def sitemaps_for(url: str, fetch) -> list[str]:
+    """Sitemap URLs declared in the robots.txt of url's host (loaded as in allowed())."""
+    parts = urlsplit(url)
+    state = _state_for(parts.netloc.lower())
+    _load_robots(state, parts.scheme or "https", fetch)
+    return list((state.robots and state.robots.site_maps()) or [])
+
+
+def breaker_allows(url: str) -> bool:
+    """
+    False while the host's breaker is open. After BREAKER_COOLDOWN one caller gets
+    through as the half-open trial; its outcome (reported via release) closes or
+    re-opens the breaker.
+    """
+    state = _state_for(urlsplit(url).netloc.lower())
+    with state.cond:
+        if state.breaker == BREAKER_CLOSED:
+            return True
+        if state.breaker == BREAKER_OPEN and time.monotonic() - state.opened_at >= config.BREAKER_COOLDOWN:
+            state.breaker = BREAKER_HALF_OPEN
+        if state.breaker == BREAKER_HALF_OPEN and not state.trial_in_flight:
+            state.trial_in_flight = True
+            logger.info(f"[SCHED] {state.host}: breaker half-open, sending a trial request")
+            return True
+        state.short_circuited += 1
+        return False
+
+
+def timeout_for(url: str) -> float:
+    """URL_FETCH_TIMEOUT, tightened to p95 latency x 3 (at least MIN_ADAPTIVE_TIMEOUT) once measured."""
+    state = _state_for(urlsplit(url).netloc.lower())
+    with state.cond:
+        p95 = state.p95_latency()
+    if p95 is None:
+        return config.URL_FETCH_TIMEOUT
+    return min(float(config.URL_FETCH_TIMEOUT), max(config.MIN_ADAPTIVE_TIMEOUT, p95 * _TIMEOUT_P95_FACTOR))
+
+
+def _update_breaker(state: _HostState, failed: bool) -> None:
+    # Caller holds state.cond
+    state.trial_in_flight = False
+    if not failed:
+        if state.breaker != BREAKER_CLOSED:
+            logger.info(f"[SCHED] {state.host}: breaker closed")
+        state.consecutive_failures = 0
+        state.breaker = BREAKER_CLOSED
+        return
+    state.consecutive_failures += 1
+    if state.breaker == BREAKER_HALF_OPEN or state.consecutive_failures >= config.BREAKER_FAILURE_THRESHOLD:
+        if state.breaker != BREAKER_OPEN:
+            logger.warning(f"[SCHED] {state.host}: breaker open after {state.consecutive_failures} consecutive failures "
+                           f"(cooldown {config.BREAKER_COOLDOWN}s)")
+        state.breaker = BREAKER_OPEN
+        state.opened_at = time.monotonic()
+
+
+def acquire(url: str) -> _HostState:
+    """Blocks until the host has a free slot and its spacing has elapsed."""
+    state = _state_for(urlsplit(url).netloc.lower())
+    with state.cond:
+        while state.active >= int(state.limit):
+            state.cond.wait()
+        state.active += 1
+        state.requests += 1
+        now = time.monotonic()
+        start_at = max(now, state.next_start)
+        state.next_start = start_at + state.interval
+    wait = start_at - now
+    if wait > 0:
+        time.sleep(wait)
+    return state
+
+
+def release(state: _HostState, status: int | None, latency: float, retry_after: str | None = None) -> None:
+    """Frees the slot and adapts limit/interval from the outcome (status None = connection error)."""
+    with state.cond:
+        state.active -= 1
+        failed = status is None or status in _BACKOFF_STATUSES or status >= 500
+        _update_breaker(state, failed)
+        congested = status in _BACKOFF_STATUSES or status is None
+        if not congested and state.latency_baseline and latency > state.latency_baseline * _LATENCY_SPIKE_FACTOR:
+            congested = True
+
+        if congested:
+            # Multiplicative decrease
+            state.backoffs += 1
+            state.limit = max(1.0, state.limit / 2)
+            state.interval = min(max(state.interval * 2, state.base_interval, 0.5), _MAX_INTERVAL)
+            if retry_after and retry_after.strip().isdigit():
+                pause = min(float(retry_after), _MAX_RETRY_AFTER)
+                state.next_start = max(state.next_start, time.monotonic() + pause)
+            logger.info(f"[SCHED] {state.host}: backing off (status={status}, {latency:.2f}s) -> "
+                        f"limit {state.limit:.1f}, interval {state.interval:.2f}s")
+        else:
+            # Additive increase: about +1 slot per window of `limit` successes
+            state.limit = min(float(config.HOST_MAX_CONCURRENCY), state.limit + 1 / state.limit)
+            state.interval = max(state.base_interval, state.interval * 0.9)
+            if status is not None and status < 400:
+                state.latencies.append(latency)
+                baseline = state.latency_baseline
+                state.latency_baseline = latency if baseline is None else baseline * 0.8 + latency * 0.2
+        state.cond.notify_all()
+
+
+def get_host_stats() -> dict:
+    """Current limit, spacing and counters per host, for /api/debug."""
+    with _hosts_lock:
+        states = list(_hosts.values())
+    return {state.host: state.snapshot() for state in states}
@@ -0,0 +1,56 @@
+# news_bot/utils/html_parser.py
+
+import logging
+from bs4 import BeautifulSoup
+from bs4.builder import builder_registry
+from ..core import config
+
+# Setup logging
+logger = logging.getLogger('html_parser')
+
+# BeautifulSoup tree builders in order of preference. lxml is C-backed and
+# parses full news pages several times faster than the pure-Python html.parser.
+PARSER_PREFERENCE = ["lxml", "html.parser"]
+
+_parser_backend = None
+
+
+def available_parsers() -> list[str]:
+    """Returns the tree builders from PARSER_PREFERENCE that are installed."""
+    return [name for name in PARSER_PREFERENCE if builder_registry.lookup(name) is not None]
+
+
+def get_parser_backend() -> str:
+    """
+    Returns the BeautifulSoup tree builder used for all HTML parsing.
+    Honours config.HTML_PARSER when it names an installed builder, otherwise
+    picks the fastest available one and falls back to html.parser.
+    """
+    global _parser_backend
+    if _parser_backend is not None:
+        return _parser_backend
+
+    installed = available_parsers()
+    requested = (config.HTML_PARSER or "auto").strip().lower()
+    if requested != "auto":
+        if requested in installed:
+            _parser_backend = requested
+        else:
+            logger.warning(f"[PARSER] Requested HTML_PARSER '{requested}' is not installed, falling back to auto-detection")
+    if _parser_backend is None:
+        _parser_backend = installed[0] if installed else "html.parser"
+
+    logger.info(f"[PARSER] Using HTML parser backend: {_parser_backend}")
+    return _parser_backend
+
+
+def make_soup(markup: str | bytes, parse_only=None, parser: str | None = None) -> BeautifulSoup:
+    """
+    Parses markup with the configured backend.
+
+    Args:
+        markup: HTML as bytes (preferred, lets the parser sniff the encoding) or str
+        parse_only: Optional SoupStrainer to build only part of the tree
+        parser: Explicit tree builder name, mainly for benchmarks
+    """
+    return BeautifulSoup(markup, parser or get_parser_backend(), parse_only=parse_only)
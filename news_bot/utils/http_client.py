@@ -0,0 +1,357 @@
+# news_bot/utils/http_client.py
+
+import time
+import hashlib
+import logging
+import threading
+from contextlib import contextmanager
+from collections import Counter, deque
+from datetime import datetime
+import requests
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+from ..core import config
+from . import host_scheduler, page_corpus
+
+# Setup logging
+logger = logging.getLogger('http_client')
+
+DEFAULT_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+}
+HTML_CONTENT_TYPES = ("text/html", "application/xhtml+xml")
+_CHUNK_SIZE = 64 * 1024
+
+# One pooled session for every fetch (keep-alive across pages of the same host)
+_session = requests.Session()
+_session.mount("https://", HTTPAdapter(pool_connections=32, pool_maxsize=32))
+_session.mount("http://", HTTPAdapter(pool_connections=32, pool_maxsize=32))
+
+# Recent truncated/skipped fetches, surfaced in /api/debug
+_events_lock = threading.Lock()
+_event_counts = Counter()
+_recent_events = deque(maxlen=100)
+
+# Offline fixtures for scripts/benchmark_scanners.py (off unless use_fixtures() is called):
+#   "record" fetches normally and saves every response (robots.txt included) to
+#            page_corpus under the given school as kind "fixture";
+#   "replay" answers from the corpus without the network or host_scheduler;
+#            unrecorded requests get an empty 404.
+_SECRET_PARAMS = frozenset({"key", "cx", "api_key", "apikey", "access_token"})
+_fixtures = {"mode": None, "school": None, "corpus_dir": None, "pages": {}}
+_fixture_lock = threading.Lock()
+_fixture_counts = Counter()
+_fixture_served: set[str] = set()
+
+
+class HostUnavailable(requests.exceptions.ConnectionError):
+    """Raised without touching the network while the host's circuit breaker is open."""
+
+    def __init__(self, url: str):
+        super().__init__(f"circuit open for host: {url}")
+        self.url = url
+
+
+class DeferredRetryQueue:
+    """
+    Article URLs whose fetch failed for a transient reason (timeout, connection
+    error, 5xx/429, open circuit) during one run. Orchestrators retry them once,
+    after every other candidate has been tried.
+    """
+
+    def __init__(self):
+        self._reasons: dict[str, str] = {}
+        self._lock = threading.Lock()
+
+    def defer(self, url: str, reason: str) -> None:
+        with self._lock:
+            self._reasons[url] = reason
+
+    def reason(self, url: str) -> str | None:
+        with self._lock:
+            return self._reasons.get(url)
+
+    def __contains__(self, url: str) -> bool:
+        with self._lock:
+            return url in self._reasons
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._reasons)
+
+
+def is_transient(exc: BaseException) -> bool:
+    """Whether a fetch error is worth retrying later in the run."""
+    if isinstance(exc, (requests.exceptions.Timeout, requests.exceptions.ConnectionError)):
+        return True
+    if isinstance(exc, requests.exceptions.HTTPError) and exc.response is not None:
+        return exc.response.status_code >= 500 or exc.response.status_code == 429
+    return False
+
+
+class ContentSkipped(requests.exceptions.RequestException):
+    """Raised when a response is rejected from its headers, before the body is read."""
+
+    def __init__(self, reason: str, url: str, **kwargs):
+        super().__init__(f"{reason}: {url}", **kwargs)
+        self.reason = reason
+        self.url = url
+
+
+class DeadlineExceeded(requests.exceptions.RequestException):
+    """Raised without touching the network once the calling thread's fetch deadline has passed."""
+
+    def __init__(self, url: str):
+        super().__init__(f"fetch deadline passed: {url}")
+        self.url = url
+
+
+# Cooperative deadlines: a discovery scanner's thread (and the paginator threads
+# fetching for it) sets one with fetch_deadline(); later requests on that thread
+# fail fast instead of keeping a pool slot and host capacity past the timeout
+_deadline_local = threading.local()
+
+
+@contextmanager
+def fetch_deadline(deadline: float | None):
+    """Sets the calling thread's fetch deadline (a time.monotonic() value; None = none) for the block."""
+    previous = getattr(_deadline_local, "deadline", None)
+    _deadline_local.deadline = deadline
+    try:
+        yield
+    finally:
+        _deadline_local.deadline = previous
+
+
+def current_deadline() -> float | None:
+    return getattr(_deadline_local, "deadline", None)
+
+
+def _check_deadline(url: str) -> None:
+    deadline = current_deadline()
+    if deadline is not None and time.monotonic() >= deadline:
+        raise DeadlineExceeded(url)
+
+
+def _record_event(kind: str, url: str, detail: str) -> None:
+    with _events_lock:
+        _event_counts[kind] += 1
+        _recent_events.append({
+            "kind": kind,
+            "url": url,
+            "detail": detail,
+            "timestamp": datetime.now().isoformat(),
+        })
+
+
+def get_fetch_stats() -> dict:
+    """Counts and the most recent truncated/skipped fetches, plus per-host scheduler state."""
+    with _events_lock:
+        stats = {"counts": dict(_event_counts), "recent": list(_recent_events)}
+    stats["hosts"] = host_scheduler.get_host_stats()
+    return stats
+
+
+def fixture_key(method: str, url: str, params=None, data=None) -> str:
+    """
+    Corpus key of a request: the final URL (params applied), plus method and body hash
+    for non-GETs. Credential params (_SECRET_PARAMS) are left out so keys never reach
+    the corpus index; recording and replay drop them alike.
+    """
+    if isinstance(params, dict):
+        params = {k: v for k, v in params.items() if k not in _SECRET_PARAMS}
+    prepared = requests.Request(method.upper(), url, params=params, data=data).prepare()
+    if prepared.method == "GET":
+        return prepared.url
+    body = prepared.body or b""
+    body = body.encode('utf-8') if isinstance(body, str) else body
+    return f"{prepared.method} {prepared.url} #{hashlib.sha1(body).hexdigest()[:12]}"
+
+
+def use_fixtures(mode: str | None, corpus_dir: str | None = None, school_key: str | None = None) -> None:
+    """
+    Switches fixture mode: "record" (school_key required), "replay" (serves every
+    recorded page of the corpus, or only school_key's) or None (live fetching).
+    """
+    if mode not in (None, "record", "replay"):
+        raise ValueError(f"unknown fixture mode: {mode}")
+    if mode == "record" and not school_key:
+        raise ValueError("recording fixtures needs a school_key")
+    pages = {}
+    if mode == "replay":
+        for page in page_corpus.iter_pages(corpus_dir, [school_key] if school_key else None):
+            pages[page["url"]] = page
+    with _fixture_lock:
+        _fixtures.update(mode=mode, school=school_key, corpus_dir=corpus_dir, pages=pages)
+    if mode:
+        logger.info(f"[FIXTURE] {mode} mode ({len(pages)} recorded pages)" if mode == "replay"
+                    else f"[FIXTURE] Recording responses for {school_key}")
+
+
+def get_fixture_stats(reset: bool = False) -> dict:
+    """Fixture pages served, missed and recorded since the last reset, plus the keys served."""
+    with _fixture_lock:
+        stats = {**_fixture_counts, "pages": sorted(_fixture_served)}
+        if reset:
+            _fixture_counts.clear()
+            _fixture_served.clear()
+    return stats
+
+
+def _replay(method: str, url: str, key: str) -> requests.Response:
+    page = _fixtures["pages"].get(key)
+    response = requests.Response()
+    response.url = url
+    response.request = requests.Request(method.upper(), url).prepare()
+    response.truncated = False
+    with _fixture_lock:
+        _fixture_counts["served" if page else "missed"] += 1
+        if page:
+            _fixture_served.add(key)
+    if page is None:
+        logger.debug(f"[FIXTURE] No recording for {key}")
+        response.status_code = 404
+        response._content = b""
+        return response
+    response.status_code = page["status"]
+    response.headers = CaseInsensitiveDict({"Content-Type": page["content_type"] or "text/html"})
+    response._content = page["content"]
+    return response
+
+
+def _record(key: str, response: requests.Response, content: bytes | None = None) -> None:
+    with _fixture_lock:
+        page_corpus.save_page(_fixtures["school"], key, response.content if content is None else content,
+                              response.headers.get("Content-Type", ""), kind="fixture",
+                              corpus_dir=_fixtures["corpus_dir"], status=response.status_code)
+        _fixture_counts["recorded"] += 1
+
+
+def _fetch_robots_txt(robots_url: str) -> requests.Response:
+    # Unscheduled on purpose: called by host_scheduler before the host's first slot
+    if _fixtures["mode"] == "replay":
+        return _replay("GET", robots_url, fixture_key("GET", robots_url))
+    response = _session.get(robots_url, headers=DEFAULT_HEADERS, timeout=10)
+    if _fixtures["mode"] == "record":
+        _record(fixture_key("GET", robots_url), response)
+    return response
+
+
+def robots_sitemaps(url: str) -> list[str]:
+    """Sitemap URLs listed in robots.txt for url's host (the copy the scheduler already holds)."""
+    return host_scheduler.sitemaps_for(url, _fetch_robots_txt)
+
+
+def request(method: str, url: str, *, headers: dict | None = None, timeout: float | None = None,
+            max_bytes: int | None = None, accept: tuple[str, ...] | None = None, **kwargs) -> requests.Response:
+    """
+    Streams a response and returns it with .content populated.
+    Every request waits for a slot from host_scheduler (per-host concurrency,
+    spacing, robots.txt crawl delay) and reports its outcome back to it. While a
+    host's circuit breaker is open, HostUnavailable is raised immediately. Without
+    an explicit timeout, the host's p95-derived timeout is used; under a
+    fetch_deadline() the timeout never runs past the deadline, and once it has
+    passed DeadlineExceeded is raised. In fixture replay mode (use_fixtures) the
+    recorded response is returned instead.
+
+    Args:
+        accept: Allowed Content-Type values (e.g. HTML_CONTENT_TYPES). A successful
+                response with any other type raises ContentSkipped before the body is read.
+        max_bytes: Body cap (defaults to config.MAX_FETCH_BYTES, 0 disables). A declared
+                   Content-Length above the cap raises ContentSkipped; an undeclared body
+                   is cut at the cap and the response is marked .truncated = True.
+    """
+    max_bytes = config.MAX_FETCH_BYTES if max_bytes is None else max_bytes
+    fixture_mode = _fixtures["mode"]
+    if fixture_mode:
+        key = fixture_key(method, url, kwargs.get("params"), kwargs.get("data"))
+    if fixture_mode == "replay":
+        response = _replay(method, url, key)
+        if accept and response.ok:
+            content_type = response.headers.get("Content-Type", "").split(";")[0].strip().lower()
+            if content_type and content_type not in accept:
+                raise ContentSkipped("non_html_content_type", url, response=response)
+        return response
+    _check_deadline(url)
+    timeout = timeout or host_scheduler.timeout_for(url)
+
+    if not host_scheduler.allowed(url, _fetch_robots_txt):
+        logger.warning(f"[HTTP] robots.txt disallows {url}")
+        _record_event("robots_disallowed", url, "disallowed by robots.txt")
+        if config.RESPECT_ROBOTS_DISALLOW:
+            raise ContentSkipped("robots_disallowed", url)
+
+    if not host_scheduler.breaker_allows(url):
+        logger.info(f"[HTTP] Circuit open, not fetching {url}")
+        _record_event("short_circuited", url, "host circuit breaker open")
+        raise HostUnavailable(url)
+
+    slot = host_scheduler.acquire(url)
+    started = time.monotonic()
+    status = retry_after = None
+    try:
+        deadline = current_deadline()
+        if deadline is not None and isinstance(timeout, (int, float)):
+            # Already holding a slot: finish the request, but not much past the deadline
+            timeout = min(timeout, max(deadline - time.monotonic(), 1.0))
+        response = _session.request(
+            method, url,
+            headers=headers or DEFAULT_HEADERS,
+            timeout=timeout,
+            stream=True,
+            **kwargs
+        )
+        status = response.status_code
+        retry_after = response.headers.get("Retry-After")
+        try:
+            if accept and response.ok:
+                content_type = response.headers.get("Content-Type", "").split(";")[0].strip().lower()
+                if content_type and content_type not in accept:
+                    logger.info(f"[HTTP] Skipping {url}: content-type {content_type}")
+                    _record_event("skipped", url, f"content-type {content_type}")
+                    if fixture_mode == "record":
+                        # Headers only: replay raises ContentSkipped from the recorded type
+                        _record(key, response, b"")
+                    raise ContentSkipped("non_html_content_type", url, response=response)
+
+            declared = response.headers.get("Content-Length", "")
+            if max_bytes and declared.isdigit() and int(declared) > max_bytes:
+                logger.info(f"[HTTP] Skipping {url}: Content-Length {declared} exceeds cap {max_bytes}")
+                _record_event("skipped", url, f"content-length {declared} > {max_bytes}")
+                raise ContentSkipped("too_large", url, response=response)
+
+            chunks = []
+            received = 0
+            truncated = False
+            for chunk in response.iter_content(_CHUNK_SIZE):
+                chunks.append(chunk)
+                received += len(chunk)
+                if max_bytes and received > max_bytes:
+                    truncated = True
+                    break
+            body = b"".join(chunks)
+            if truncated:
+                body = body[:max_bytes]
+                logger.info(f"[HTTP] Truncated {url} at {max_bytes} bytes")
+                _record_event("truncated", url, f"body cut at {max_bytes} bytes")
+
+            response._content = body
+            response._content_consumed = True
+            response.truncated = truncated
+            if fixture_mode == "record":
+                _record(key, response)
+            return response
+        finally:
+            response.close()
+    finally:
+        host_scheduler.release(slot, status, time.monotonic() - started, retry_after)
+
+
+def get(url: str, **kwargs) -> requests.Response:
+    """GET through the shared fetch layer (see request())."""
+    return request("GET", url, **kwargs)
+
+
+def post(url: str, **kwargs) -> requests.Response:
+    """POST through the shared fetch layer (see request())."""
+    return request("POST", url, **kwargs)
@@ -0,0 +1,96 @@
+# news_bot/utils/page_corpus.py
+
+import os
+import json
+import hashlib
+import logging
+from typing import Iterator
+from ..core import config
+
+# Setup logging
+logger = logging.getLogger('page_corpus')
+
+# Saved pages used by the offline benchmarks, one sub-directory per school key:
+#   benchmarks/pages/<school_key>/index.json   url -> {file, content_type, kind, status}
+#   benchmarks/pages/<school_key>/<sha1(url)[:16]>.<ext>
+# "url" is the fetched URL, or http_client.fixture_key() for responses recorded as
+# replay fixtures (kind "fixture"; query parameters and POST bodies are part of the key).
+DEFAULT_CORPUS_DIR = os.path.join(config.PROJECT_ROOT, "benchmarks", "pages")
+INDEX_FILENAME = "index.json"
+
+_EXTENSIONS = {
+    "application/json": ".json",
+    "application/xml": ".xml",
+    "text/xml": ".xml",
+    "application/rss+xml": ".xml",
+    "application/atom+xml": ".xml",
+}
+
+
+def _school_dir(school_key: str, corpus_dir: str | None = None) -> str:
+    return os.path.join(corpus_dir or DEFAULT_CORPUS_DIR, school_key)
+
+
+def load_index(school_key: str, corpus_dir: str | None = None) -> dict:
+    """Returns the url -> entry index for one school, or {} if nothing was recorded."""
+    index_path = os.path.join(_school_dir(school_key, corpus_dir), INDEX_FILENAME)
+    if not os.path.exists(index_path):
+        return {}
+    with open(index_path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def save_page(school_key: str, url: str, content: bytes, content_type: str = "text/html",
+              kind: str = "article", corpus_dir: str | None = None, status: int = 200) -> str:
+    """
+    Stores one fetched page in the corpus and updates the school's index.
+    kind is a free-form label such as "listing" or "article".
+    Returns the path of the written file.
+    """
+    school_dir = _school_dir(school_key, corpus_dir)
+    os.makedirs(school_dir, exist_ok=True)
+
+    mime = (content_type or "text/html").split(";")[0].strip().lower()
+    filename = hashlib.sha1(url.encode('utf-8')).hexdigest()[:16] + _EXTENSIONS.get(mime, ".html")
+    filepath = os.path.join(school_dir, filename)
+    with open(filepath, 'wb') as f:
+        f.write(content)
+
+    index = load_index(school_key, corpus_dir)
+    index[url] = {"file": filename, "content_type": content_type, "kind": kind, "status": status}
+    with open(os.path.join(school_dir, INDEX_FILENAME), 'w', encoding='utf-8') as f:
+        json.dump(index, f, ensure_ascii=False, indent=2)
+
+    logger.debug(f"[CORPUS] Saved {kind} page for {school_key}: {url} -> {filepath}")
+    return filepath
+
+
+def iter_pages(corpus_dir: str | None = None, school_keys: list[str] | None = None,
+               kind: str | None = None) -> Iterator[dict]:
+    """
+    Yields recorded pages as dicts with keys: school, url, kind, content_type, status, content (bytes).
+    """
+    root = corpus_dir or DEFAULT_CORPUS_DIR
+    if not os.path.isdir(root):
+        return
+    for school_key in sorted(os.listdir(root)):
+        if school_keys and school_key not in school_keys:
+            continue
+        index = load_index(school_key, root)
+        for url, entry in index.items():
+            if kind and entry.get("kind") != kind:
+                continue
+            filepath = os.path.join(root, school_key, entry["file"])
+            if not os.path.exists(filepath):
+                logger.warning(f"[CORPUS] Missing file for {url}: {filepath}")
+                continue
+            with open(filepath, 'rb') as f:
+                content = f.read()
+            yield {
+                "school": school_key,
+                "url": url,
+                "kind": entry.get("kind"),
+                "content_type": entry.get("content_type"),
+                "status": entry.get("status", 200),
+                "content": content,
+            }
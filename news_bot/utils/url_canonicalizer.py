@@ -0,0 +1,162 @@
+# news_bot/utils/url_canonicalizer.py
+
+import re
+import logging
+import threading
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode, urljoin
+
+# Setup logging
+logger = logging.getLogger('url_canonicalizer')
+
+# One story, one key. canonicalize() maps the URL variants listings, feeds, sitemaps
+# and search results hand out for the same page onto a single dedupe key:
+#   http/https, www./bare host, host case, default ports, fragments, trailing
+#   slashes, index.html, an /amp suffix, tracking and AMP query parameters
+#   (utm_*, fbclid, outputType=amp, ...) and query parameter order.
+# The key is only used for comparison; the URL that is fetched is left untouched.
+# SeenUrls is the set-like dedupe index the scanners, search_client and the
+# orchestrators share; it also records rel=canonical aliases learned while fetching
+# pages, so a syndicated or parameterised copy of a processed story is recognised.
+# Only article-like canonicals count (same site, not the home page or a section the
+# page sits under): broken templates point every article at the home page.
+
+_TRACKING_PARAMS = {
+    "fbclid", "gclid", "dclid", "msclkid", "mc_cid", "mc_eid", "_ga", "_gl", "igshid",
+    "ref_src", "cmpid", "outputtype", "amp", "smid",
+}
+# Second-level labels under which the registrable domain has three labels (ed.ac.uk, ...)
+_SECOND_LEVEL_LABELS = {"ac", "co", "com", "edu", "gov", "net", "org"}
+_TRACKING_PREFIXES = ("utm_", "pk_", "hsa_")
+_DEFAULT_PORTS = {"http": "80", "https": "443"}
+_INDEX_PAGE_RE = re.compile(r'/(?:index|default)\.(?:html?|php|aspx?)$', re.IGNORECASE)
+_AMP_SUFFIX_RE = re.compile(r'/amp/?$', re.IGNORECASE)
+
+
+def _is_tracking(param: str) -> bool:
+    param = param.lower()
+    return param in _TRACKING_PARAMS or param.startswith(_TRACKING_PREFIXES)
+
+
+def canonicalize(url: str) -> str:
+    """The dedupe key of url; non-HTTP strings come back stripped but otherwise unchanged."""
+    url = (url or "").strip()
+    try:
+        parts = urlsplit(url)
+    except ValueError:
+        return url
+    scheme = parts.scheme.lower()
+    if scheme not in ("http", "https") or not parts.hostname:
+        return url
+
+    host = parts.hostname.lower().rstrip('.')
+    if host.startswith("www."):
+        host = host[4:]
+    try:
+        port = parts.port
+    except ValueError:
+        port = None
+    if port and str(port) != _DEFAULT_PORTS[scheme]:
+        host = f"{host}:{port}"
+
+    path = re.sub(r'/{2,}', '/', parts.path or '/')
+    path = _INDEX_PAGE_RE.sub('/', path)
+    path = _AMP_SUFFIX_RE.sub('/', path)
+    path = path.rstrip('/') or '/'
+
+    query = sorted((k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True) if not _is_tracking(k))
+    # Every variant maps onto https: the scheme never distinguishes two stories
+    return urlunsplit(("https", host, path, urlencode(query), ""))
+
+
+def registrable_domain(url: str) -> str:
+    """The site a URL belongs to: its host without subdomains (nyu.edu, ed.ac.uk)."""
+    labels = (urlsplit(url).hostname or "").lower().rstrip('.').split('.')
+    if len(labels) >= 3 and len(labels[-1]) == 2 and labels[-2] in _SECOND_LEVEL_LABELS:
+        return ".".join(labels[-3:])
+    return ".".join(labels[-2:])
+
+
+def _path_segments(url: str) -> list[str]:
+    return [seg for seg in urlsplit(canonicalize(url)).path.split('/') if seg]
+
+
+def is_article_alias(url: str, canonical_url: str) -> bool:
+    """
+    Whether canonical_url can name the same story as url: same registrable domain,
+    a non-root path, and not a section url sits under (its path is not a prefix of url's).
+    """
+    if not canonical_url.startswith("http") or registrable_domain(url) != registrable_domain(canonical_url):
+        return False
+    canonical_path = _path_segments(canonical_url)
+    if not canonical_path:
+        return False
+    page_path = _path_segments(url)
+    return not (len(canonical_path) < len(page_path) and page_path[:len(canonical_path)] == canonical_path)
+
+
+def canonical_link(soup, base_url: str) -> str | None:
+    """The absolute <link rel="canonical"> URL declared by a parsed page, if any."""
+    for link in soup.find_all('link', href=True):
+        rel = link.get('rel') or []
+        rel = rel.split() if isinstance(rel, str) else rel
+        if any(r.lower() == "canonical" for r in rel):
+            href = link['href'].strip()
+            if href:
+                return urljoin(base_url, href)
+    return None
+
+
+class SeenUrls:
+    """
+    Thread-safe set of URLs compared by canonical key. Supports `in`, add(),
+    discard() and len() like the plain sets it replaces.
+    """
+
+    def __init__(self, urls=()):
+        self._keys: set[str] = set()
+        self._lock = threading.Lock()
+        for url in urls:
+            self.add(url)
+
+    def __contains__(self, url) -> bool:
+        if not isinstance(url, str):
+            return False
+        key = canonicalize(url)
+        with self._lock:
+            return key in self._keys
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._keys)
+
+    def add(self, url: str) -> bool:
+        """Adds url; False when it (or a variant of it) was already present."""
+        key = canonicalize(url)
+        with self._lock:
+            if key in self._keys:
+                return False
+            self._keys.add(key)
+            return True
+
+    def discard(self, url: str) -> None:
+        with self._lock:
+            self._keys.discard(canonicalize(url))
+
+    def add_alias(self, url: str, canonical_url: str) -> bool:
+        """
+        Records that url's page declares canonical_url. Returns False when that
+        canonical story was already in the index under another URL (a duplicate).
+        A canonical that is not article-like (is_article_alias) is ignored.
+        """
+        key, canonical_key = canonicalize(url), canonicalize(canonical_url)
+        if key == canonical_key:
+            return True
+        if not is_article_alias(url, canonical_url):
+            logger.debug(f"[CANONICAL] Ignoring non-article canonical {canonical_url} of {url}")
+            return True
+        with self._lock:
+            if canonical_key in self._keys:
+                logger.info(f"[CANONICAL] {url} is a copy of already seen {canonical_url}")
+                return False
+            self._keys.add(canonical_key)
+            return True
@@ -0,0 +1,159 @@
+# -*- coding: utf-8 -*-
+"""
+Main-content extraction benchmark.
+
+Compares the previous generic extraction (container selectors, decompose, seven
+attribute-substring selector sweeps) with the single-pass text-density extractor
+on the saved article pages in the page corpus.
+
+Reports per school: ms/page, output words, estimated LLM tokens, and how much of
+the previous output's long paragraphs the new output still contains.
+
+Usage:
+  # record pages first (see benchmark_html_parser.py --record), then:
+  python scripts/benchmark_content_extraction.py --repeat 3
+  python scripts/benchmark_content_extraction.py --show 2   # print a diff-style sample
+"""
+from __future__ import annotations
+
+import argparse
+import re
+import sys
+import time
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from news_bot.core import school_config
+from news_bot.processing import content_extractor, extraction_rules
+from news_bot.utils import page_corpus
+from news_bot.utils.html_parser import make_soup
+
+_LEGACY_CONTAINERS = ['.entry-content', '.post-content', '.td-post-content', 'main', 'article']
+_LEGACY_ANNOYANCES = [
+    '[class*="mask"]',
+    '[class*="ad"], [id*="ad"]',
+    '[class*="popup"], [id*="popup"]',
+    '[class*="overlay"], [id*="overlay"]',
+    '[class*="banner"], [id*="banner"]',
+    '[class*="cookie"], [id*="cookie"]',
+    '[class*="share"], [id*="share"]',
+]
+
+
+def legacy_extract(content: bytes, url: str) -> str:
+    """The generic path of fetch_and_extract_text before the density extractor."""
+    soup = make_soup(content)
+    article_body, _ = extraction_rules.select_first(soup, extraction_rules.get_rule(url).content)
+    if not article_body:
+        for tag_or_class in _LEGACY_CONTAINERS:
+            if tag_or_class.startswith('.'):
+                article_body = soup.find(class_=tag_or_class[1:])
+            else:
+                article_body = soup.find(tag_or_class)
+            if article_body:
+                break
+    if not article_body:
+        article_body = soup.body
+    text_content = ""
+    if article_body:
+        for unwanted_tag in article_body(extraction_rules.NON_CONTENT_TAGS):
+            unwanted_tag.decompose()
+        for selector in _LEGACY_ANNOYANCES:
+            for unwanted_element in article_body.select(selector):
+                unwanted_element.decompose()
+        text_content = "\n".join(p.get_text(strip=True) for p in article_body.find_all('p') if p.get_text(strip=True))
+        if not text_content or len(text_content.split()) < 30:
+            alternative_text = article_body.get_text(separator='\n', strip=True)
+            if len(alternative_text.split()) > len(text_content.split()):
+                text_content = alternative_text
+    return text_content
+
+
+def density_extract(content: bytes, url: str) -> str:
+    """What fetch_and_extract_text does now (without the network-bound JSON-LD/AMP steps)."""
+    soup = make_soup(content)
+    article_body, _ = extraction_rules.select_first(soup, extraction_rules.get_rule(url).content)
+    text_content = content_extractor.container_text(article_body) if article_body else ""
+    if len(text_content.split()) < 30:
+        main_text = content_extractor.extract_main_text(soup)
+        if len(main_text.split()) > len(text_content.split()):
+            text_content = main_text
+    return text_content
+
+
+def _norm(s: str) -> str:
+    return re.sub(r"\W+", " ", s).strip().lower()
+
+
+def _coverage(reference: str, candidate: str) -> float | None:
+    """Share of the reference's long paragraphs (80+ chars) found in the candidate."""
+    paragraphs = [_norm(p) for p in reference.splitlines() if len(p) >= 80]
+    if not paragraphs:
+        return None
+    haystack = _norm(candidate)
+    return sum(p in haystack for p in paragraphs) / len(paragraphs)
+
+
+def _best_time(fn, content, url, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        out = fn(content, url)
+        best = min(best, time.perf_counter() - t0)
+    return out, best
+
+
+def run_benchmark(corpus_dir: str, school_keys: list[str] | None, repeat: int, show: int) -> None:
+    pages = [p for p in page_corpus.iter_pages(corpus_dir, school_keys, kind="article")
+             if "html" in (p.get("content_type") or "text/html")]
+    if not pages:
+        print(f"No article pages found in {corpus_dir}. Run benchmark_html_parser.py --record first.")
+        return
+
+    per_school: dict[str, dict] = {}
+    shown = 0
+    for page in pages:
+        old_text, old_t = _best_time(legacy_extract, page["content"], page["url"], repeat)
+        new_text, new_t = _best_time(density_extract, page["content"], page["url"], repeat)
+        s = per_school.setdefault(page["school"], {"pages": 0, "old_ms": 0.0, "new_ms": 0.0,
+                                                   "old_words": 0, "new_words": 0, "cov": []})
+        s["pages"] += 1
+        s["old_ms"] += old_t * 1000
+        s["new_ms"] += new_t * 1000
+        s["old_words"] += len(old_text.split())
+        s["new_words"] += len(new_text.split())
+        cov = _coverage(old_text, new_text)
+        if cov is not None:
+            s["cov"].append(cov)
+        if shown < show:
+            shown += 1
+            print(f"\n=== {page['url']}")
+            print(f"--- previous ({len(old_text.split())} words)\n{old_text[:1200]}")
+            print(f"--- density ({len(new_text.split())} words)\n{new_text[:1200]}")
+
+    header = (f"{'school':<8}{'pages':>6}{'old ms':>9}{'new ms':>9}{'speedup':>9}"
+              f"{'old words':>11}{'new words':>11}{'~tokens saved':>15}{'coverage':>10}")
+    print("\n" + header)
+    print("-" * len(header))
+    for school, s in per_school.items():
+        n = s["pages"]
+        speedup = s["old_ms"] / s["new_ms"] if s["new_ms"] else 0.0
+        # ~1.3 tokens per English word
+        saved = (s["old_words"] - s["new_words"]) * 1.3 / n
+        coverage = f"{sum(s['cov']) / len(s['cov']) * 100:.0f}%" if s["cov"] else "n/a"
+        print(f"{school:<8}{n:>6}{s['old_ms'] / n:>9.2f}{s['new_ms'] / n:>9.2f}{speedup:>8.1f}x"
+              f"{s['old_words'] / n:>11.0f}{s['new_words'] / n:>11.0f}{saved:>15.0f}{coverage:>10}")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Benchmark main-content extraction on saved article pages')
+    parser.add_argument('--corpus', default=page_corpus.DEFAULT_CORPUS_DIR, help='Corpus directory')
+    parser.add_argument('--schools', nargs='*', help='School keys (default: all)')
+    parser.add_argument('--repeat', type=int, default=3, help='Runs per page; the best time is kept')
+    parser.add_argument('--show', type=int, default=0, help='Print the first N extractions side by side')
+    args = parser.parse_args()
+
+    run_benchmark(args.corpus, args.schools or list(school_config.SCHOOL_PROFILES.keys()), args.repeat, args.show)
@@ -0,0 +1,169 @@
+# -*- coding: utf-8 -*-
+"""
+Date extraction benchmark.
+
+Times the date extraction the scanners run per link, over the real link lists and
+date labels of each school's recorded listing pages: the previous implementation
+(uncompiled patterns, sequential strptime attempts, then strptime again on the
+result) against date_extractor's compiled single-call and batch APIs, with cold and
+warm caches, and checks that both return the same dates.
+
+Usage:
+  # 1) record listing pages (needs network; shared with the HTML parser benchmark)
+  python scripts/benchmark_html_parser.py --record
+  # 2) benchmark offline
+  python scripts/benchmark_date_extractor.py --repeat 20
+"""
+from __future__ import annotations
+
+import argparse
+import re
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from news_bot.core import school_config
+from news_bot.discovery import date_extractor
+from news_bot.discovery.listing_parser import extract_listing_links
+from news_bot.utils import page_corpus
+from news_bot.utils.html_parser import make_soup
+
+_DATE_CLASS_RE = re.compile(r'date|time|meta|eyebrow', re.I)
+
+
+# ----------------- 旧实现（对照组） -----------------
+def _legacy_date_from_url(url_string: str):
+    """Previous extract_date_from_url followed by the callers' strptime."""
+    found = None
+    match_news_ymd = re.search(r'/news/(\d{4})/(\d{1,2})/(\d{1,2})/', url_string)
+    if match_news_ymd:
+        year, month, day = match_news_ymd.groups()
+        try:
+            found = datetime(int(year), int(month), int(day)).strftime("%Y-%m-%d")
+        except ValueError:
+            pass
+    if found is None:
+        m = re.search(r'_(\d{2})-(\d{2})-(\d{4})/story\.html$', url_string)
+        if m:
+            day, month, year = m.groups()
+            try:
+                found = datetime(int(year), int(month), int(day)).strftime('%Y-%m-%d')
+            except ValueError:
+                return None
+    if found is None:
+        match_ymd = re.search(r'/(\d{4})/(\d{1,2})/(\d{1,2})/', url_string)
+        if match_ymd:
+            year, month, day = match_ymd.groups()
+            try:
+                found = datetime(int(year), int(month), int(day)).strftime("%Y-%m-%d")
+            except ValueError:
+                pass
+    return datetime.strptime(found, "%Y-%m-%d").date() if found else None
+
+
+def _legacy_date_from_text(date_string: str):
+    """Previous extract_ymd_from_text followed by the callers' strptime."""
+    if not date_string:
+        return None
+    s = re.sub(r"\s+", " ", str(date_string).strip())
+    s = re.sub(r"(\d{1,2})(st|nd|rd|th)", r"\1", s, flags=re.IGNORECASE)
+    s = re.sub(r"\b(Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Sept|Oct|Nov|Dec)\.\b", r"\1", s)
+    s = re.sub(r"\bSept\b", "Sep", s)
+    found = None
+    for fmt in ["%A, %B %d, %Y", "%A, %b %d, %Y", "%A, %b. %d, %Y", "%B %d, %Y", "%b %d, %Y", "%d %B, %Y", "%Y-%m-%d"]:
+        try:
+            found = datetime.strptime(s, fmt).strftime("%Y-%m-%d")
+            break
+        except ValueError:
+            continue
+    if found is None and "," in s:
+        tail = s.split(",", maxsplit=1)[-1].strip()
+        for fmt in ["%B %d, %Y", "%b %d, %Y"]:
+            try:
+                found = datetime.strptime(tail, fmt).strftime("%Y-%m-%d")
+                break
+            except ValueError:
+                pass
+    return datetime.strptime(found, "%Y-%m-%d").date() if found else None
+
+
+# ----------------- 输入 -----------------
+def _date_labels(content: bytes) -> list[str]:
+    """Short texts of <time> elements and date-like classes: what the scanners pass as labels."""
+    soup = make_soup(content)
+    labels = [el.get_text(" ", strip=True) for el in soup.find_all('time')]
+    labels += [el.get_text(" ", strip=True) for el in soup.find_all(['span', 'div', 'p'], class_=_DATE_CLASS_RE)]
+    return [label for label in labels if 0 < len(label) <= 60]
+
+
+def collect_inputs(corpus_dir: str, school_keys: list[str] | None) -> dict[str, dict[str, list[str]]]:
+    inputs: dict[str, dict[str, list[str]]] = {}
+    for page in page_corpus.iter_pages(corpus_dir, school_keys, kind="listing"):
+        if "html" not in (page.get("content_type") or "text/html"):
+            continue
+        school = inputs.setdefault(page["school"], {"urls": [], "labels": []})
+        school["urls"] += [link.href for link in extract_listing_links(page["content"], page["url"])]
+        school["labels"] += _date_labels(page["content"])
+    return inputs
+
+
+# ----------------- 基准测试 -----------------
+def _best_of(repeat: int, fn, clear_cache: bool) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        if clear_cache:
+            date_extractor.date_from_url.cache_clear()
+            date_extractor.date_from_text.cache_clear()
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def run_benchmark(corpus_dir: str, school_keys: list[str] | None, repeat: int) -> None:
+    inputs = collect_inputs(corpus_dir, school_keys)
+    if not inputs:
+        print(f"No listing pages found in {corpus_dir}. Run scripts/benchmark_html_parser.py --record first.")
+        return
+
+    header = (f"{'school':<8}{'kind':<7}{'items':>7}{'legacy us':>11}{'single us':>11}"
+              f"{'batch us':>10}{'warm us':>9}{'speedup':>9}{'agree':>11}")
+    print(f"Repeat: {repeat} (best run kept; cold = caches cleared before each run)")
+    print(header)
+    print("-" * len(header))
+    for school, school_inputs in inputs.items():
+        for kind, values, legacy, single, batch in (
+            ("url", school_inputs["urls"], _legacy_date_from_url,
+             date_extractor.date_from_url, date_extractor.dates_from_urls),
+            ("text", school_inputs["labels"], _legacy_date_from_text,
+             date_extractor.date_from_text, date_extractor.dates_from_texts),
+        ):
+            if not values:
+                continue
+            legacy_s = _best_of(repeat, lambda: [legacy(v) for v in values], clear_cache=False)
+            single_s = _best_of(repeat, lambda: [single(v) for v in values], clear_cache=True)
+            batch_s = _best_of(repeat, lambda: batch(values), clear_cache=True)
+            batch(values)
+            warm_s = _best_of(repeat, lambda: batch(values), clear_cache=False)
+            # The new parser also accepts a few label forms the old one rejected
+            # ("Mar. 4, 2025", "4 Sep, 2025"); count only answers the old one gave
+            agree = sum(1 for v, new in zip(values, batch(values)) if legacy(v) is None or legacy(v) == new)
+            n = len(values)
+            print(f"{school:<8}{kind:<7}{n:>7}{legacy_s / n * 1e6:>11.2f}{single_s / n * 1e6:>11.2f}"
+                  f"{batch_s / n * 1e6:>10.2f}{warm_s / n * 1e6:>9.2f}"
+                  f"{legacy_s / batch_s if batch_s else 1.0:>8.1f}x{agree:>6}/{n}")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Benchmark date extraction on recorded listing pages')
+    parser.add_argument('--corpus', default=page_corpus.DEFAULT_CORPUS_DIR, help='Corpus directory')
+    parser.add_argument('--schools', nargs='*', help='School keys (default: all)')
+    parser.add_argument('--repeat', type=int, default=10, help='Runs per input list; the best time is kept')
+    args = parser.parse_args()
+
+    run_benchmark(args.corpus, args.schools or list(school_config.SCHOOL_PROFILES.keys()), args.repeat)
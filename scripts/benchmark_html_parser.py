@@ -0,0 +1,228 @@
+# -*- coding: utf-8 -*-
+"""
+HTML parser backend benchmark.
+
+Measures parse + extract time per page for every installed BeautifulSoup
+backend (lxml, html.parser) over a corpus of saved pages from each school's
+domains, and checks that the backends extract equivalent output.
+
+Usage:
+  # 1) record listing pages and a few articles per school (needs network)
+  python scripts/benchmark_html_parser.py --record --articles-per-school 5
+  # 2) benchmark offline
+  python scripts/benchmark_html_parser.py --repeat 5
+  # 3) compare full-tree listing scans with the single-pass listing tokenizer
+  python scripts/benchmark_html_parser.py --listing
+"""
+from __future__ import annotations
+
+import argparse
+import re
+import sys
+import time
+from pathlib import Path
+from urllib.parse import urljoin, urlparse
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+import requests
+
+from news_bot.core import config, school_config
+from news_bot.discovery.listing_parser import extract_listing_links
+from news_bot.utils import page_corpus
+from news_bot.utils.html_parser import available_parsers, get_parser_backend, make_soup
+
+HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+}
+_DATE_PATH_RE = re.compile(r'/\d{4}/\d{2}/(\d{2}/)?')
+
+
+# ----------------- 录制语料 -----------------
+def _listing_urls(profile: dict) -> list[str]:
+    start_date, end_date = config.get_news_date_range()
+    urls = []
+    for pattern in profile.get("category_pages", []) + profile.get("archive_patterns", []):
+        try:
+            urls.append(pattern.format(
+                year=end_date.year, month=end_date.month, day=end_date.day,
+                start_year=start_date.year, start_month=start_date.month, start_day=start_date.day,
+                end_year=end_date.year, end_month=end_date.month, end_day=end_date.day,
+            ))
+        except (KeyError, IndexError, ValueError):
+            urls.append(pattern)
+    return list(dict.fromkeys(urls))
+
+
+def _looks_like_article(url: str, profile: dict) -> bool:
+    host = urlparse(url).netloc.lower().removeprefix("www.")
+    hosts = {domain.split("/")[0].lower().removeprefix("www.") for domain in profile["domains"]}
+    if not any(host == h or host.endswith("." + h) for h in hosts):
+        return False
+    if any(re.search(v, url) for v in profile.get("validators", [])):
+        return True
+    return bool(_DATE_PATH_RE.search(url))
+
+
+def record_corpus(corpus_dir: str, school_keys: list[str], articles_per_school: int) -> None:
+    for key in school_keys:
+        profile = school_config.SCHOOL_PROFILES[key]
+        article_urls: list[str] = []
+        for listing_url in _listing_urls(profile):
+            try:
+                resp = requests.get(listing_url, headers=HEADERS, timeout=config.URL_FETCH_TIMEOUT)
+                resp.raise_for_status()
+            except requests.exceptions.RequestException as e:
+                print(f"  [{key}] skip listing {listing_url}: {e}")
+                continue
+            ctype = resp.headers.get("Content-Type", "text/html")
+            page_corpus.save_page(key, listing_url, resp.content, ctype, kind="listing", corpus_dir=corpus_dir)
+            print(f"  [{key}] listing saved: {listing_url} ({len(resp.content)} bytes)")
+            if "html" not in ctype:
+                continue
+            for a in make_soup(resp.content).find_all('a', href=True):
+                abs_url = urljoin(listing_url, a['href']).split('#')[0]
+                if abs_url not in article_urls and _looks_like_article(abs_url, profile):
+                    article_urls.append(abs_url)
+
+        for url in article_urls[:articles_per_school]:
+            try:
+                resp = requests.get(url, headers=HEADERS, timeout=config.URL_FETCH_TIMEOUT)
+                resp.raise_for_status()
+            except requests.exceptions.RequestException as e:
+                print(f"  [{key}] skip article {url}: {e}")
+                continue
+            page_corpus.save_page(key, url, resp.content, resp.headers.get("Content-Type", "text/html"),
+                                  kind="article", corpus_dir=corpus_dir)
+            print(f"  [{key}] article saved: {url} ({len(resp.content)} bytes)")
+
+
+# ----------------- 基准测试 -----------------
+def _extract(content: bytes, url: str, parser: str) -> tuple[list[str], str]:
+    """The work the pipeline does per page: collect anchors and paragraph text."""
+    soup = make_soup(content, parser=parser)
+    hrefs = [urljoin(url, a['href']) for a in soup.find_all('a', href=True)]
+    root = soup.find('article') or soup.find('main') or soup.body or soup
+    text = "\n".join(p.get_text(strip=True) for p in root.find_all('p') if p.get_text(strip=True))
+    return hrefs, text
+
+
+def _equivalent(a: tuple[list[str], str], b: tuple[list[str], str]) -> bool:
+    norm = lambda s: re.sub(r"\s+", " ", s).strip()
+    return set(a[0]) == set(b[0]) and norm(a[1]) == norm(b[1])
+
+
+def run_benchmark(corpus_dir: str, school_keys: list[str] | None, repeat: int) -> None:
+    parsers = available_parsers()
+    baseline = "html.parser"
+    pages = [p for p in page_corpus.iter_pages(corpus_dir, school_keys)
+             if "html" in (p.get("content_type") or "text/html")]
+    if not pages:
+        print(f"No HTML pages found in {corpus_dir}. Run with --record first.")
+        return
+
+    print(f"Parsers available: {', '.join(parsers)}  |  pages: {len(pages)}  |  repeat: {repeat}")
+    per_school: dict[str, dict] = {}
+    for page in pages:
+        stats = per_school.setdefault(page["school"], {"pages": 0, "bytes": 0, "equal": 0,
+                                                       "ms": {p: 0.0 for p in parsers}})
+        stats["pages"] += 1
+        stats["bytes"] += len(page["content"])
+        outputs = {}
+        for parser in parsers:
+            best = float("inf")
+            for _ in range(repeat):
+                t0 = time.perf_counter()
+                outputs[parser] = _extract(page["content"], page["url"], parser)
+                best = min(best, time.perf_counter() - t0)
+            stats["ms"][parser] += best * 1000
+        if all(_equivalent(outputs[baseline], outputs[p]) for p in parsers):
+            stats["equal"] += 1
+
+    header = f"{'school':<8}{'pages':>6}{'KB/page':>9}" + "".join(f"{p + ' ms/pg':>18}" for p in parsers) + f"{'speedup':>9}{'equiv':>8}"
+    print(header)
+    print("-" * len(header))
+    for school, s in per_school.items():
+        row = f"{school:<8}{s['pages']:>6}{s['bytes'] / s['pages'] / 1024:>9.0f}"
+        row += "".join(f"{s['ms'][p] / s['pages']:>18.2f}" for p in parsers)
+        fastest = min(s["ms"].values())
+        row += f"{s['ms'][baseline] / fastest if fastest else 1.0:>8.1f}x"
+        row += f"{s['equal']:>5}/{s['pages']}"
+        print(row)
+
+
+_ARTICLE_SELECTORS = ['article', 'div.post', 'div.article', 'div.entry', 'div.news-item',
+                      'div.story', 'div.content-item', 'div.list-item', 'li.post', 'li.article', 'li.news-item']
+
+
+def _full_tree_listing_scan(content: bytes, url: str) -> set[str]:
+    """Previous listing-page scan: full tree, heading scans, container selectors, find_all('a')."""
+    soup = make_soup(content)
+    hrefs = set()
+    for heading in ['h1', 'h2', 'h3', 'h4', 'h5']:
+        for el in soup.find_all(heading):
+            a = el.find('a', href=True)
+            if a:
+                hrefs.add(urljoin(url, a['href']))
+    for selector in _ARTICLE_SELECTORS:
+        if '.' in selector:
+            tag_name, class_name = selector.split('.', 1)
+            elements = soup.find_all(tag_name, class_=re.compile(class_name, re.I))
+        else:
+            elements = soup.find_all(selector)
+        for el in elements:
+            a = el.find('a', href=True)
+            if a:
+                hrefs.add(urljoin(url, a['href']))
+    for a in soup.find_all('a', href=True):
+        if re.search(r'/\d{4}/\d{2}/\d{2}/', a['href']):
+            hrefs.add(urljoin(url, a['href']))
+    return hrefs
+
+
+def run_listing_benchmark(corpus_dir: str, school_keys: list[str] | None, repeat: int) -> None:
+    pages = [p for p in page_corpus.iter_pages(corpus_dir, school_keys, kind="listing")
+             if "html" in (p.get("content_type") or "text/html")]
+    if not pages:
+        print(f"No listing pages found in {corpus_dir}. Run with --record first.")
+        return
+    tree_total = stream_total = 0.0
+    covered = 0
+    for page in pages:
+        tree_best = stream_best = float("inf")
+        for _ in range(repeat):
+            t0 = time.perf_counter()
+            tree_hrefs = _full_tree_listing_scan(page["content"], page["url"])
+            tree_best = min(tree_best, time.perf_counter() - t0)
+            t0 = time.perf_counter()
+            stream_hrefs = {link.href for link in extract_listing_links(page["content"], page["url"])}
+            stream_best = min(stream_best, time.perf_counter() - t0)
+        tree_total += tree_best
+        stream_total += stream_best
+        covered += tree_hrefs <= stream_hrefs
+    print(f"Listing pages: {len(pages)} ({get_parser_backend()} for the full tree)")
+    print(f"  full tree scan:    {tree_total / len(pages) * 1000:8.2f} ms/page")
+    print(f"  single-pass scan:  {stream_total / len(pages) * 1000:8.2f} ms/page "
+          f"({stream_total / tree_total * 100 if tree_total else 0:.0f}% of full tree)")
+    print(f"  pages where single pass covers every full-tree link: {covered}/{len(pages)}")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Benchmark HTML parser backends on saved school pages')
+    parser.add_argument('--corpus', default=page_corpus.DEFAULT_CORPUS_DIR, help='Corpus directory')
+    parser.add_argument('--schools', nargs='*', help='School keys (default: all)')
+    parser.add_argument('--record', action='store_true', help='Fetch and save pages before benchmarking')
+    parser.add_argument('--articles-per-school', type=int, default=5, help='Articles to record per school')
+    parser.add_argument('--repeat', type=int, default=3, help='Runs per page; the best time is kept')
+    parser.add_argument('--listing', action='store_true', help='Benchmark listing-page link extraction instead')
+    args = parser.parse_args()
+
+    schools = args.schools or list(school_config.SCHOOL_PROFILES.keys())
+    if args.record:
+        record_corpus(args.corpus, schools, args.articles_per_school)
+    if args.listing:
+        run_listing_benchmark(args.corpus, schools, args.repeat)
+    else:
+        run_benchmark(args.corpus, schools, args.repeat)
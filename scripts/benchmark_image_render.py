@@ -0,0 +1,137 @@
+# -*- coding: utf-8 -*-
+"""
+WeChat image render benchmark.
+
+Compares font delivery: the previous _font_data_uri (read the CJK font and
+base64-encode it on every render), the memoized full-font data URI, and the
+per-page glyph subset (needs fontTools). Measures, per render, HTML build time, Python peak memory (tracemalloc) and
+HTML size; with --browser it also renders full images through the browser pool
+and reports seconds per image and the peak RSS of the browser processes.
+
+Usage:
+  python scripts/benchmark_image_render.py --renders 20
+  python scripts/benchmark_image_render.py --renders 10 --browser --out /tmp/wx_bench
+  python scripts/benchmark_image_render.py --font path/to/SourceHanSerifSC-VF.otf
+"""
+from __future__ import annotations
+
+import argparse
+import base64
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from news_bot.processing import browser_pool, image_generator
+
+SAMPLE_TITLE = "纽约大学宣布扩建国际学生服务中心"
+SAMPLE_BODY = ("纽约大学本周宣布，将在华盛顿广场校区扩建国际学生服务中心，"
+               "为中国留学生提供签证咨询、就业指导与心理健康支持。") * 12
+
+
+# ----------------- 旧实现（对照组） -----------------
+def _legacy_font_data_uri() -> str:
+    """Previous _font_data_uri: reads and base64-encodes the font on every call."""
+    vf = image_generator.FONT_FILE
+    try:
+        if vf.exists():
+            b64 = base64.b64encode(vf.read_bytes()).decode("ascii")
+            return f"data:font/otf;base64,{b64}"
+    except Exception:
+        pass
+    return ""
+
+
+# ----------------- 基准测试 -----------------
+MODES = ("legacy", "memoized", "subset")
+
+
+def _with_font_impl(mode: str):
+    original = image_generator._font_data_uri
+    image_generator.FONT_SUBSET_ENABLED = mode == "subset"
+    image_generator._font_uri_cache.clear()
+    image_generator._subset_cache.clear()
+    if mode == "legacy":
+        image_generator._font_data_uri = _legacy_font_data_uri
+    return original
+
+
+def bench_html(renders: int, mode: str) -> dict:
+    original = _with_font_impl(mode)
+    try:
+        times, peaks, size = [], [], 0
+        for _ in range(renders):
+            tracemalloc.start()
+            t0 = time.perf_counter()
+            html = image_generator._render_html(title=SAMPLE_TITLE, content=SAMPLE_BODY)
+            times.append(time.perf_counter() - t0)
+            peaks.append(tracemalloc.get_traced_memory()[1])
+            tracemalloc.stop()
+            size = len(html)
+        return {"first_ms": times[0] * 1000, "avg_ms": sum(times) / len(times) * 1000,
+                "peak_mb": max(peaks) / 2**20, "html_kb": size / 1024}
+    finally:
+        image_generator._font_data_uri = original
+
+
+def bench_browser(renders: int, mode: str, out_dir: Path) -> dict:
+    original = _with_font_impl(mode)
+    try:
+        out_dir.mkdir(parents=True, exist_ok=True)
+        times, peak_rss = [], 0.0
+        for i in range(renders):
+            t0 = time.perf_counter()
+            image_generator.generate_image_from_article(
+                title=SAMPLE_TITLE, content=SAMPLE_BODY, output_path=str(out_dir / f"{i:02d}.png"))
+            times.append(time.perf_counter() - t0)
+            peak_rss = max(peak_rss, browser_pool._process_tree_rss_mb(os.getpid()))
+        # The first render includes the browser launch
+        steady = times[1:] or times
+        return {"first_s": times[0], "avg_s": sum(steady) / len(steady), "peak_rss_mb": peak_rss}
+    finally:
+        image_generator._font_data_uri = original
+
+
+def run_benchmark(renders: int, browser: bool, out_dir: Path) -> None:
+    font = image_generator.FONT_FILE
+    if not font.exists():
+        print(f"Font not found: {font} (pass --font); results would only cover the file:// fallback.")
+        return
+    print(f"Font: {font.name} ({font.stat().st_size / 2**20:.1f} MB)  |  renders: {renders}")
+
+    header = f"{'mode':<10}{'first ms':>10}{'avg ms':>10}{'py peak MB':>12}{'HTML KB':>10}"
+    print(header)
+    print("-" * len(header))
+    for mode in MODES:
+        r = bench_html(renders, mode)
+        print(f"{mode:<10}{r['first_ms']:>10.1f}{r['avg_ms']:>10.1f}{r['peak_mb']:>12.1f}{r['html_kb']:>10.0f}")
+
+    if browser:
+        header = f"{'mode':<10}{'first s':>10}{'avg s':>10}{'browser RSS MB':>16}"
+        print()
+        print(header)
+        print("-" * len(header))
+        for mode in MODES:
+            r = bench_browser(renders, mode, out_dir / mode)
+            print(f"{mode:<10}{r['first_s']:>10.2f}{r['avg_s']:>10.2f}{r['peak_rss_mb']:>16.0f}")
+        browser_pool.shutdown_pool()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Benchmark WeChat image rendering (font delivery)')
+    parser.add_argument('--renders', type=int, default=10, help='Renders per mode')
+    parser.add_argument('--browser', action='store_true', help='Also render full images with Playwright')
+    parser.add_argument('--out', default=os.path.join(tempfile.gettempdir(), 'wx_render_bench'),
+                        help='Output directory for --browser images')
+    parser.add_argument('--font', help='Font file to use instead of assets/fonts/SourceHanSerifSC-VF.otf')
+    args = parser.parse_args()
+
+    if args.font:
+        image_generator.FONT_FILE = Path(args.font)
+    run_benchmark(args.renders, args.browser, Path(args.out))
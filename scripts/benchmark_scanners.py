@@ -0,0 +1,166 @@
+# -*- coding: utf-8 -*-
+"""
+Discovery scanner benchmark.
+
+Records every response each registered scanner receives (listing and archive pages,
+UBC's AJAX JSON, feeds, WordPress API pages, sitemaps, robots.txt) as replay
+fixtures in the page corpus, together with the articles the scanner discovered.
+Replay then runs the scanners offline against those fixtures (http_client replay
+mode: no network, no host scheduling) and reports, per scanner, pages/sec, links
+classified/sec, CPU per page and whether the discovered articles still match the
+recording. Parser, classification or parallelism changes can be measured without
+touching the sites.
+
+Usage:
+  # 1) record fixtures and baselines (needs network); the date range is stored
+  python scripts/benchmark_scanners.py --record --start-date 2025-03-01 --days 7
+  # 2) benchmark offline
+  python scripts/benchmark_scanners.py --repeat 5
+  python scripts/benchmark_scanners.py --schools nyu ubc --scanners nyu_archives ubc_today
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import re
+import sys
+import tempfile
+import time
+from datetime import date
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from news_bot.core import config, school_config
+from news_bot.discovery import scanner_registry
+from news_bot.discovery import search_client  # noqa: F401  (imports every scanner module, which registers them)
+from news_bot.utils import http_client, page_corpus
+
+BASELINE_FILENAME = "scanner_baseline.json"
+# Candidate links in a served page: anchors (also inside JSON-wrapped HTML), sitemap
+# <loc>s, feed items/entries and JSON "link" fields
+_LINK_RE = re.compile(rb'<a\s[^>]*?href|<loc>|<item[\s>]|<entry[\s>]|"link"\s*:', re.I)
+
+
+def _baseline_path(corpus_dir: str, school_key: str) -> str:
+    return os.path.join(corpus_dir, school_key, BASELINE_FILENAME)
+
+
+def _set_date_range(start: date, days: int) -> None:
+    # A fixed NEWS_START_DATE also turns incremental discovery off (full crawl every run)
+    config.NEWS_START_DATE = start
+    config.RECENCY_THRESHOLD_DAYS = days
+
+
+def _fresh_state_dir() -> str:
+    # Sitemap caches and frontier state must not carry over between timed runs
+    config.DISCOVERY_STATE_DIR = tempfile.mkdtemp(prefix="scanner_bench_")
+    return config.DISCOVERY_STATE_DIR
+
+
+def _selected_scanners(school_key: str, names: list[str] | None):
+    specs = scanner_registry.scanners_for(school_config.SCHOOL_PROFILES[school_key]["id"])
+    return [spec for spec in specs if not names or spec.name in names]
+
+
+def _run_scanner(spec) -> list[dict]:
+    # Called directly (not through run_scanners): no timeout, no health records
+    try:
+        return spec.fn() or []
+    except Exception as e:
+        print(f"  [{spec.name}] raised: {e}")
+        return []
+
+
+# ----------------- 录制夹具 -----------------
+def record_fixtures(corpus_dir: str, school_keys: list[str], names: list[str] | None,
+                    start: date, days: int) -> None:
+    _set_date_range(start, days)
+    for key in school_keys:
+        baseline = {"start_date": start.isoformat(), "days": days, "scanners": {}}
+        http_client.use_fixtures("record", corpus_dir, key)
+        try:
+            for spec in _selected_scanners(key, names):
+                _fresh_state_dir()
+                http_client.get_fixture_stats(reset=True)
+                articles = _run_scanner(spec)
+                recorded = http_client.get_fixture_stats().get("recorded", 0)
+                baseline["scanners"][spec.name] = sorted(a["url"] for a in articles if a.get("url"))
+                print(f"  [{key}] {spec.name}: {recorded} responses, {len(articles)} articles")
+        finally:
+            http_client.use_fixtures(None)
+        path = _baseline_path(corpus_dir, key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(baseline, f, ensure_ascii=False, indent=2)
+
+
+# ----------------- 基准测试 -----------------
+def _links_in_pages(contents: dict[str, bytes], keys: list[str]) -> int:
+    return sum(len(_LINK_RE.findall(contents[k])) for k in keys if k in contents)
+
+
+def run_benchmark(corpus_dir: str, school_keys: list[str], names: list[str] | None, repeat: int) -> None:
+    header = (f"{'scanner':<20}{'pages':>6}{'miss':>6}{'links':>7}{'wall ms':>9}{'pages/s':>9}"
+              f"{'links/s':>10}{'cpu ms/pg':>11}{'articles':>10}{'parity':>8}")
+    printed_header = False
+    for key in school_keys:
+        path = _baseline_path(corpus_dir, key)
+        if not os.path.exists(path):
+            print(f"[{key}] no recording; run with --record first")
+            continue
+        with open(path, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+        _set_date_range(date.fromisoformat(baseline["start_date"]), baseline["days"])
+        http_client.use_fixtures("replay", corpus_dir, key)
+        contents = {page["url"]: page["content"] for page in page_corpus.iter_pages(corpus_dir, [key])}
+        if not printed_header:
+            print(f"Repeat: {repeat} (best run kept; every run starts with empty discovery state)")
+            print(header)
+            print("-" * len(header))
+            printed_header = True
+        try:
+            for spec in _selected_scanners(key, names):
+                if spec.name not in baseline["scanners"]:
+                    continue
+                best_wall = best_cpu = float("inf")
+                for _ in range(repeat):
+                    _fresh_state_dir()
+                    http_client.get_fixture_stats(reset=True)
+                    wall0, cpu0 = time.perf_counter(), time.process_time()
+                    articles = _run_scanner(spec)
+                    wall, cpu = time.perf_counter() - wall0, time.process_time() - cpu0
+                    stats = http_client.get_fixture_stats()
+                    best_wall, best_cpu = min(best_wall, wall), min(best_cpu, cpu)
+                served, missed = stats.get("served", 0), stats.get("missed", 0)
+                # Counted over the pages the last run was served, outside the timed runs
+                links = _links_in_pages(contents, stats["pages"])
+                urls = sorted(a["url"] for a in articles if a.get("url"))
+                parity = "ok" if urls == baseline["scanners"][spec.name] else \
+                    f"{len(set(urls) & set(baseline['scanners'][spec.name]))}/{len(baseline['scanners'][spec.name])}"
+                print(f"{spec.name:<20}{served:>6}{missed:>6}{links:>7}{best_wall * 1000:>9.1f}"
+                      f"{served / best_wall if best_wall else 0:>9.1f}{links / best_wall if best_wall else 0:>10.0f}"
+                      f"{best_cpu / served * 1000 if served else 0:>11.2f}{len(articles):>10}{parity:>8}")
+        finally:
+            http_client.use_fixtures(None)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Benchmark discovery scanners on recorded fixtures')
+    parser.add_argument('--corpus', default=page_corpus.DEFAULT_CORPUS_DIR, help='Corpus directory')
+    parser.add_argument('--schools', nargs='*', help='School keys (default: all)')
+    parser.add_argument('--scanners', nargs='*', help='Scanner names (default: every scanner of the schools)')
+    parser.add_argument('--record', action='store_true', help='Record fixtures and baselines (needs network)')
+    parser.add_argument('--start-date', type=date.fromisoformat, help='First day of the recorded range (YYYY-MM-DD)')
+    parser.add_argument('--days', type=int, default=config.RECENCY_THRESHOLD_DAYS, help='Days in the recorded range')
+    parser.add_argument('--repeat', type=int, default=3, help='Runs per scanner; the best time is kept')
+    args = parser.parse_args()
+
+    schools = args.schools or list(school_config.SCHOOL_PROFILES.keys())
+    if args.record:
+        start = args.start_date or config.get_news_date_range()[0]
+        record_fixtures(args.corpus, schools, args.scanners, start, args.days)
+    run_benchmark(args.corpus, schools, args.scanners, args.repeat)
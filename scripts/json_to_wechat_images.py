@@ -6,13 +6,24 @@ Bypasses Google Docs - generates images directly from JSON report
 
 from pathlib import Path
 from typing import List, Dict
+from concurrent.futures import ThreadPoolExecutor
 import json
+import os
+import time
 
 from news_bot.processing.image_generator import (
     generate_image_from_article,
     make_reference_image_from_reports,
+    ensure_render_workers,
+    release_render_workers,
 )
 
+# Images rendered at the same time (one pooled browser each); 1 = one after another.
+# Each extra one keeps another Chromium alive, so raise it only where memory allows.
+DEFAULT_PARALLELISM = int(os.environ.get("WXIMG_RENDER_PARALLELISM", "1"))
+# Upper bound for a requested parallelism (API callers choose their own)
+MAX_PARALLELISM = int(os.environ.get("WXIMG_MAX_RENDER_PARALLELISM", "4"))
+
 # School brand colors (same as gdoc_to_wechat_images.py)
 SCHOOL_BRAND_MAP = {
     "NYU": "#57068c",
@@ -66,6 +77,7 @@ def json_to_wechat_images(
     body_size: float = 20.0,
     top_n_sources: int = 10,
     school_override: str = None,
+    parallelism: int = DEFAULT_PARALLELISM,
 ) -> Dict:
     """
     Convert JSON report directly to WeChat-style images.
@@ -79,9 +91,13 @@ def json_to_wechat_images(
         body_size: Body font size
         top_n_sources: Number of sources to include in reference page (0 to disable)
         school_override: Manually specify school (NYU, USC, etc.)
+        parallelism: Images rendered concurrently, the reference page included
+                     (capped at WXIMG_MAX_RENDER_PARALLELISM)
+                     (filenames and the order of generated_files do not depend on it)
         
     Returns:
-        Dict with status and output information
+        Dict with status and output information, including per-image render
+        seconds in 'timings'
     """
     # Load JSON
     with open(json_path, 'r', encoding='utf-8') as f:
@@ -105,9 +121,8 @@ def json_to_wechat_images(
     # Check if UCD (for alternating colors)
     is_ucd = school == "UCD" or school == "UC DAVIS"
     
-    generated_files = []
-    
-    # Generate images for each article
+    # Collect render jobs first; they run concurrently below
+    jobs = []
     for i, report in enumerate(reports, 1):
         chinese_title = report.get('chinese_title', '').strip()
         chinese_content = report.get('refined_chinese_news_report', '').strip()
@@ -129,31 +144,36 @@ def json_to_wechat_images(
         # Safe filename
         safe_title = chinese_title[:40].replace('/', '_').replace('\\', '_').replace(':', '_')
         output_path = output_dir / f"{i:02d}_{safe_title}.png"
-        
+        jobs.append((i, output_path, dict(
+            title=chinese_title,
+            content=chinese_content,
+            output_path=str(output_path),
+            credits="",  # Disabled as per original script
+            cover_image="",  # TODO: Could extract from source URL
+            cover_caption="",
+            page_width=page_width,
+            device_scale=device_scale,
+            title_size=title_size,
+            body_size=body_size,
+            brand_color=brand_color,
+            left_bar_color=left_bar_color,
+        )))
+    
+    def render_article(job):
+        i, output_path, kwargs = job
+        started = time.perf_counter()
         try:
-            generate_image_from_article(
-                title=chinese_title,
-                content=chinese_content,
-                output_path=str(output_path),
-                credits="",  # Disabled as per original script
-                cover_image="",  # TODO: Could extract from source URL
-                cover_caption="",
-                page_width=page_width,
-                device_scale=device_scale,
-                title_size=title_size,
-                body_size=body_size,
-                brand_color=brand_color,
-                left_bar_color=left_bar_color,
-            )
-            generated_files.append(str(output_path))
-            print(f"✅ Generated: {output_path.name}")
+            generate_image_from_article(**kwargs)
         except Exception as e:
             print(f"❌ Failed to generate image for article {i}: {e}")
-            continue
+            return None
+        seconds = time.perf_counter() - started
+        print(f"✅ Generated: {output_path.name} ({seconds:.1f}s)")
+        return seconds
     
-    # Generate sources reference page (optional)
-    sources_file = None
-    if top_n_sources > 0:
+    def render_sources():
+        # Sources reference page (optional), rendered alongside the articles
+        started = time.perf_counter()
         try:
             sources_output = make_reference_image_from_reports(
                 sorted_json_path=json_path,
@@ -164,10 +184,36 @@ def json_to_wechat_images(
                 device_scale=device_scale,
                 brand_color=brand_color,
             )
-            sources_file = sources_output
-            print(f"✅ Generated sources page: {sources_output}")
         except Exception as e:
             print(f"⚠️  Failed to generate sources page: {e}")
+            return None, None
+        seconds = time.perf_counter() - started
+        print(f"✅ Generated sources page: {sources_output} ({seconds:.1f}s)")
+        return sources_output, seconds
+    
+    parallelism = min(max(1, parallelism or 1), max(1, MAX_PARALLELISM))
+    ensure_render_workers(parallelism)
+    started = time.perf_counter()
+    try:
+        with ThreadPoolExecutor(max_workers=parallelism, thread_name_prefix="wechat-img") as executor:
+            sources_future = executor.submit(render_sources) if top_n_sources > 0 else None
+            # map() keeps article order whatever order the renders finish in
+            article_seconds = list(executor.map(render_article, jobs))
+            sources_file, sources_seconds = sources_future.result() if sources_future else (None, None)
+    finally:
+        # The extra browsers are only kept for the job
+        if parallelism > 1:
+            release_render_workers()
+    
+    generated_files = []
+    timings = []
+    for (i, output_path, _), seconds in zip(jobs, article_seconds):
+        if seconds is None:
+            continue
+        generated_files.append(str(output_path))
+        timings.append({'file': str(output_path), 'seconds': round(seconds, 3)})
+    if sources_file:
+        timings.insert(0, {'file': sources_file, 'seconds': round(sources_seconds, 3)})
     
     return {
         'success': True,
@@ -177,6 +223,9 @@ def json_to_wechat_images(
         'generated_files': generated_files,
         'sources_file': sources_file,
         'total_images': len(generated_files),
+        'timings': timings,
+        'parallelism': parallelism,
+        'total_seconds': round(time.perf_counter() - started, 3),
     }
 
 
@@ -192,6 +241,7 @@ if __name__ == '__main__':
     parser.add_argument('--title-size', type=float, default=22.093076923, help='Title font size')
     parser.add_argument('--body-size', type=float, default=20.0, help='Body font size')
     parser.add_argument('--top-n', type=int, default=10, help='Number of sources in reference page (0 to disable)')
+    parser.add_argument('--parallelism', type=int, default=DEFAULT_PARALLELISM, help='Images rendered at the same time')
     
     args = parser.parse_args()
     
@@ -204,10 +254,12 @@ if __name__ == '__main__':
         body_size=args.body_size,
         top_n_sources=args.top_n,
         school_override=args.school,
+        parallelism=args.parallelism,
     )
     
     if result['success']:
-        print(f"\n🎉 Success! Generated {result['total_images']} images")
+        print(f"\n🎉 Success! Generated {result['total_images']} images in {result['total_seconds']:.1f}s "
+              f"({result['parallelism']} at a time)")
         print(f"📁 Output: {result['output_dir']}")
         print(f"🎨 School: {result['school']} (Brand: {result['brand_color']})")
     else: